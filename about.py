@@ -1,7 +1,8 @@
 import streamlit as st
+from static_assets import thumbnail
 
 def about_page(username):
-    st.image("assets/ceo_photo.jpg", width=150)
+    st.image(thumbnail("assets/ceo_photo.jpg", 150), width=150)
     st.markdown("""
     ### About ResumeReadyPro
     AI-powered resume and job fit platform helping professionals level up.
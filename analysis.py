@@ -0,0 +1,113 @@
+# analysis.py
+# UI-independent analysis logic: Job Fit & Salary alignment, report text and
+# the offline summary/question generators. Shared by the Streamlit apps and
+# the headless API (api.py); every result is plain JSON-serializable data.
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from keywords import extract_keywords, keyword_fit
+from resume_model import QUESTION_SECTIONS, segment_resume
+from salary import STATUS_ABOVE, compare_salary, estimate_salary_band, resolve_role
+
+CLOUD_KEYWORDS = {"aws", "azure", "gcp"}
+
+
+def salary_alignment(role: str, location_level: str = "standard", level: Optional[str] = None,
+                     expected_salary: Optional[int] = None) -> Optional[Dict]:
+    """Market band for ``role`` (plus status/note when ``expected_salary`` is given), or None."""
+    band = estimate_salary_band(role, location_level, level)
+    if not band:
+        return None
+    matched_role, title_level, similarity = resolve_role(role)
+    if expected_salary:
+        out = compare_salary(int(expected_salary), band)
+    else:
+        out = {"band_low": band[0], "band_mid": band[1], "band_high": band[2]}
+    out.update(matched_role=matched_role, level=level or title_level or "mid", similarity=similarity)
+    return out
+
+
+def recommendations(fit: Dict, salary: Optional[Dict]) -> List[str]:
+    recs = []
+    missing = fit["missing"]
+    if missing:
+        recs.append("Add bullets showing experience with missing items; quantify impact (latency↓, cost↓, throughput↑).")
+        if any(m in CLOUD_KEYWORDS for m in missing):
+            recs.append("Consider an Associate-level cloud cert to boost credibility fast.")
+    if fit["fit_score"] < 80:
+        recs.append("Tailor the summary to include 3–5 JD keywords you already match.")
+    if salary and salary.get("status") == STATUS_ABOVE:
+        recs.append("Lower ask by ~10–15% or justify with scope (team size, budget, uptime).")
+    if not recs:
+        recs.append("You're well aligned. Focus on STAR stories for top projects.")
+    return recs
+
+
+def analyze_fit(jd_text: str, resume_text: str, role: str = "", location_level: str = "standard",
+                level: Optional[str] = None, expected_salary: Optional[int] = None) -> Dict:
+    """Keyword fit (resume side: relevant sections only), salary alignment and recommendations."""
+    parsed = segment_resume(resume_text or "")
+    fit = keyword_fit(extract_keywords(jd_text), parsed.keywords())
+    salary = salary_alignment(role, location_level, level, expected_salary) if role else None
+    fit.update(
+        sections=parsed.section_names() if parsed.has_sections() else [],
+        salary=salary,
+        recommendations=recommendations(fit, salary),
+    )
+    return fit
+
+
+def fit_report(result: Dict, role: str, location_level: str, expected_salary: int) -> str:
+    s = result["salary"]
+    return (
+        f"ResumeReadyPro — Job Fit & Salary Alignment Report\n"
+        f"Generated: {datetime.utcnow().isoformat()}Z\n\n"
+        f"Role: {role or '(unspecified)'}  |  Location: {location_level}\n"
+        f"Expected salary: ${int(expected_salary):,}\n"
+        f"Fit Score: {result['fit_score']}%\n\n"
+        f"JD Keywords: {', '.join(result['jd_keys']) or '—'}\n"
+        f"Resume Keywords: {', '.join(result['rs_keys']) or '—'}\n"
+        f"Matched: {', '.join(result['matched']) or '—'}\n"
+        f"Missing: {', '.join(result['missing']) or '—'}\n\n"
+        + (f"Market Band: ${s['band_low']:,}–${s['band_high']:,} (mid ${s['band_mid']:,})\n"
+           f"Salary Alignment: {s['status']}\n{s['note']}\n\n" if s and "status" in s else "")
+        + "Recommendations:\n" + "\n".join([f"- {x}" for x in result["recommendations"]])
+    )
+
+
+# ---------------- Offline generators ----------------
+def summary_offline(full_name:str, role:str, experience:str, skills:str) -> str:
+    exp_kw = extract_keywords(experience)
+    skill_kw = extract_keywords(skills)
+    highlights = list(dict.fromkeys(exp_kw + skill_kw))[:10]
+    bullets = "\n".join([f"- Experience with **{kw}**" for kw in highlights]) if highlights else "- Strong fundamentals and rapid learning"
+    return f"""**{full_name or 'Candidate'}** — {role or 'Target Role'}
+
+Collaborative professional delivering reliable solutions in fast-paced environments, translating requirements into measurable outcomes.
+
+**Highlights**
+{bullets}
+
+**Value**
+- Communicates clearly with technical & non-technical stakeholders
+- Ownership mindset: deliver, measure, iterate
+- Continuous improvement and mentoring culture
+"""
+
+
+def questions_offline(text:str, qtype:str, count:int) -> List[str]:
+    base = segment_resume(text).keywords(QUESTION_SECTIONS) or ["teamwork","problem solving","ownership","python"]
+    out = []
+    for i in range(count):
+        kw = base[i % len(base)]
+        if qtype == "Behavioral":
+            out.append(f"Tell me about a time you demonstrated {kw}. What was the context, actions, and outcome?")
+        elif qtype == "Technical":
+            out.append(f"How would you use {kw} to design or troubleshoot a real-world system? Be specific.")
+        else:
+            if i % 2 == 0:
+                out.append(f"Walk me through a project where {kw} was critical. What design decisions did you make?")
+            else:
+                out.append(f"Describe a challenge involving {kw}. How did you collaborate and ensure delivery?")
+    return out
@@ -0,0 +1,391 @@
+# api.py
+# Headless JSON API for extraction, fit scoring, salary alignment and generation.
+#
+# A plain WSGI app (no framework dependency) so it can be scaled independently
+# of the Streamlit UI under any multi-worker WSGI server:
+#
+#   gunicorn -w 4 -b 0.0.0.0:8000 api:app      # 4 worker processes
+#   python api.py [port]                       # threaded dev server
+#
+# Endpoints (JSON in/out unless noted):
+#   GET  /health
+#   GET  /ready          warm-up report; 503 until warm (no API key needed, for load balancers)
+#   POST /extract?filename=resume.pdf          raw file bytes -> {"text"}
+#   POST /fit            {jd_text, resume_text, role?, location_level?, level?, expected_salary?}
+#   POST /fit/batch      {"items": [<fit request>, ...]}          -> {"results": [...]}
+#   POST /fit/rank       {resume_text, jobs: [{text, name?, role?}, ...], location_level?, level?,
+#                         expected_salary?, collapse_duplicates?}
+#   POST /salary         {role, location_level?, level?, expected_salary?}
+#   POST /salary/batch   {expected: [...], roles: [...] | str, location_level?, level?}
+#   POST /summary        {full_name, role, experience, skills, use_gpt?}
+#   POST /questions      {text, qtype?, count?, use_gpt?}
+#   POST /questions/batch {"items": [<questions request>, ...]}   GPT items go upstream in JSON-schema
+#                         batches; -> {"results": [...], "stats": {round_trips, tokens_saved, ...}}
+#
+# Each /fit analysis logs its salary comparison to salary_analytics.py. Repeats
+# are dropped within SALARY_LOG_DEDUP_S only for a known X-User; anonymous
+# callers all look alike, so every analysis is logged. Expected salaries outside
+# SALARY_MIN..SALARY_MAX are a 400.
+#
+# Set RESUMEREADY_API_KEY to require an X-API-Key header. X-User names the
+# caller for LLM quotas when use_gpt is requested; it is only honoured when
+# RESUMEREADY_API_KEY is set (key holders such as the Streamlit UI or a trusted
+# proxy are trusted to name users). Without a key every call is charged to "api".
+
+import io
+import hashlib
+import os
+import sys
+import json
+import traceback
+from socketserver import ThreadingMixIn
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIServer, make_server
+
+from dotenv import load_dotenv
+
+from analysis import analyze_fit, questions_offline, salary_alignment, summary_offline
+from dedup import get_index, group_duplicates
+from extractors import UploadRejected, extract_text
+from question_batch import generate_questions_batch
+from quota import INTERACTIVE, QuotaExceeded
+from ranking import rank_jobs, skipped_jobs
+from router import INTERACTIVE_LATENCY_S, routed_completion
+from salary import compare_salary_batch
+from salary_analytics import SALARY_MAX, SALARY_MIN, get_salary_log
+import warmup
+
+# OpenAI 1.x client (optional; GPT endpoints fall back to offline generators)
+try:
+    from openai import OpenAI
+except Exception:
+    OpenAI = None
+
+load_dotenv()
+API_KEY = os.getenv("RESUMEREADY_API_KEY", "")
+MAX_BATCH = int(os.getenv("API_MAX_BATCH", "500"))
+MAX_BODY_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "20")) * 1024 * 1024)
+
+client = None
+if OpenAI and os.getenv("OPENAI_API_KEY"):
+    try:
+        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL") or None)
+    except Exception:
+        client = None
+
+
+class HTTPError(Exception):
+    def __init__(self, status: str, message: str, payload: Optional[Dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.payload = payload
+
+
+ROUTES: Dict[Tuple[str, str], Callable] = {}
+
+
+def route(method: str, path: str):
+    def register(fn):
+        ROUTES[(method, path)] = fn
+        return fn
+    return register
+
+
+def _body(environ) -> bytes:
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if length > MAX_BODY_BYTES:
+        raise HTTPError("413 Payload Too Large", f"Body exceeds {MAX_BODY_BYTES} bytes.")
+    return environ["wsgi.input"].read(length) if length else b""
+
+
+def _json(environ) -> Dict:
+    try:
+        data = json.loads(_body(environ) or b"{}")
+    except ValueError:
+        raise HTTPError("400 Bad Request", "Body must be JSON.")
+    if not isinstance(data, dict):
+        raise HTTPError("400 Bad Request", "Body must be a JSON object.")
+    return data
+
+
+def _items(data: Dict) -> list:
+    items = data.get("items")
+    if not isinstance(items, list):
+        raise HTTPError("400 Bad Request", "'items' must be a list.")
+    if len(items) > MAX_BATCH:
+        raise HTTPError("413 Payload Too Large", f"At most {MAX_BATCH} items per batch.")
+    return items
+
+
+def _int(value, name: str, default: Optional[int] = None) -> Optional[int]:
+    """``value`` as an int (numbers or numeric strings); 400 otherwise. None/"" give ``default``."""
+    if value is None or value == "":
+        return default
+    try:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        raise HTTPError("400 Bad Request", f"'{name}' must be a number.")
+
+
+def _str(value, name: str, default: Optional[str] = None, required: bool = False) -> Optional[str]:
+    """``value`` as a string; 400 for other types. None/"" give ``default`` (or a 400 when ``required``)."""
+    if value is None or value == "":
+        if required:
+            raise HTTPError("400 Bad Request", f"'{name}' is required.")
+        return default
+    if not isinstance(value, str):
+        raise HTTPError("400 Bad Request", f"'{name}' must be a string.")
+    return value
+
+
+def _salary(value, name: str = "expected_salary") -> Optional[int]:
+    """``_int`` for an expected annual salary; 400 outside SALARY_MIN..SALARY_MAX."""
+    value = _int(value, name)
+    if value is not None and not SALARY_MIN <= value <= SALARY_MAX:
+        raise HTTPError("400 Bad Request", f"'{name}' must be between {SALARY_MIN:,} and {SALARY_MAX:,}.")
+    return value
+
+
+def _caller(environ) -> str:
+    """Quota identity. X-User is trusted only when an API key is required (and was checked)."""
+    return _user(environ) or "api"
+
+
+def _user(environ) -> str:
+    """The trusted X-User, or "" when callers are anonymous (no API key)."""
+    return (environ.get("HTTP_X_USER") or "") if API_KEY else ""
+
+
+def _content_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _gpt(environ, task: str, prompt: str, priority: str = INTERACTIVE):
+    """GPT text for ``prompt`` (model routed by ``task``) or None when no client is configured."""
+    if client is None:
+        return None
+    try:
+        resp = routed_completion(client, task, [{"role": "user", "content": prompt}], username=_caller(environ),
+                                 priority=priority, page="api",
+                                 latency_budget=INTERACTIVE_LATENCY_S if priority == INTERACTIVE else None)
+    except QuotaExceeded as e:
+        raise HTTPError("429 Too Many Requests", str(e))
+    return (resp.choices[0].message.content or "").strip()
+
+
+# ---------------- Handlers ----------------
+@route("GET", "/health")
+def health(environ):
+    return {"status": "ok", "gpt": client is not None}
+
+
+@route("GET", "/ready")
+def ready(environ):
+    report = warmup.status()
+    if not report["ready"]:
+        raise HTTPError("503 Service Unavailable", "Warming up.", report)
+    return report
+
+
+@route("POST", "/extract")
+def extract(environ):
+    query = parse_qs(environ.get("QUERY_STRING", ""))
+    name = (query.get("filename") or [environ.get("HTTP_X_FILENAME", "")])[0]
+    try:
+        return {"text": extract_text(io.BytesIO(_body(environ)), name)}
+    except UploadRejected as e:
+        raise HTTPError("413 Payload Too Large", str(e))
+
+
+def _fit(req: Dict, user: str) -> Dict:
+    """One fit analysis; its salary comparison is the one the API logs for analytics."""
+    if not isinstance(req, dict):
+        raise HTTPError("400 Bad Request", "jd_text and resume_text are required.")
+    location = _str(req.get("location_level"), "location_level", "standard")
+    expected = _salary(req.get("expected_salary"))
+    result = analyze_fit(_str(req.get("jd_text"), "jd_text", required=True),
+                         _str(req.get("resume_text"), "resume_text", required=True),
+                         _str(req.get("role"), "role", ""), location, _str(req.get("level"), "level"), expected)
+    get_salary_log().record(result["salary"], expected, location, source=user)
+    return result
+
+
+@route("POST", "/fit")
+def fit(environ):
+    return _fit(_json(environ), _user(environ))
+
+
+@route("POST", "/fit/batch")
+def fit_batch(environ):
+    return {"results": [_fit(req, _user(environ)) for req in _items(_json(environ))]}
+
+
+@route("POST", "/fit/rank")
+def fit_rank(environ):
+    req = _json(environ)
+    jobs = _items({"items": req.get("jobs")})
+    if not all(isinstance(j, dict) for j in jobs):
+        raise HTTPError("400 Bad Request", "jobs must be objects with a text field.")
+    jobs = [{"text": _str(j.get("text"), "jobs[].text", required=True), "name": _str(j.get("name"), "jobs[].name", ""),
+             "role": _str(j.get("role"), "jobs[].role")} for j in jobs]
+    rows = rank_jobs(_str(req.get("resume_text"), "resume_text", required=True), jobs,
+                     _str(req.get("location_level"), "location_level", "standard"), _str(req.get("level"), "level"),
+                     _salary(req.get("expected_salary")), bool(req.get("collapse_duplicates")))
+    return {"results": rows, "skipped": skipped_jobs(len(jobs), rows)}
+
+
+@route("POST", "/salary")
+def salary(environ):
+    req = _json(environ)
+    result = salary_alignment(_str(req.get("role"), "role", required=True),
+                              _str(req.get("location_level"), "location_level", "standard"),
+                              _str(req.get("level"), "level"), _salary(req.get("expected_salary")))
+    if result is None:
+        raise HTTPError("404 Not Found", "No salary band found for this role.")
+    return result
+
+
+@route("POST", "/salary/batch")
+def salary_batch(environ):
+    req = _json(environ)
+    expected = req.get("expected")
+    if not isinstance(expected, list) or len(expected) > MAX_BATCH * 100:
+        raise HTTPError("400 Bad Request", f"'expected' must be a list of at most {MAX_BATCH * 100} numbers.")
+    roles = req.get("roles", "")
+    if isinstance(roles, list):
+        if len(roles) != len(expected):
+            raise HTTPError("400 Bad Request", "'roles' must match 'expected' in length.")
+        roles = [_str(r, "roles[]", "") for r in roles]
+    else:
+        roles = _str(roles, "roles", "")
+    expected = [_salary(v, "expected") for v in expected]
+    if any(v is None for v in expected):
+        raise HTTPError("400 Bad Request", "'expected' must be a list of numbers.")
+    return compare_salary_batch(expected, roles, _str(req.get("location_level"), "location_level", "standard"),
+                                _str(req.get("level"), "level"))
+
+
+@route("POST", "/summary")
+def summary(environ):
+    req = _json(environ)
+    name, role, experience, skills = (_str(req.get(k), k, "") for k in ("full_name", "role", "experience", "skills"))
+    out = None
+    if req.get("use_gpt"):
+        out = _gpt(environ, "summary",
+                   f"Write a concise, ATS-friendly professional summary for {name} targeting {role}. "
+                   f"Experience: {experience}. Skills: {skills}. 3-5 bullet highlights.")
+    if out is None:
+        out = summary_offline(name, role, experience, skills)
+    return {"summary": out}
+
+
+def _question_params(req: Dict) -> Tuple[str, int]:
+    if not isinstance(req, dict):
+        raise HTTPError("400 Bad Request", "text is required.")
+    _str(req.get("text"), "text", required=True)
+    return _str(req.get("qtype"), "qtype", "Mixed"), max(1, min(_int(req.get("count"), "count", 5), 20))
+
+
+def _questions_gpt(environ, reqs: List[Dict], qtype: str, count: int) -> Tuple[List[Dict], Dict]:
+    """GPT questions for requests sharing (qtype, count): near-duplicates reuse earlier answers,
+    the rest go upstream in JSON-schema batches. Only GPT answers are cached, per caller."""
+    username = _caller(environ)
+    index = get_index(f"questions:{username}:{qtype}:{count}")
+    results: List[Optional[Dict]] = [None] * len(reqs)
+    todo = []
+    for k, req in enumerate(reqs):
+        hit = index.find_duplicate(req["text"])
+        if hit is not None:
+            results[k] = {"questions": index.payload(hit[0]), "duplicate_of": hit[0]}
+        else:
+            todo.append((str(k), req["text"]))
+    stats = {}
+    if todo:
+        owner = group_duplicates([text for _, text in todo])
+        unique = [doc for j, doc in enumerate(todo) if owner[j] == j]
+        offline = set()
+        try:
+            out, stats = generate_questions_batch(client, unique, qtype, count, username=username,
+                                                  offline_ids=offline)
+        except QuotaExceeded as e:
+            raise HTTPError("429 Too Many Requests", str(e))
+        for j, (doc_id, text) in enumerate(todo):
+            first_id, first_text = todo[owner[j]]
+            if owner[j] == j and doc_id not in offline:
+                index.add(_content_key(text), text, payload=out[doc_id])
+            results[int(doc_id)] = {"questions": out[first_id],
+                                    "duplicate_of": None if owner[j] == j else _content_key(first_text)}
+    return results, stats
+
+
+@route("POST", "/questions")
+def questions(environ):
+    req = _json(environ)
+    qtype, count = _question_params(req)
+    if req.get("use_gpt") and client is not None:
+        return _questions_gpt(environ, [req], qtype, count)[0][0]
+    return {"questions": questions_offline(req["text"], qtype, count)}
+
+
+@route("POST", "/questions/batch")
+def questions_batch(environ):
+    reqs = _items(_json(environ))
+    params = [_question_params(req) for req in reqs]
+    results: List[Optional[Dict]] = [None] * len(reqs)
+    groups: Dict[Tuple[str, int], List[int]] = {}
+    for k, (req, (qtype, count)) in enumerate(zip(reqs, params)):
+        if req.get("use_gpt") and client is not None:
+            groups.setdefault((qtype, count), []).append(k)
+        else:
+            results[k] = {"questions": questions_offline(req["text"], qtype, count)}
+    totals: Dict[str, int] = {}
+    for (qtype, count), members in groups.items():
+        out, stats = _questions_gpt(environ, [reqs[k] for k in members], qtype, count)
+        for k, res in zip(members, out):
+            results[k] = res
+        for name, v in stats.items():
+            totals[name] = totals.get(name, 0) + v
+    return {"results": results, "stats": totals}
+
+
+# ---------------- WSGI entry point ----------------
+def app(environ, start_response):
+    status, payload = "200 OK", None
+    try:
+        method, path = environ.get("REQUEST_METHOD", "GET"), environ.get("PATH_INFO", "/").rstrip("/") or "/"
+        if API_KEY and environ.get("HTTP_X_API_KEY") != API_KEY and path != "/ready":
+            raise HTTPError("401 Unauthorized", "Missing or invalid X-API-Key.")
+        handler = ROUTES.get((method, path))
+        if handler is None:
+            known = any(p == path for _, p in ROUTES)
+            raise HTTPError("405 Method Not Allowed" if known else "404 Not Found", f"No route for {method} {path}.")
+        payload = handler(environ)
+    except HTTPError as e:
+        status, payload = e.status, dict(e.payload or {}, error=str(e))
+    except Exception as e:
+        traceback.print_exc()
+        status, payload = "500 Internal Server Error", {"error": f"{type(e).__name__}: {e}"}
+    body = json.dumps(payload).encode("utf-8")
+    start_response(status, [("Content-Type", "application/json"), ("Content-Length", str(len(body)))])
+    return [body]
+
+
+# Each worker warms itself in the background; GET /ready says when it is done.
+warmup.start(warmup.api_steps(client))
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    with make_server("0.0.0.0", port, app, server_class=_ThreadingWSGIServer) as server:
+        print(f"ResumeReadyPro API on http://0.0.0.0:{port} (use gunicorn -w N api:app for multiple workers)")
+        server.serve_forever()
@@ -0,0 +1,61 @@
+# api_client.py
+# Thin client for the headless API (api.py), used by the Streamlit UI when
+# RESUMEREADY_API_URL is set; otherwise the UI runs the same logic in-process.
+
+import os
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Dict, List
+
+API_URL = os.getenv("RESUMEREADY_API_URL", "").rstrip("/")
+API_KEY = os.getenv("RESUMEREADY_API_KEY", "")
+API_TIMEOUT = float(os.getenv("RESUMEREADY_API_TIMEOUT", "30"))
+
+
+class APIClientError(Exception):
+    """The API was unreachable or returned an error."""
+
+
+def api_enabled() -> bool:
+    return bool(API_URL)
+
+
+def _request(path: str, payload=None, data: bytes = None, headers: Dict = None) -> Dict:
+    headers = dict(headers or {})
+    if API_KEY:
+        headers["X-API-Key"] = API_KEY
+    if payload is not None:
+        data = json.dumps(payload).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    req = urllib.request.Request(API_URL + path, data=data, headers=headers, method="POST" if data is not None else "GET")
+    try:
+        with urllib.request.urlopen(req, timeout=API_TIMEOUT) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        try:
+            detail = json.loads(e.read().decode("utf-8")).get("error", "")
+        except Exception:
+            detail = ""
+        raise APIClientError(f"HTTP {e.code} {detail}".strip()) from e
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise APIClientError(str(e)) from e
+
+
+def extract_text(uploaded_file, name: str = "") -> str:
+    name = urllib.parse.quote(name or getattr(uploaded_file, "name", "") or "upload")
+    return _request(f"/extract?filename={name}", data=uploaded_file.getvalue(),
+                    headers={"Content-Type": "application/octet-stream"})["text"]
+
+
+def analyze_fit(**kwargs) -> Dict:
+    return _request("/fit", kwargs)
+
+
+def summary(**kwargs) -> str:
+    return _request("/summary", kwargs)["summary"]
+
+
+def questions(**kwargs) -> List[str]:
+    return _request("/questions", kwargs)["questions"]
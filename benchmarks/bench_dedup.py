@@ -0,0 +1,92 @@
+# benchmarks/bench_dedup.py
+# MinHash/LSH near-duplicate detection on a synthetic resume/JD corpus:
+# precision/recall against exact shingle Jaccard, and index/query throughput
+# vs. a brute-force signature scan.
+#
+#   python benchmarks/bench_dedup.py [base_docs]
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import DEDUP_THRESHOLD, LSHIndex, jaccard, minhash, similarity
+
+WORDS = ("python sql aws docker kubernetes spark led built delivered improved reduced latency cost "
+         "pipelines stakeholders mentoring platform data model dashboards migration team customers "
+         "design review testing on-call incidents budget roadmap hiring analytics security").split()
+
+
+def fake_doc(rnd: random.Random, n: int) -> str:
+    return " ".join(rnd.choice(WORDS) + (str(rnd.randint(0, 99)) if rnd.random() < 0.3 else "") for _ in range(n))
+
+
+def mutate(rnd: random.Random, text: str, rate: float) -> str:
+    """Replace, drop or insert roughly ``rate`` of the words (a minor edit or a repost)."""
+    out = []
+    for w in text.split():
+        r = rnd.random()
+        if r < rate / 3:
+            continue
+        out.append(rnd.choice(WORDS) if r < 2 * rate / 3 else w)
+        if r > 1 - rate / 3:
+            out.append(rnd.choice(WORDS))
+    return " ".join(out)
+
+
+def main(base_docs: int = 2000):
+    rnd = random.Random(11)
+    corpus, origin = [], []
+    for i in range(base_docs):
+        doc = fake_doc(rnd, rnd.randint(150, 600))
+        corpus.append(doc)
+        origin.append(i)
+        for _ in range(rnd.choice((0, 0, 1, 2))):
+            corpus.append(mutate(rnd, doc, rnd.choice((0.01, 0.03, 0.08, 0.2))))
+            origin.append(i)
+    order = list(range(len(corpus)))
+    rnd.shuffle(order)
+    corpus = [corpus[k] for k in order]
+    origin = [origin[k] for k in order]
+    print(f"corpus: {len(corpus)} docs from {base_docs} originals, threshold {DEDUP_THRESHOLD}")
+
+    t0 = time.perf_counter()
+    sigs = [minhash(t) for t in corpus]
+    t_sig = time.perf_counter() - t0
+
+    index = LSHIndex()
+    found = {}
+    t0 = time.perf_counter()
+    for k, sig in enumerate(sigs):
+        found[k] = [j for j, _ in index.query(signature=sig)]
+        index.add(k, signature=sig)
+    t_lsh = time.perf_counter() - t0
+
+    sample = range(0, len(sigs), max(1, len(sigs) // 300))
+    t0 = time.perf_counter()
+    for k in sample:
+        [j for j in range(k) if similarity(sigs[k], sigs[j]) >= DEDUP_THRESHOLD]
+    t_scan = (time.perf_counter() - t0) / len(sample) * len(sigs)
+
+    # ground truth: exact Jaccard over same-origin pairs (different origins share ~no 3-word shingles)
+    tp = fp = fn = 0
+    for k in range(len(corpus)):
+        truth = {j for j in range(k) if origin[j] == origin[k] and jaccard(corpus[j], corpus[k]) >= DEDUP_THRESHOLD}
+        got = set(found[k])
+        tp += len(truth & got)
+        fp += len(got - truth)
+        fn += len(truth - got)
+    precision = tp / max(1, tp + fp)
+    recall = tp / max(1, tp + fn)
+
+    n = len(corpus)
+    print(f"signatures:        {t_sig * 1e3:8.1f} ms  ({n / t_sig:,.0f} docs/s)")
+    print(f"LSH index+query:   {t_lsh * 1e3:8.1f} ms  ({n / t_lsh:,.0f} docs/s)")
+    print(f"brute-force scan:  {t_scan * 1e3:8.1f} ms  (estimated, same queries)")
+    print(f"precision {precision:.3f}  recall {recall:.3f}  (pairs: tp={tp} fp={fp} fn={fn})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,63 @@
+# benchmarks/bench_resume_model.py
+# Memory per stored resume: ParsedResume spans vs. a dict of section strings.
+#
+#   python benchmarks/bench_resume_model.py [count]
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_model import segment_resume
+
+WORDS = ("python sql aws docker kubernetes spark led built delivered improved reduced latency cost "
+         "pipelines stakeholders mentoring platform data model dashboards migration").split()
+
+
+def fake_resume(rnd: random.Random) -> str:
+    def para(n):
+        return " ".join(rnd.choice(WORDS) for _ in range(n))
+    jobs = "\n".join(f"Company {i} — Engineer\n- {para(18)}\n- {para(14)}" for i in range(rnd.randint(2, 5)))
+    return (f"Candidate {rnd.randint(1, 10**6)}\nemail@example.com\n\nSUMMARY\n{para(40)}\n\n"
+            f"Professional Experience\n{jobs}\n\nEducation\nBS Computer Science\n\n"
+            f"Technical Skills: {', '.join(rnd.sample(WORDS, 8))}\n\nProjects\n- {para(20)}\n")
+
+
+def as_dict(text: str) -> dict:
+    parsed = segment_resume(text)
+    out = {}
+    for name, s, e in parsed.spans():
+        out[name] = out.get(name, "") + text[s:e]
+    return out
+
+
+def measure(build, texts):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    t0 = time.perf_counter()
+    kept = [build(t) for t in texts]
+    elapsed = time.perf_counter() - t0
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return kept, size, elapsed
+
+
+def main(count: int = 2000):
+    rnd = random.Random(3)
+    texts = [fake_resume(rnd) for _ in range(count)]
+    avg_text = sum(len(t) for t in texts) / count
+    segment_resume.cache_clear()
+    _, spans_bytes, spans_s = measure(lambda t: segment_resume.__wrapped__(t), texts)
+    _, dict_bytes, _ = measure(as_dict, texts)
+    print(f"resumes={count:,} avg text={avg_text:,.0f} chars")
+    print(f"ParsedResume: {spans_bytes / count:,.0f} B/resume over the text, "
+          f"segmentation {spans_s / count * 1000:.3f} ms/resume")
+    print(f"dict of section strings: {dict_bytes / count:,.0f} B/resume")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,96 @@
+# benchmarks/bench_salary.py
+# Synthetic 100k-row band table: load time, role resolution latency, batch compare throughput.
+#
+#   python benchmarks/bench_salary.py [rows]
+
+import os
+import sys
+import csv
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import salary
+
+ROLE_WORDS = ["data", "ml", "software", "cloud", "security", "platform", "site reliability", "backend",
+              "frontend", "mobile", "devops", "analytics", "product", "solutions", "network", "database"]
+ROLE_SUFFIX = ["engineer", "analyst", "scientist", "architect", "manager", "developer", "administrator"]
+LOCATIONS = ["standard", "high-cost", "low-cost", "remote"] + [f"metro-{i}" for i in range(40)]
+LEVELS = ["junior", "mid", "senior", "lead", "staff", "principal"]
+
+
+def write_csv(path: str, rows: int):
+    rnd = random.Random(7)
+    roles = [f"{a} {b}" for a in ROLE_WORDS for b in ROLE_SUFFIX]
+    roles += [f"{r} {i}" for r in roles for i in range(rows // (len(roles) * len(LOCATIONS) * len(LEVELS)) + 1)]
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["role", "location", "level", "low", "mid", "high"])
+        n = 0
+        for role in roles:
+            for loc in LOCATIONS:
+                for lvl in LEVELS:
+                    if n >= rows:
+                        return
+                    mid = rnd.randint(60, 250) * 1000
+                    w.writerow([role, loc, lvl, int(mid * 0.8), mid, int(mid * 1.25)])
+                    n += 1
+
+
+def main(rows: int = 100_000):
+    path = os.path.join(tempfile.mkdtemp(), "bands.csv")
+    write_csv(path, rows)
+
+    t0 = time.perf_counter()
+    table = salary.load_band_table(path)
+    load_s = time.perf_counter() - t0
+    salary._TABLE = table
+    print(f"rows={len(table):,} roles={len(table.roles):,} load={load_s:.2f}s")
+
+    # A CSV row for a non-standard tier must be returned as is, not standard x multiplier.
+    table.add("tier check engineer", "high-cost", "mid", 111000, 222000, 333000)
+    table.add("tier check engineer", "standard", "mid", 1000, 2000, 3000)
+    assert table.band("Tier Check Engineer", "high-cost") == (111000, 222000, 333000)
+    assert table.band("Tier Check Engineer", "High-Cost", "MID") == (111000, 222000, 333000)
+    assert table.band("Tier Check Engineer", "remote") == (1000, 2000, 3000)
+
+    # A shared generic head noun alone is not a match ("QA Engineer" is not an ML engineer).
+    default = salary.build_default_table()
+    for title in ("QA Engineer", "Sales Engineer", "Mechanical Engineer", "Network Engineer", "Data Engineer",
+                  "Engineering Manager", "Site Reliability Engineer", "Business Analyst"):
+        assert default.resolve_role(title)[0] is None, title
+    for title, role in (("Sr. Data Scientist", "data scientist"), ("Data Scientst", "data scientist"),
+                        ("Machine Learning Engineer", "ml engineer"), ("Senior Software Developer", "software engineer")):
+        assert default.resolve_role(title)[0] == role, title
+
+    titles = ["Sr. Data Scientist", "Data Scientist II", "Senior Cloud Eng", "Principal Solutions Architect",
+              "jr backend developer", "Staff Site Reliability Engineer", "Analytics Mgr"]
+    t0 = time.perf_counter()
+    for t in titles:
+        table.resolve_role(t)
+    cold_ms = (time.perf_counter() - t0) / len(titles) * 1000
+
+    t0 = time.perf_counter()
+    for _ in range(10_000):
+        for t in titles:
+            salary.estimate_salary_band(t, "metro-3")
+    warm_ms = (time.perf_counter() - t0) / (10_000 * len(titles)) * 1000
+    print(f"resolve cold={cold_ms:.3f}ms/lookup  estimate warm={warm_ms:.4f}ms/lookup")
+
+    n = 10_000
+    rnd = random.Random(1)
+    expected = [rnd.randint(50, 300) * 1000 for _ in range(n)]
+    roles = [rnd.choice(titles) for _ in range(n)]
+    locs = [rnd.choice(LOCATIONS) for _ in range(n)]
+    t0 = time.perf_counter()
+    out = salary.compare_salary_batch(expected, roles, locs)
+    batch_s = time.perf_counter() - t0
+    print(f"compare_salary_batch n={n:,} {batch_s * 1000:.1f}ms ({n / batch_s:,.0f}/s) "
+          f"numpy={'yes' if salary.np is not None else 'no'} "
+          f"unmatched={sum(s is None for s in out['status'])}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,72 @@
+# benchmarks/bench_salary_analytics.py
+# Salary alignment log at scale: ingest rate, cold frame load, aggregate time
+# (all rows and one role), and a cached dashboard rerun.
+#
+#   python benchmarks/bench_salary_analytics.py [rows]
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary import SALARY_BANDS
+from salary_analytics import SalaryLog, aggregate
+
+LOCATIONS = ["standard", "high-cost", "low-cost", "remote"]
+LEVELS = ["junior", "mid", "senior", "lead"]
+CHUNK = 50_000
+
+
+def rows(n: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    roles = list(SALARY_BANDS)
+    start = int(time.time()) - 365 * 24 * 3600
+    for off in range(0, n, CHUNK):
+        k = min(CHUNK, n - off)
+        role = rng.integers(0, len(roles), k)
+        mid = np.array([SALARY_BANDS[r][1] for r in roles])[role] * rng.uniform(0.9, 1.2, k)
+        lo, hi = (mid * 0.8).astype(int), (mid * 1.25).astype(int)
+        expected = (mid * rng.normal(1.05, 0.2, k)).astype(int)
+        status = np.where(expected < lo, -1, np.where(expected > hi, 1, 0))
+        ts = np.sort(rng.integers(start, start + 365 * 24 * 3600, k))
+        loc, lvl = rng.integers(0, len(LOCATIONS), k), rng.integers(0, len(LEVELS), k)
+        yield [(int(ts[i]), roles[role[i]], LOCATIONS[loc[i]], LEVELS[lvl[i]], int(expected[i]), int(lo[i]),
+                int(mid[i]), int(hi[i]), int(status[i])) for i in range(k)]
+
+
+def timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t) * 1000
+
+
+def main(n: int = 1_000_000):
+    tmp = tempfile.mkdtemp(prefix="bench-salary-analytics-")
+    log = SalaryLog(os.path.join(tmp, "log.sqlite3"), os.path.join(tmp, "segments"))
+    t = time.perf_counter()
+    for chunk in rows(n):
+        log.record_many(chunk)
+    ingest_s = time.perf_counter() - t
+    seg_mb = sum(os.path.getsize(os.path.join(log.directory, f)) for f in os.listdir(log.directory)) / 2 ** 20
+    print(f"rows={n:,} ingest={n / ingest_s:,.0f} rows/s segments={len(os.listdir(log.directory))} "
+          f"({seg_mb:.1f} MB) staged={log.staged_count():,}")
+
+    df, load_ms = timed(log.frame)
+    print(f"cold frame load: {load_ms:.0f} ms ({df.memory_usage(deep=True).sum() / 2 ** 20:.0f} MB in memory)")
+    _, agg_ms = timed(lambda: aggregate(df))
+    _, role_ms = timed(lambda: aggregate(df, role="data scientist"))
+    print(f"aggregate all rows: {agg_ms:.0f} ms, one role: {role_ms:.0f} ms")
+    log.dashboard()
+    _, warm_ms = timed(log.dashboard)
+    print(f"cached dashboard rerun: {warm_ms:.2f} ms")
+    log.record_many([next(rows(1, seed=9))[0]])
+    _, new_ms = timed(log.dashboard)
+    print(f"dashboard after one new row (segments cached, frame rebuilt): {new_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
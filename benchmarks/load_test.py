@@ -0,0 +1,298 @@
+# benchmarks/load_test.py
+# Concurrent-session load test for streamlit_app.py.
+#
+# Each virtual user is a Streamlit AppTest session (one script run per
+# interaction, like a browser rerun) on its own thread, all inside this one
+# process, so they share module state (user store, quotas, caches) the way
+# sessions share a server process. Users log in, then loop through Upload
+# Resume, Job Fit & Salary (paste + Analyze Fit), Prompt Lab (Run) and Admin
+# Dashboard. LLM calls go to an in-process stub_server.py. AppTest can't drive
+# file uploads, so "Upload Resume" measures the page rerun only.
+#
+# Concurrency ramps through --users; each level reports per-page rerun
+# latency percentiles, reruns/s, CPU (cores busy) and peak RSS. Results are
+# written as JSON tagged with the git commit; --compare prints deltas against
+# an earlier run.
+#
+#   python benchmarks/load_test.py --users 1,2,4,8 --loops 3
+#   python benchmarks/load_test.py --users 1,4 --compare benchmarks/results/load_<sha>.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = "streamlit_app.py"
+PASSWORD = "loadtest-pass"
+JD_TEXT = ("Data Analyst\nWe need python, sql, excel and tableau. Communication with stakeholders.\n\n"
+           "- Build dashboards\n- Own data quality")
+RESUME_TEXT = ("Summary\nAnalyst with 4 years of python and sql.\n\nExperience\n- Built tableau dashboards\n"
+               "- Led stakeholder reviews\n\nSkills\npython, sql, pandas, excel")
+
+# Every store/output location the apps read from the environment -> name in the scratch dir.
+SCRATCH_PATHS = {
+    "USERS_STORE": "users.sqlite3",
+    "LLM_QUOTA_DB": "quota.sqlite3",
+    "ANALYSIS_HISTORY_DB": "history.sqlite3",
+    "JOB_FEED_DB": "job_feed.sqlite3",
+    "JOB_FEED_DIR": "job_feed",
+    "SALARY_ANALYTICS_DB": "salary_analytics.sqlite3",
+    "SALARY_ANALYTICS_DIR": "salary_analytics",
+    "BLOB_STORE": "blobs.sqlite3",
+    "EXPORT_DIR": "exports",
+    "PROMPT_BATCH_DIR": "batch_runs",
+}
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+
+def _configure_env(args, workdir: str):
+    """Point every store at a scratch dir and the OpenAI client at the stub, before the app imports."""
+    for var, name in SCRATCH_PATHS.items():
+        os.environ[var] = os.path.join(workdir, name)
+    os.environ["OPENAI_API_KEY"] = "stub"
+    if not args.keep_quotas:
+        os.environ["LLM_REQUESTS_PER_MIN"] = "1000000"
+        os.environ["LLM_TOKENS_PER_MIN"] = "1000000000"
+
+
+def _start_stub(latency: str):
+    from stub_server import StubConfig, make_server
+    server = make_server(StubConfig(latency=latency, token_delay=0.0), "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    return server
+
+
+def _seed_accounts(n: int):
+    from user_store import get_store
+    store = get_store()
+    for i in range(n):
+        store.register(f"lt{i}", {"name": f"Load Test {i}", "password": PASSWORD, "summaries": 0,
+                                  "resumes": 0, "questions": 0})
+
+
+# ---------------- Process sampling ----------------
+def _rss_bytes() -> int:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system
+
+
+class Sampler(threading.Thread):
+    def __init__(self, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak_rss = _rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# ---------------- Virtual user ----------------
+class VirtualUser:
+    def __init__(self, index: int, accounts: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+        self.username = f"lt{index % accounts}"
+        self.at = AppTest.from_file(os.path.join(ROOT, APP), default_timeout=timeout)
+        self.timings = {}
+        self.errors = {}
+
+    def _timed(self, page: str, action):
+        start = time.perf_counter()
+        try:
+            action()
+            # The app reports failed LLM calls with st.error + a debug caption rather than raising.
+            if len(self.at.exception):
+                error = self.at.exception[0].message
+            elif len(self.at.error):
+                error = " ".join([self.at.error[0].value] + [c.value for c in self.at.caption if "Debug" in c.value])
+            else:
+                error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if error:
+            self.errors.setdefault(page, []).append(error)
+        self.timings.setdefault(page, []).append(time.perf_counter() - start)
+
+    def _button(self, label: str):
+        return next(b for b in self.at.button if b.label == label)
+
+    def _goto(self, page: str):
+        self.at.sidebar.radio[0].set_value(page).run()
+
+    def login(self):
+        self._timed("Load", self.at.run)
+
+        def submit():
+            self.at.text_input[0].input(self.username)
+            self.at.text_input[1].input(PASSWORD)
+            self._button("Login").click().run()
+            if not self.at.sidebar.radio:
+                raise RuntimeError("login failed")
+        self._timed("Login", submit)
+
+    def loop(self):
+        self._timed("Upload Resume", lambda: self._goto("Upload Resume"))
+        self._timed("Job Fit & Salary", lambda: self._goto("Job Fit & Salary"))
+
+        def analyze():
+            self.at.text_area(key="jd_text").input(JD_TEXT)
+            self.at.text_area(key="rs_text").input(RESUME_TEXT + f"\n\n- Run {time.perf_counter()}")
+            self._button("Analyze Fit").click().run()
+        self._timed("Job Fit: Analyze", analyze)
+        self._timed("Prompt Lab", lambda: self._goto("Prompt Lab"))
+
+        def run_prompt():
+            self.at.text_area[0].input(f"Write a resume summary for a data analyst ({time.perf_counter()}).")
+            self._button("Run").click().run()
+        self._timed("Prompt Lab: Run", run_prompt)
+        self._timed("Admin Dashboard", lambda: self._goto("Admin Dashboard"))
+
+
+def _percentile(values, q: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def run_level(users: int, args) -> dict:
+    vus = [VirtualUser(i, args.accounts, args.timeout) for i in range(users)]
+    sampler = Sampler()
+    sampler.start()
+    cpu0, wall0 = _cpu_seconds(), time.perf_counter()
+
+    def drive(vu):
+        vu.login()
+        for _ in range(args.loops):
+            vu.loop()
+
+    threads = [threading.Thread(target=drive, args=(vu,)) for vu in vus]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall0
+    cpu = _cpu_seconds() - cpu0
+    sampler.stop()
+
+    pages, errors = {}, {}
+    for vu in vus:
+        for page, vals in vu.timings.items():
+            pages.setdefault(page, []).extend(vals)
+        for page, msgs in vu.errors.items():
+            errors.setdefault(page, []).extend(msgs)
+    reruns = sum(len(v) for v in pages.values())
+    return {
+        "users": users,
+        "wall_s": round(wall, 2),
+        "reruns": reruns,
+        "throughput_rps": round(reruns / wall, 2),
+        "cpu_cores": round(cpu / wall, 2),
+        "rss_peak_mb": round(sampler.peak_rss / 2 ** 20, 1),
+        "errors": sum(len(m) for m in errors.values()),
+        "error_samples": {page: sorted(set(m))[:3] for page, m in errors.items()},
+        "pages": {page: {"n": len(v),
+                         "errors": len(errors.get(page, ())),
+                         "p50_ms": round(_percentile(v, 0.5) * 1e3, 1),
+                         "p90_ms": round(_percentile(v, 0.9) * 1e3, 1),
+                         "p99_ms": round(_percentile(v, 0.99) * 1e3, 1),
+                         "max_ms": round(max(v) * 1e3, 1)} for page, v in pages.items()},
+    }
+
+
+def _commit() -> str:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+
+def print_level(level: dict, baseline: dict = None):
+    print(f"\n== {level['users']} users: {level['throughput_rps']} reruns/s, {level['cpu_cores']} cores, "
+          f"RSS peak {level['rss_peak_mb']} MB, errors {level['errors']}")
+    print(f"   {'page':<20}{'n':>5}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+          + (f"{'Δp50':>10}{'Δp90':>10}" if baseline else ""))
+    for page, s in level["pages"].items():
+        line = f"   {page:<20}{s['n']:>5}{s['p50_ms']:>10}{s['p90_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}"
+        base = (baseline or {}).get("pages", {}).get(page)
+        if base:
+            line += f"{s['p50_ms'] - base['p50_ms']:>+10.1f}{s['p90_ms'] - base['p90_ms']:>+10.1f}"
+        print(line)
+    for page, msgs in level["error_samples"].items():
+        print(f"   ! {page}: {msgs[0][:150]}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit app.")
+    ap.add_argument("--users", default="1,2,4,8", help="comma-separated concurrency levels")
+    ap.add_argument("--loops", type=int, default=3, help="page loops per virtual user after login")
+    ap.add_argument("--accounts", type=int, default=4, help="distinct login accounts shared by virtual users")
+    ap.add_argument("--stub-latency", default="lognormal:-1.5,0.4", help="LLM stub latency distribution")
+    ap.add_argument("--timeout", type=float, default=120, help="per-rerun timeout (s)")
+    ap.add_argument("--keep-quotas", action="store_true", help="keep the real per-user LLM quotas")
+    ap.add_argument("--out", default=None, help="results JSON (default benchmarks/results/load_<commit>.json)")
+    ap.add_argument("--compare", default=None, help="earlier results JSON to diff against")
+    args = ap.parse_args(argv)
+
+    from streamlit.logger import set_log_level
+    set_log_level("error")  # AppTest sessions run bare; silence per-rerun context/deprecation warnings
+    os.chdir(ROOT)  # the app loads assets/ relative to the repo root
+    sys.path.insert(0, ROOT)
+    workdir = tempfile.mkdtemp(prefix="rrp-load-")
+    _configure_env(args, workdir)
+    _start_stub(args.stub_latency)
+    _seed_accounts(args.accounts)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = {lvl["users"]: lvl for lvl in json.load(fh)["levels"]}
+
+    commit = _commit()
+    results = {"commit": commit, "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+               "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")}, "levels": []}
+    for users in [int(u) for u in args.users.split(",") if u.strip()]:
+        level = run_level(users, args)
+        results["levels"].append(level)
+        print_level(level, baseline.get(users))
+
+    out = args.out or os.path.join(ROOT, "benchmarks", "results", f"load_{commit}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+    print(f"\nResults written to {out}")
+
+
+if __name__ == "__main__":
+    main()
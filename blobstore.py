@@ -0,0 +1,252 @@
+# blobstore.py
+# Compressed, content-addressed storage for document text and LLM outputs.
+#
+# Every blob is stored under the SHA-256 of its contents, so the same resume,
+# JD or generated answer is kept once no matter how often it is saved. Blobs
+# are compressed one at a time: reading a record decompresses that record
+# only, never a shared stream or the whole store.
+#
+# Short texts (resumes, JDs, answers: a few KB) compress poorly on their own
+# because each starts with an empty window. A dictionary trained on a sample
+# of them (``BlobStore.train``) primes the compressor with the shared
+# vocabulary and boilerplate. The dictionary is stored in the same file; each
+# blob records which dictionary it used, so retraining never breaks old blobs.
+#
+# Codec: zstd (optional ``zstandard`` package) with a trained dictionary, else
+# zlib with a preset dictionary built from frequent sample lines/phrases. A
+# blob is kept raw when compression doesn't pay. Blobs written with zstd need
+# ``zstandard`` to be read back.
+#
+# Library only for now: the apps don't write through it. history.py keeps its
+# outputs (also compressed and deduplicated) in its own table so an output
+# commits in the same transaction as its history row.
+
+import os
+import zlib
+import sqlite3
+import hashlib
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Union
+
+# Optional: zstd (zlib otherwise)
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+BLOB_STORE = os.getenv("BLOB_STORE", "blobs.sqlite3")
+BLOB_ZSTD_LEVEL = int(os.getenv("BLOB_ZSTD_LEVEL", "6"))
+BLOB_ZLIB_LEVEL = 6
+DICT_SIZE = 16 * 1024          # zstd dictionary budget
+ZLIB_DICT_SIZE = 32 * 1024     # zlib can only look back 32 KB
+DICT_MAX_RECORD = 16 * 1024    # bigger blobs compress fine without a dictionary
+MIN_TRAIN_SAMPLES = 50
+
+RAW, ZLIB, ZSTD = 0, 1, 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash    BLOB PRIMARY KEY,
+    codec   INTEGER NOT NULL,
+    dict_id INTEGER,
+    size    INTEGER NOT NULL,
+    body    BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dicts (
+    id    INTEGER PRIMARY KEY,
+    codec INTEGER NOT NULL,
+    body  BLOB NOT NULL
+);
+"""
+
+
+def content_hash(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def _as_bytes(value: Union[str, bytes]) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else bytes(value)
+
+
+def build_zlib_dict(samples: Iterable[bytes], size: int = ZLIB_DICT_SIZE) -> bytes:
+    """Preset dictionary for zlib: the most frequent lines and word trigrams, most common last."""
+    counts: Counter = Counter()
+    for s in samples:
+        text = s.decode("utf-8", errors="ignore")
+        counts.update(line.strip() for line in text.splitlines() if len(line.strip()) > 3)
+        words = text.split()
+        counts.update(" ".join(words[i:i + 3]) for i in range(len(words) - 2))
+    parts, total = [], 0
+    for phrase, n in counts.most_common():
+        if n < 2 or total + len(phrase) + 1 > size:
+            break
+        parts.append(phrase)
+        total += len(phrase) + 1
+    # zlib matches nearer the end of the dictionary with shorter distances
+    return "\n".join(reversed(parts)).encode("utf-8")
+
+
+class BlobStore:
+    """SQLite-backed blob store; safe to share between threads and processes."""
+
+    def __init__(self, path: str = BLOB_STORE, codec: Optional[int] = None):
+        self.path = path
+        self.codec = codec if codec is not None else (ZSTD if zstandard is not None else ZLIB)
+        if self.codec == ZSTD and zstandard is None:
+            raise RuntimeError("zstd codec requested but zstandard is not installed")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._dicts: Dict[int, tuple] = {}  # id -> (codec, bytes)
+        self._local = threading.local()  # per-thread (de)compressor contexts
+        row = self._conn.execute("SELECT MAX(id) FROM dicts WHERE codec = ?", (self.codec,)).fetchone()
+        self._active: Optional[int] = row[0]
+
+    def _dict(self, dict_id: int) -> tuple:
+        if dict_id not in self._dicts:
+            with self._lock:
+                row = self._conn.execute("SELECT codec, body FROM dicts WHERE id = ?", (dict_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"missing compression dictionary {dict_id}")
+            self._dicts[dict_id] = (row[0], bytes(row[1]))
+        return self._dicts[dict_id]
+
+    def _zstd(self, dict_id: Optional[int], decompress: bool):
+        cache = self._local.__dict__.setdefault("zstd", {})
+        key = (dict_id, decompress)
+        if key not in cache:
+            zdict = zstandard.ZstdCompressionDict(self._dict(dict_id)[1]) if dict_id else None
+            cache[key] = zstandard.ZstdDecompressor(dict_data=zdict) if decompress \
+                else zstandard.ZstdCompressor(level=BLOB_ZSTD_LEVEL, dict_data=zdict)
+        return cache[key]
+
+    # ---- codec ----
+    def encode(self, data: bytes) -> tuple:
+        """(codec, dict_id, body) for ``data``; raw when compression doesn't shrink it."""
+        codec = self.codec
+        dict_id = self._active if self._active and len(data) <= DICT_MAX_RECORD else None
+        if codec == ZSTD:
+            body = self._zstd(dict_id, False).compress(data)
+        else:
+            comp = zlib.compressobj(BLOB_ZLIB_LEVEL, zdict=self._dict(dict_id)[1]) if dict_id \
+                else zlib.compressobj(BLOB_ZLIB_LEVEL)
+            body = comp.compress(data) + comp.flush()
+        if len(body) >= len(data):
+            return RAW, None, data
+        return codec, dict_id, body
+
+    def decode(self, codec: int, dict_id: Optional[int], body: bytes) -> bytes:
+        if codec == RAW:
+            return bytes(body)
+        if codec == ZSTD:
+            if zstandard is None:
+                raise RuntimeError("this blob is zstd-compressed; install zstandard to read it")
+            return self._zstd(dict_id, True).decompress(body)
+        d = zlib.decompressobj(zdict=self._dict(dict_id)[1]) if dict_id else zlib.decompressobj()
+        return d.decompress(body) + d.flush()
+
+    # ---- blobs ----
+    def put(self, value: Union[str, bytes]) -> bytes:
+        """Store ``value`` (once) and return its content hash."""
+        data = _as_bytes(value)
+        key = content_hash(data)
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (key,)).fetchone():
+                return key
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO blobs(hash, codec, dict_id, size, body) VALUES (?, ?, ?, ?, ?)",
+                               (key, *self._encoded(data)))
+        return key
+
+    def put_many(self, values: Iterable[Union[str, bytes]]) -> List[bytes]:
+        """``put`` for many values in one transaction."""
+        rows, keys = {}, []
+        for value in values:
+            data = _as_bytes(value)
+            key = content_hash(data)
+            keys.append(key)
+            if key not in rows:
+                rows[key] = (key, *self._encoded(data))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO blobs(hash, codec, dict_id, size, body) VALUES (?, ?, ?, ?, ?)",
+                    rows.values())
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return keys
+
+    def _encoded(self, data: bytes) -> tuple:
+        codec, dict_id, body = self.encode(data)
+        return codec, dict_id, len(data), body
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """The blob stored under ``key`` (decompressing only that record), or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT codec, dict_id, body FROM blobs WHERE hash = ?", (key,)).fetchone()
+        return self.decode(*row) if row else None
+
+    def get_text(self, key: bytes) -> Optional[str]:
+        data = self.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def __contains__(self, key: bytes) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (key,)).fetchone() is not None
+
+    # ---- dictionaries ----
+    def train(self, samples: Iterable[Union[str, bytes]]) -> Optional[int]:
+        """Train a dictionary on short sample texts and use it for new short blobs.
+
+        Returns the dictionary id, or None if there were too few samples.
+        """
+        samples = [_as_bytes(s) for s in samples]
+        samples = [s for s in samples if 0 < len(s) <= DICT_MAX_RECORD]
+        if len(samples) < MIN_TRAIN_SAMPLES:
+            return None
+        codec = self.codec
+        if codec == ZSTD:
+            body = zstandard.train_dictionary(DICT_SIZE, samples).as_bytes()
+        else:
+            body = build_zlib_dict(samples)
+        with self._lock:
+            dict_id = self._conn.execute("INSERT INTO dicts(codec, body) VALUES (?, ?)", (codec, body)).lastrowid
+        self._dicts[dict_id] = (codec, body)
+        self._active = dict_id
+        return dict_id
+
+    def train_from_store(self, limit: int = 2000) -> Optional[int]:
+        """Retrain on a sample of the short blobs already stored."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT codec, dict_id, body FROM blobs WHERE size <= ? ORDER BY hash LIMIT ?",
+                (DICT_MAX_RECORD, limit)).fetchall()
+        return self.train(self.decode(*r) for r in rows)
+
+    def stats(self) -> Dict:
+        """Blob count, raw vs stored bytes, ratio, and the active dictionary."""
+        with self._lock:
+            n, raw, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM blobs").fetchone()
+        return {"blobs": n, "raw_bytes": raw, "stored_bytes": stored,
+                "ratio": round(raw / stored, 2) if stored else None,
+                "codec": "zstd" if self.codec == ZSTD else "zlib", "dict_id": self._active}
+
+
+_STORE: Optional[BlobStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Process-wide blob store, opened once (module state survives Streamlit reruns)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = BlobStore()
+    return _STORE
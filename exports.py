@@ -0,0 +1,124 @@
+# exports.py
+# On-demand, chunked exports (CSV, JSONL, Parquet) cached by data version.
+#
+# Rows are pulled from a generator a chunk at a time and appended straight to
+# a file on disk, so building an export holds one chunk in memory no matter
+# how many users there are. Parquet writes one row group per chunk. The file
+# name carries a digest of the caller's data version: asking again before the
+# data changes returns the same file without touching the store, and a new
+# version replaces the old file. Builds go to a temp name and are renamed into
+# place, so concurrent sessions never serve a half-written export.
+
+import os
+import csv
+import json
+import hashlib
+import tempfile
+import itertools
+from typing import Callable, Dict, Iterable, Iterator, List
+
+# Optional: Parquet support
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = pq = None
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "resumeready-exports"))
+
+# format -> (mime type, file extension)
+FORMATS: Dict[str, tuple] = {
+    "csv": ("text/csv", ".csv"),
+    "jsonl": ("application/x-ndjson", ".jsonl"),
+}
+if pq is not None:
+    FORMATS["parquet"] = ("application/vnd.apache.parquet", ".parquet")
+
+_ARROW_TYPES = {"str": "string", "int": "int64", "float": "float64"}
+
+
+def chunked(rows: Iterable[dict], size: int = EXPORT_CHUNK_ROWS) -> Iterator[List[dict]]:
+    it = iter(rows)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write_csv(chunks, fields: Dict[str, str], path: str):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(fields), extrasaction="ignore")
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+
+def _write_jsonl(chunks, fields: Dict[str, str], path: str):
+    with open(path, "w", encoding="utf-8") as fh:
+        for chunk in chunks:
+            fh.writelines(json.dumps({k: row.get(k) for k in fields}, default=str) + "\n" for row in chunk)
+
+
+def _write_parquet(chunks, fields: Dict[str, str], path: str):
+    # One row group per chunk; an empty export is still a valid file with the schema.
+    schema = pa.schema([(k, getattr(pa, _ARROW_TYPES.get(t, "string"))()) for k, t in fields.items()])
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            cols = {k: [_coerce(row.get(k), t) for row in chunk] for k, t in fields.items()}
+            writer.write_table(pa.table(cols, schema=schema))
+
+
+def _coerce(value, kind: str):
+    if value is None or value == "":
+        return None
+    try:
+        return int(value) if kind == "int" else float(value) if kind == "float" else str(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def export_path(name: str, fmt: str, version) -> str:
+    digest = hashlib.sha1(repr(version).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(EXPORT_DIR, f"{name}-{digest}{FORMATS[fmt][1]}")
+
+
+def export(name: str, fmt: str, rows: Callable[[], Iterable[dict]], fields: Dict[str, str], version,
+           chunk_rows: int = EXPORT_CHUNK_ROWS) -> str:
+    """Path of the ``name`` export in ``fmt`` for data ``version``; built only if not cached.
+
+    ``rows`` is called (and iterated a chunk at a time) only on a cache miss.
+    ``fields`` maps column name to "str", "int" or "float" (used for Parquet).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    path = export_path(name, fmt, version)
+    if os.path.exists(path):
+        return path
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=EXPORT_DIR, prefix=f".{name}-", suffix=FORMATS[fmt][1])
+    os.close(fd)
+    try:
+        _WRITERS[fmt](chunked(rows(), chunk_rows), fields, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    _remove_stale(name, fmt, keep=path)
+    return path
+
+
+def _remove_stale(name: str, fmt: str, keep: str):
+    """Drop exports of ``name``/``fmt`` built for older data versions."""
+    ext = FORMATS[fmt][1]
+    for entry in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, entry)
+        if entry.startswith(f"{name}-") and entry.endswith(ext) and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
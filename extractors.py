@@ -0,0 +1,204 @@
+# extractors.py
+# Document text extraction shared by the Streamlit apps.
+#
+# DOCX is read straight from the zip: word/document.xml plus header/footer
+# parts are streamed through ElementTree.iterparse and cleared as we go, so
+# memory stays bounded by the largest paragraph rather than the document.
+# Unlike python-docx's ``doc.paragraphs`` this keeps table cells (one row per
+# line, cells separated by " | "), text boxes, headers and footers, which is
+# where many resume templates put contact details and skills.
+#
+# Uploads are size-checked before any parsing. Small ones are parsed in place;
+# larger ones are copied in 1 MB chunks to a temp file and parsed through a
+# read-only memory map, so the parser's working set is paged from the file
+# cache instead of another in-process copy. Everything is released as soon as
+# the text is out. Streamlit's own buffer is capped by server.maxUploadSize in
+# .streamlit/config.toml.
+
+import os
+import re
+import mmap
+import shutil
+import zipfile
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List
+from xml.etree.ElementTree import iterparse
+
+# Optional deps (gracefully degrade)
+try:
+    from PyPDF2 import PdfReader
+except Exception:
+    PdfReader = None
+
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", "20"))
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+SPOOL_THRESHOLD_BYTES = int(os.getenv("UPLOAD_SPOOL_KB", "1024")) * 1024
+_COPY_CHUNK = 1 << 20
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_P, _T, _TAB, _TC, _TR, _TBL, _BODY = (_W + t for t in ("p", "t", "tab", "tc", "tr", "tbl", "body"))
+_BREAKS = (_W + "br", _W + "cr")
+_HEADER_RE = re.compile(r"^word/header\d*\.xml$")
+_FOOTER_RE = re.compile(r"^word/footer\d*\.xml$")
+
+
+def _iter_part_lines(stream) -> Iterator[str]:
+    """Yield lines of one WordprocessingML part in reading order."""
+    paras: List[List[str]] = []   # open paragraphs (text boxes nest inside them)
+    sinks: List[List[str]] = []   # open table cells collecting paragraph text
+    rows: List[List[str]] = []    # open table rows collecting cell text
+    fallback = 0                  # inside mc:Fallback (duplicate of mc:Choice content)
+    depth, body, out = 0, None, []
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            depth += 1
+            if tag == _MC_FALLBACK:
+                fallback += 1
+            elif fallback:
+                continue
+            elif tag == _P:
+                paras.append([])
+            elif tag == _TC:
+                sinks.append([])
+            elif tag == _TR:
+                rows.append([])
+            elif tag == _BODY:
+                body = elem
+            continue
+
+        depth -= 1
+        if tag == _MC_FALLBACK:
+            fallback -= 1
+        elif fallback:
+            pass
+        elif tag == _T and paras:
+            paras[-1].append(elem.text or "")
+        elif tag == _TAB and paras:
+            paras[-1].append("\t")
+        elif tag in _BREAKS and paras:
+            paras[-1].append("\n")
+        elif tag == _P and paras:
+            text = "".join(paras.pop())
+            (sinks[-1] if sinks else out).append(text)
+        elif tag == _TC and sinks:
+            cell = " ".join(t.strip() for t in sinks.pop() if t.strip())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == _TR and rows:
+            line = " | ".join(c for c in rows.pop() if c)
+            if line:
+                (sinks[-1] if sinks else out).append(line)
+        if tag in (_P, _TR, _TBL) or depth <= 1:
+            elem.clear()
+        if body is not None and depth == 2:
+            body.clear()  # detach finished top-level blocks from w:body
+        if out and not sinks and not paras:
+            yield from out
+            out.clear()
+    yield from out
+
+
+def iter_docx_lines(file) -> Iterator[str]:
+    """Stream text lines from a .docx: headers, body (incl. tables/text boxes), footers."""
+    with zipfile.ZipFile(file) as zf:
+        names = zf.namelist()
+        headers = sorted(n for n in names if _HEADER_RE.match(n))
+        footers = sorted(n for n in names if _FOOTER_RE.match(n))
+        seen = set()
+        for part in headers + ["word/document.xml"] + footers:
+            if part not in names:
+                continue
+            with zf.open(part) as stream:
+                for line in _iter_part_lines(stream):
+                    if part != "word/document.xml":
+                        # first-page/even/default headers usually repeat the same text
+                        if not line.strip() or line in seen:
+                            continue
+                        seen.add(line)
+                    yield line
+
+
+def extract_text_docx_stream(file) -> str:
+    """Plain text of a .docx via iter_docx_lines; empty string if the file isn't a valid docx."""
+    try:
+        file.seek(0)
+    except Exception:
+        pass
+    try:
+        return "\n".join(iter_docx_lines(file))
+    except (zipfile.BadZipFile, KeyError, SyntaxError, OSError):
+        return ""
+
+
+# ---------------- Bounded upload ingestion ----------------
+class UploadRejected(ValueError):
+    """An upload exceeds the configured size or page limits."""
+
+
+def upload_size(file) -> int:
+    size = getattr(file, "size", None)
+    if size is None:
+        pos = file.tell()
+        size = file.seek(0, os.SEEK_END)
+        file.seek(pos)
+    return int(size)
+
+
+def check_upload_size(file, max_mb: float = MAX_UPLOAD_MB) -> int:
+    size = upload_size(file)
+    if size > max_mb * 1024 * 1024:
+        raise UploadRejected(f"File is {size / 1024 / 1024:.1f} MB; the limit is {max_mb:g} MB.")
+    return size
+
+
+@contextmanager
+def spooled_upload(file, threshold: int = SPOOL_THRESHOLD_BYTES):
+    """Yield a seekable read-only stream over ``file``, memory-mapped from a temp file when large."""
+    size = check_upload_size(file)
+    file.seek(0)
+    if size <= threshold:
+        yield file
+        return
+    with tempfile.TemporaryFile() as tmp:
+        shutil.copyfileobj(file, tmp, _COPY_CHUNK)
+        tmp.flush()
+        with mmap.mmap(tmp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def extract_text_pdf_bounded(file, max_pages: int = MAX_PDF_PAGES) -> str:
+    """PDF text with size/page limits enforced before extraction; raises UploadRejected."""
+    if PdfReader is None:
+        return ""
+    with spooled_upload(file) as stream:
+        reader = PdfReader(stream)
+        pages = len(reader.pages)
+        if pages > max_pages:
+            raise UploadRejected(f"PDF has {pages} pages; the limit is {max_pages}.")
+        parts = [(p.extract_text() or "") for p in reader.pages]
+        del reader  # drop parsed objects before the map/temp file closes
+    return "\n".join(parts)
+
+
+def extract_text(file, name: str = "") -> str:
+    """Text of a pdf/docx/txt upload, dispatched on file name; raises UploadRejected over the limits."""
+    name = (name or getattr(file, "name", "") or "").lower()
+    check_upload_size(file)
+    if name.endswith(".pdf"):
+        try:
+            return extract_text_pdf_bounded(file)
+        except UploadRejected:
+            raise
+        except Exception:
+            return ""
+    if name.endswith(".docx"):
+        return extract_text_docx_stream(file)
+    try:
+        file.seek(0)
+        return file.read().decode("utf-8", errors="ignore")
+    except Exception:
+        return ""
@@ -0,0 +1,188 @@
+# history.py
+# Per-user analysis history: summaries, interview questions and fit analyses.
+#
+# Every GPT result is saved with the user, kind, time and a hash of its inputs,
+# so the same request can reuse the earlier answer instead of another LLM call.
+# Rows stay small as history grows into the millions: usernames and kinds are
+# interned to integers, input hashes are 16 raw bytes, timestamps are integer
+# seconds, and outputs live zlib-compressed in a separate table keyed by their
+# own hash (identical outputs are stored once). Listing reads only the row
+# metadata; an output is decompressed when it is opened.
+#
+# Indexes: (user, created_at, id) for the newest-first history view, paged by
+# keyset (``before=(created_at, id)`` of the last row) so deep pages cost the
+# same as the first one; (input_hash, user) for reuse lookups.
+
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+ANALYSIS_HISTORY_DB = os.getenv("ANALYSIS_HISTORY_DB", "analysis_history.sqlite3")
+HISTORY_PAGE_SIZE = 20
+TITLE_CHARS = 80
+
+SUMMARY, QUESTIONS, FIT_ANALYSIS = "summary", "questions", "fit_analysis"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS kinds (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS outputs (
+    hash BLOB PRIMARY KEY,
+    body BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    id          INTEGER PRIMARY KEY,
+    user_id     INTEGER NOT NULL,
+    kind_id     INTEGER NOT NULL,
+    created_at  INTEGER NOT NULL,
+    input_hash  BLOB NOT NULL,
+    output_hash BLOB NOT NULL,
+    title       TEXT NOT NULL,
+    model       TEXT
+);
+CREATE INDEX IF NOT EXISTS history_user_time ON history(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS history_input ON history(input_hash, user_id);
+"""
+
+
+def input_hash(kind: str, *parts) -> bytes:
+    """16-byte digest of a request's inputs (whitespace-normalized), scoped by kind."""
+    h = hashlib.blake2b(kind.encode("utf-8"), digest_size=16)
+    for part in parts:
+        h.update(b"\x1f" + " ".join(str(part).split()).encode("utf-8"))
+    return h.digest()
+
+
+def cursor(row: Dict) -> Tuple[int, int]:
+    """Keyset position of a ``page`` row, for fetching the rows after it."""
+    return row["created_at"], row["id"]
+
+
+def _title(text: str) -> str:
+    line = " ".join((text or "").split())
+    return line[:TITLE_CHARS - 1] + "…" if len(line) > TITLE_CHARS else line
+
+
+class HistoryStore:
+    """Append-only analysis history on SQLite, shared between threads and processes."""
+
+    def __init__(self, path: str = ANALYSIS_HISTORY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._ids: Dict[tuple, int] = {}
+
+    def _intern(self, table: str, name: str, create: bool = True) -> Optional[int]:
+        key = (table, name)
+        if key not in self._ids:
+            row = self._conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                if not create:
+                    return None
+                self._conn.execute(f"INSERT OR IGNORE INTO {table}(name) VALUES (?)", (name,))
+                row = self._conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+            self._ids[key] = row[0]
+        return self._ids[key]
+
+    def record(self, username: str, kind: str, key: bytes, output: str, title: str = "",
+               model: Optional[str] = None) -> int:
+        """Save one result; ``key`` is ``input_hash(kind, ...)``. Returns the row id."""
+        body = output.encode("utf-8")
+        out_hash = hashlib.blake2b(body, digest_size=16).digest()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                user_id, kind_id = self._intern("users", username), self._intern("kinds", kind)
+                self._conn.execute("INSERT OR IGNORE INTO outputs(hash, body) VALUES (?, ?)",
+                                   (out_hash, zlib.compress(body, 6)))
+                cur = self._conn.execute(
+                    "INSERT INTO history(user_id, kind_id, created_at, input_hash, output_hash, title, model) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (user_id, kind_id, int(time.time()), key, out_hash, _title(title or output), model),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._ids.clear()  # interned ids from a rolled-back insert are not real
+                raise
+        return cur.lastrowid
+
+    def find(self, username: str, kind: str, key: bytes) -> Optional[Dict]:
+        """Most recent saved result for the same inputs, with its output, or None."""
+        with self._lock:
+            user_id, kind_id = self._intern("users", username, False), self._intern("kinds", kind, False)
+            if user_id is None or kind_id is None:
+                return None
+            row = self._conn.execute(
+                "SELECT id FROM history WHERE input_hash = ? AND user_id = ? AND kind_id = ? "
+                "ORDER BY id DESC LIMIT 1", (key, user_id, kind_id),
+            ).fetchone()
+        return self.get(username, row[0]) if row else None
+
+    def page(self, username: str, kind: Optional[str] = None, before: Optional[Tuple[int, int]] = None,
+             limit: int = HISTORY_PAGE_SIZE) -> List[Dict]:
+        """Newest-first metadata rows (no output); pass ``cursor(last row)`` as ``before`` for the next page."""
+        with self._lock:
+            user_id = self._intern("users", username, False)
+            kind_id = self._intern("kinds", kind, False) if kind else None
+            if user_id is None or (kind and kind_id is None):
+                return []
+            sql = ("SELECT h.id, k.name, h.created_at, h.title, h.model FROM history h "
+                   "JOIN kinds k ON k.id = h.kind_id WHERE h.user_id = ?")
+            args: list = [user_id]
+            if before is not None:
+                sql += " AND (h.created_at, h.id) < (?, ?)"
+                args.extend(before)
+            if kind_id is not None:
+                sql += " AND h.kind_id = ?"
+                args.append(kind_id)
+            sql += " ORDER BY h.created_at DESC, h.id DESC LIMIT ?"
+            args.append(limit)
+            rows = self._conn.execute(sql, args).fetchall()
+        return [{"id": i, "kind": k, "created_at": t, "title": title, "model": m} for i, k, t, title, m in rows]
+
+    def get(self, username: str, record_id: int) -> Optional[Dict]:
+        """One record with its decompressed output (only the owner can read it)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT h.id, k.name, h.created_at, h.title, h.model, o.body FROM history h "
+                "JOIN kinds k ON k.id = h.kind_id JOIN users u ON u.id = h.user_id "
+                "JOIN outputs o ON o.hash = h.output_hash WHERE h.id = ? AND u.name = ?",
+                (record_id, username),
+            ).fetchone()
+        if row is None:
+            return None
+        i, k, t, title, m, body = row
+        return {"id": i, "kind": k, "created_at": t, "title": title, "model": m,
+                "output": zlib.decompress(body).decode("utf-8")}
+
+    def count(self, username: str, kind: Optional[str] = None) -> int:
+        with self._lock:
+            user_id = self._intern("users", username, False)
+            kind_id = self._intern("kinds", kind, False) if kind else None
+            if user_id is None or (kind and kind_id is None):
+                return 0
+            if kind_id is None:
+                return self._conn.execute("SELECT COUNT(*) FROM history WHERE user_id = ?", (user_id,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM history WHERE user_id = ? AND kind_id = ?",
+                                      (user_id, kind_id)).fetchone()[0]
+
+
+_STORE: Optional[HistoryStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_history() -> HistoryStore:
+    """Process-wide history store, opened once (module state survives Streamlit reruns)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = HistoryStore()
+    return _STORE
@@ -0,0 +1,129 @@
+# incremental.py
+# Incremental Job Fit re-analysis when the user edits the resume or JD text.
+#
+# Each document is split into paragraphs (blank-line blocks, one unit per
+# bullet). Keyword sets are cached per paragraph content hash, so after an edit
+# only new or changed paragraphs are re-keyworded; the fit score is then
+# recomputed from the cached sets and compared with the previous run. The diff
+# (paragraphs added/removed, keywords gained/lost) feeds a small "explain what
+# changed" prompt instead of re-sending both documents for a full analysis.
+#
+# State is a plain dict so it can live in st.session_state.
+
+import re
+import hashlib
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from keywords import extract_keywords, keyword_fit, normalize
+
+_PARA_SPLIT = re.compile(r"\n\s*\n|\n(?=\s*(?:[-•*▪]|\d+[.)])\s)")
+MAX_EXPLAIN_CHARS = 1500
+
+
+def paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in _PARA_SPLIT.split(text or "") if p.strip()]
+
+
+def _hash(paragraph: str) -> str:
+    return hashlib.blake2b(normalize(paragraph).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def index_document(text: str, prev: Optional[Dict] = None) -> Tuple[Dict, int]:
+    """Return (doc index, paragraphs re-keyworded), reusing ``prev``'s per-paragraph keywords."""
+    cache = (prev or {}).get("kw", {})
+    paras = paragraphs(text)
+    hashes, kw, recomputed = [], {}, 0
+    for p in paras:
+        h = _hash(p)
+        hashes.append(h)
+        if h in kw:
+            continue
+        if h in cache:
+            kw[h] = cache[h]
+        else:
+            kw[h] = tuple(extract_keywords(p))
+            recomputed += 1
+    return {"hashes": hashes, "paras": paras, "kw": kw}, recomputed
+
+
+def document_keywords(doc: Dict) -> set:
+    return {k for h in doc["hashes"] for k in doc["kw"][h]}
+
+
+def diff_documents(prev: Optional[Dict], new: Dict) -> Dict[str, List[str]]:
+    """Paragraphs added to / removed from ``prev`` (changed paragraphs show up as both)."""
+    if not prev:
+        return {"added": list(new["paras"]), "removed": []}
+    added, removed = [], []
+    sm = SequenceMatcher(a=prev["hashes"], b=new["hashes"], autojunk=False)
+    for op, i1, i2, j1, j2 in sm.get_opcodes():
+        if op in ("replace", "delete"):
+            removed.extend(prev["paras"][i1:i2])
+        if op in ("replace", "insert"):
+            added.extend(new["paras"][j1:j2])
+    return {"added": added, "removed": removed}
+
+
+def update_fit(state: Optional[Dict], jd_text: str, resume_text: str) -> Dict:
+    """Re-score a JD/resume pair against the previous state, touching only changed paragraphs."""
+    state = state or {}
+    jd, jd_n = index_document(jd_text, state.get("jd"))
+    rs, rs_n = index_document(resume_text, state.get("rs"))
+    fit = keyword_fit(document_keywords(jd), document_keywords(rs))
+    prev_fit = state.get("fit")
+    changes = {"jd": diff_documents(state.get("jd"), jd), "rs": diff_documents(state.get("rs"), rs)}
+    changed = bool(prev_fit) and any(c["added"] or c["removed"] for c in changes.values())
+    return {
+        "jd": jd,
+        "rs": rs,
+        "fit": fit,
+        "prev_fit": prev_fit,
+        "changes": changes,
+        "changed": changed,
+        "unchanged": bool(prev_fit) and not changed,
+        "recomputed": jd_n + rs_n,
+        "paragraphs": len(jd["paras"]) + len(rs["paras"]),
+        "analysis": state.get("analysis", ""),
+    }
+
+
+def score_delta(state: Dict) -> Optional[float]:
+    prev = state.get("prev_fit")
+    return None if not prev else round(state["fit"]["fit_score"] - prev["fit_score"], 1)
+
+
+def keyword_changes(state: Dict) -> Dict[str, List[str]]:
+    prev = state.get("prev_fit") or {"matched": [], "missing": []}
+    now = state["fit"]
+    return {
+        "newly_matched": sorted(set(now["matched"]) - set(prev["matched"])),
+        "no_longer_matched": sorted(set(prev["matched"]) - set(now["matched"])),
+        "new_gaps": sorted(set(now["missing"]) - set(prev["missing"])),
+    }
+
+
+def _clip(paras: List[str]) -> str:
+    text = "\n".join(paras)
+    return text if len(text) <= MAX_EXPLAIN_CHARS else text[:MAX_EXPLAIN_CHARS] + " …"
+
+
+def explain_prompt(state: Dict) -> str:
+    """Short prompt describing only the edit, for a cheap 'explain what changed' call."""
+    kc = keyword_changes(state)
+    parts = [
+        "A candidate edited their resume and/or the job description after a fit analysis. "
+        "In 3–5 bullets, explain how these edits change their fit and what to do next. Be brief.",
+        f"Keyword fit score: {state['prev_fit']['fit_score']}% -> {state['fit']['fit_score']}%.",
+        f"Newly matched keywords: {', '.join(kc['newly_matched']) or 'none'}.",
+        f"No longer matched: {', '.join(kc['no_longer_matched']) or 'none'}.",
+    ]
+    for label, key in (("Resume", "rs"), ("Job description", "jd")):
+        ch = state["changes"][key]
+        if ch["removed"]:
+            parts.append(f"{label} — removed:\n{_clip(ch['removed'])}")
+        if ch["added"]:
+            parts.append(f"{label} — added:\n{_clip(ch['added'])}")
+    if state.get("analysis"):
+        parts.append(f"Previous analysis (for context):\n{state['analysis'][:MAX_EXPLAIN_CHARS]}")
+    return "\n\n".join(parts)
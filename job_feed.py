@@ -0,0 +1,451 @@
+# job_feed.py
+# Watch-folder JD ingestion with incremental matching and a per-user alert queue.
+#
+# Recruiters drop JD exports (pdf/docx/txt) into JOB_FEED_DIR. The daemon
+# notices new, changed and removed files (inotify via the optional
+# ``inotify_simple`` package, else polling), extracts each new version once
+# through extractors.extract_text and keywords it. A file is skipped without
+# being read while its size and mtime are unchanged, and without being
+# re-extracted while its content hash is unchanged. Files still being written
+# (modified within JOB_FEED_SETTLE_S) wait for the next pass. A file that
+# can't be ingested (over MAX_UPLOAD_MB, unreadable, ...) is remembered with
+# the reason and skipped until its size or mtime changes.
+#
+# Users opt in from the Job Fit page by saving a resume. Inverted indexes
+# (keyword -> jobs, keyword -> resumes) mean a new JD is scored only against
+# resumes sharing a keyword with it, and a new or updated resume only against
+# such JDs. Scores use keywords.keyword_fit; pairs at or above the user's
+# threshold go into the ``matches`` queue that the Job Alerts page reads. A
+# job's row and its matches commit together, so a crash never loses or
+# doubles an ingest.
+#
+# The daemon writes a heartbeat with backlog (files waiting) and ingest
+# latency (file mtime -> indexed and scored) for the UI.
+#
+#   python job_feed.py [directory] [--once]
+
+import io
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from extractors import MAX_UPLOAD_MB, UploadRejected, extract_text
+from keywords import extract_keywords, keyword_fit
+from ranking import job_title
+from resume_model import segment_resume
+
+# Optional: inotify (Linux); polling otherwise
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except Exception:
+    INotify = inotify_flags = None
+
+JOB_FEED_DIR = os.getenv("JOB_FEED_DIR", "job_feed")
+JOB_FEED_DB = os.getenv("JOB_FEED_DB", "job_feed.sqlite3")
+JOB_ALERT_THRESHOLD = float(os.getenv("JOB_ALERT_THRESHOLD", "60"))
+JOB_FEED_POLL_S = float(os.getenv("JOB_FEED_POLL_S", "2"))
+JOB_FEED_SETTLE_S = float(os.getenv("JOB_FEED_SETTLE_S", "1"))
+JOB_FEED_RESCAN_S = float(os.getenv("JOB_FEED_RESCAN_S", "60"))
+EXTENSIONS = (".pdf", ".docx", ".txt")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT NOT NULL UNIQUE,
+    name        TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    sha1        TEXT NOT NULL,
+    keywords    TEXT NOT NULL,
+    ingested_at REAL NOT NULL,
+    latency_s   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resumes (
+    username   TEXT PRIMARY KEY,
+    keywords   TEXT NOT NULL,
+    threshold  REAL NOT NULL,
+    version    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id         INTEGER PRIMARY KEY,
+    username   TEXT NOT NULL,
+    job_id     INTEGER NOT NULL,
+    fit_score  REAL NOT NULL,
+    matched    TEXT NOT NULL,
+    missing    TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    seen       INTEGER NOT NULL DEFAULT 0,
+    UNIQUE(username, job_id)
+);
+CREATE INDEX IF NOT EXISTS matches_user ON matches(username, seen, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class FeedStore:
+    """Jobs, watched resumes, the match queue and daemon stats, shared across processes."""
+
+    def __init__(self, path: str = JOB_FEED_DB):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _tx(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return out
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ---- UI side ----
+    def save_resume(self, username: str, resume_text: str, threshold: float = JOB_ALERT_THRESHOLD):
+        """Watch the feed for ``username`` with this resume (replaces any earlier one)."""
+        keys = extract_keywords(segment_resume(resume_text).relevant_text())
+
+        def _save(conn):
+            # Monotonic across removals (MAX(version) + 1 would reuse a removed resume's version,
+            # which the daemon has already passed). Seeded from existing rows on first use.
+            conn.execute(
+                "INSERT INTO meta(key, value) "
+                "VALUES ('resume_version', COALESCE((SELECT MAX(version) FROM resumes), 0) + 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+            version = int(conn.execute("SELECT value FROM meta WHERE key = 'resume_version'").fetchone()[0])
+            conn.execute(
+                "INSERT INTO resumes(username, keywords, threshold, version) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET keywords = excluded.keywords, "
+                "threshold = excluded.threshold, version = excluded.version",
+                (username, json.dumps(keys), float(threshold), version),
+            )
+            # Old unseen alerts were scored against the previous resume.
+            conn.execute("DELETE FROM matches WHERE username = ? AND seen = 0", (username,))
+        self._tx(_save)
+        return keys
+
+    def remove_resume(self, username: str):
+        self._tx(lambda conn: conn.execute("DELETE FROM resumes WHERE username = ?", (username,)))
+
+    def resume(self, username: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT keywords, threshold FROM resumes WHERE username = ?",
+                                     (username,)).fetchone()
+        return {"keywords": json.loads(row[0]), "threshold": row[1]} if row else None
+
+    def matches(self, username: str, unseen_only: bool = False, limit: int = 50) -> List[Dict]:
+        """Newest-first alerts for ``username`` with the job's name/title."""
+        sql = ("SELECT m.id, j.name, j.title, m.fit_score, m.matched, m.missing, m.created_at, m.seen "
+               "FROM matches m JOIN jobs j ON j.id = m.job_id WHERE m.username = ?"
+               + (" AND m.seen = 0" if unseen_only else "") + " ORDER BY m.id DESC LIMIT ?")
+        with self._lock:
+            rows = self._conn.execute(sql, (username, limit)).fetchall()
+        return [{"id": i, "name": n, "title": t, "fit_score": s, "matched": json.loads(mt),
+                 "missing": json.loads(ms), "created_at": c, "seen": bool(seen)}
+                for i, n, t, s, mt, ms, c, seen in rows]
+
+    def unseen_count(self, username: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM matches WHERE username = ? AND seen = 0",
+                                      (username,)).fetchone()[0]
+
+    def mark_seen(self, username: str):
+        self._tx(lambda conn: conn.execute("UPDATE matches SET seen = 1 WHERE username = ? AND seen = 0",
+                                           (username,)))
+
+    def stats(self) -> Dict:
+        """Daemon heartbeat: jobs, backlog, ingest latency p50/p95, last pass time."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'stats'").fetchone()
+        return json.loads(row[0]) if row else {}
+
+    # ---- daemon side ----
+    def put_stats(self, stats: Dict):
+        self._tx(lambda conn: conn.execute(
+            "INSERT INTO meta(key, value) VALUES ('stats', ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (json.dumps(stats),)))
+
+
+class FeedIndex:
+    """In-memory inverted keyword indexes over ingested jobs and watched resumes."""
+
+    def __init__(self):
+        self.job_keys: Dict[int, Set[str]] = {}
+        self.resume_keys: Dict[str, Set[str]] = {}
+        self.thresholds: Dict[str, float] = {}
+        self.jobs_by_kw: Dict[str, Set[int]] = {}
+        self.resumes_by_kw: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def _unlink(posting: Dict, keys: Iterable[str], item):
+        for k in keys:
+            ids = posting.get(k)
+            if ids:
+                ids.discard(item)
+
+    def put_job(self, job_id: int, keys: Iterable[str]):
+        self.drop_job(job_id)
+        self.job_keys[job_id] = set(keys)
+        for k in self.job_keys[job_id]:
+            self.jobs_by_kw.setdefault(k, set()).add(job_id)
+
+    def drop_job(self, job_id: int):
+        self._unlink(self.jobs_by_kw, self.job_keys.pop(job_id, ()), job_id)
+
+    def put_resume(self, username: str, keys: Iterable[str], threshold: float):
+        self.drop_resume(username)
+        self.resume_keys[username] = set(keys)
+        self.thresholds[username] = threshold
+        for k in self.resume_keys[username]:
+            self.resumes_by_kw.setdefault(k, set()).add(username)
+
+    def drop_resume(self, username: str):
+        self._unlink(self.resumes_by_kw, self.resume_keys.pop(username, ()), username)
+        self.thresholds.pop(username, None)
+
+    def resumes_for(self, keys: Iterable[str]) -> Set[str]:
+        return set().union(*(self.resumes_by_kw.get(k, ()) for k in keys))
+
+    def jobs_for(self, username: str) -> Set[int]:
+        return set().union(*(self.jobs_by_kw.get(k, ()) for k in self.resume_keys.get(username, ())))
+
+
+class FeedWatcher:
+    """Ingests ``directory`` into ``store`` and keeps the match queue current."""
+
+    def __init__(self, directory: str = JOB_FEED_DIR, store: Optional[FeedStore] = None):
+        self.directory = os.path.abspath(directory)
+        self.store = store or FeedStore()
+        self.index = FeedIndex()
+        self.resume_version = 0
+        self.latencies = deque(maxlen=500)
+        self.ingested = self.errors = 0
+        self.backlog = 0
+        self._files: Dict[str, tuple] = {}  # path -> (size, mtime_ns, sha1, job id)
+        self._failed: Dict[str, tuple] = {}  # path -> (size, mtime_ns, reason)
+        self._load()
+
+    def _load(self):
+        conn = self.store._conn
+        with self.store._lock:
+            for job_id, path, size, mtime_ns, sha1, keys in conn.execute(
+                    "SELECT id, path, size, mtime_ns, sha1, keywords FROM jobs"):
+                self._files[path] = (size, mtime_ns, sha1, job_id)
+                self.index.put_job(job_id, json.loads(keys))
+            self.latencies.extend(r[0] for r in conn.execute(
+                "SELECT latency_s FROM jobs ORDER BY ingested_at DESC LIMIT 500"))
+
+    # ---- scoring ----
+    def _score(self, conn, username: str, job_id: int, job_keys: Iterable[str], now: float) -> bool:
+        fit = keyword_fit(job_keys, self.index.resume_keys[username])
+        if fit["fit_score"] < self.index.thresholds[username]:
+            return False
+        conn.execute(
+            "INSERT OR IGNORE INTO matches(username, job_id, fit_score, matched, missing, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (username, job_id, fit["fit_score"], json.dumps(fit["matched"]), json.dumps(fit["missing"]), now),
+        )
+        return True
+
+    def sync_resumes(self) -> int:
+        """Index resumes saved or removed since the last pass and score them against existing jobs."""
+        conn = self.store._conn
+        with self.store._lock:
+            rows = conn.execute("SELECT username, keywords, threshold, version FROM resumes WHERE version > ?",
+                                (self.resume_version,)).fetchall()
+            current = {u for (u,) in conn.execute("SELECT username FROM resumes")}
+        for username in [u for u in self.index.resume_keys if u not in current]:
+            self.index.drop_resume(username)
+        for username, keys, threshold, version in rows:
+            self.index.put_resume(username, json.loads(keys), threshold)
+            now = time.time()
+            self.store._tx(lambda c: [self._score(c, username, j, self.index.job_keys[j], now)
+                                      for j in self.index.jobs_for(username)])
+            self.resume_version = max(self.resume_version, version)
+        return len(rows)
+
+    # ---- ingestion ----
+    def _candidates(self) -> Dict[str, os.stat_result]:
+        out = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return out
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(EXTENSIONS) and not entry.name.startswith("."):
+                out[entry.path] = entry.stat()
+        return out
+
+    def ingest(self, path: str, st: os.stat_result) -> bool:
+        """Index one file if its content is new; returns True when it was (re-)ingested."""
+        known = self._files.get(path)
+        if known and known[:2] == (st.st_size, st.st_mtime_ns):
+            return False
+        if st.st_size > MAX_UPLOAD_MB * 1024 * 1024:
+            raise UploadRejected(f"File is {st.st_size / 1024 / 1024:.1f} MB; the limit is {MAX_UPLOAD_MB:g} MB.")
+        with open(path, "rb") as fh:
+            data = fh.read()
+        sha1 = hashlib.sha1(data).hexdigest()
+        name = os.path.basename(path)
+        if known and known[2] == sha1:  # touched, not changed
+            self.store._tx(lambda c: c.execute("UPDATE jobs SET size = ?, mtime_ns = ? WHERE id = ?",
+                                               (st.st_size, st.st_mtime_ns, known[3])))
+            self._files[path] = (st.st_size, st.st_mtime_ns, sha1, known[3])
+            return False
+        text = extract_text(io.BytesIO(data), name)
+        keys = extract_keywords(text)
+
+        def _upsert(conn):
+            now = time.time()
+            latency = max(0.0, now - st.st_mtime_ns / 1e9)
+            conn.execute(
+                "INSERT INTO jobs(path, name, title, size, mtime_ns, sha1, keywords, ingested_at, latency_s) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET title = excluded.title, "
+                "size = excluded.size, mtime_ns = excluded.mtime_ns, sha1 = excluded.sha1, "
+                "keywords = excluded.keywords, ingested_at = excluded.ingested_at, latency_s = excluded.latency_s",
+                (path, name, job_title(text, name), st.st_size, st.st_mtime_ns, sha1, json.dumps(keys), now, latency),
+            )
+            job_id = conn.execute("SELECT id FROM jobs WHERE path = ?", (path,)).fetchone()[0]
+            # A changed posting is re-scored; alerts already seen stay.
+            conn.execute("DELETE FROM matches WHERE job_id = ? AND seen = 0", (job_id,))
+            for username in self.index.resumes_for(keys):
+                self._score(conn, username, job_id, keys, now)
+            return job_id, latency
+
+        job_id, latency = self.store._tx(_upsert)
+        self.index.put_job(job_id, keys)  # only once committed
+        self._files[path] = (st.st_size, st.st_mtime_ns, sha1, job_id)
+        self.latencies.append(latency)
+        self.ingested += 1
+        return True
+
+    def remove(self, path: str):
+        known = self._files.pop(path, None)
+        if known:
+            job_id = known[3]
+            # The posting was withdrawn from the feed: its alerts go with it.
+            self.store._tx(lambda c: (c.execute("DELETE FROM matches WHERE job_id = ?", (job_id,)),
+                                      c.execute("DELETE FROM jobs WHERE id = ?", (job_id,))))
+            self.index.drop_job(job_id)
+
+    def run_once(self, paths: Optional[Iterable[str]] = None) -> int:
+        """One pass over ``paths`` (or the whole directory); returns files ingested."""
+        self.sync_resumes()
+        on_disk = self._candidates()
+        if paths is None:
+            for gone in [p for p in self._files if p not in on_disk]:
+                self.remove(gone)
+            todo = on_disk
+        else:
+            todo = {p: on_disk[p] for p in paths if p in on_disk}
+            for gone in [p for p in paths if p not in on_disk and p in self._files]:
+                self.remove(gone)
+        for gone in [p for p in self._failed if p not in on_disk]:
+            del self._failed[gone]
+        settle_before = time.time_ns() - int(JOB_FEED_SETTLE_S * 1e9)
+        done = 0
+        for path, st in todo.items():
+            if st.st_mtime_ns > settle_before:
+                continue  # still being written; picked up next pass
+            if self._failed.get(path, (None, None))[:2] == (st.st_size, st.st_mtime_ns):
+                continue  # failed before and unchanged since
+            try:
+                done += self.ingest(path, st)
+                self._failed.pop(path, None)
+            except Exception as e:
+                self.errors += 1
+                self._failed[path] = (st.st_size, st.st_mtime_ns, f"{type(e).__name__}: {e}")
+        self.backlog = sum(1 for p, st in on_disk.items()
+                           if self._files.get(p, (None, None))[:2] != (st.st_size, st.st_mtime_ns)
+                           and self._failed.get(p, (None, None))[:2] != (st.st_size, st.st_mtime_ns))
+        self._report()
+        return done
+
+    def _report(self):
+        lat = sorted(self.latencies)
+        self.store.put_stats({
+            "heartbeat": time.time(),
+            "directory": self.directory,
+            "watch": "inotify" if INotify is not None else "poll",
+            "jobs": len(self._files),
+            "resumes": len(self.index.resume_keys),
+            "backlog": self.backlog,
+            "ingested": self.ingested,
+            "errors": self.errors,
+            "failed": {os.path.basename(p): f[2] for p, f in sorted(self._failed.items())[:20]},
+            "latency_p50_s": round(lat[len(lat) // 2], 2) if lat else None,
+            "latency_p95_s": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))], 2) if lat else None,
+        })
+
+    def run_forever(self, stop: Optional[threading.Event] = None):
+        """Watch until ``stop`` is set: inotify events when available, periodic full rescans always."""
+        stop = stop or threading.Event()
+        os.makedirs(self.directory, exist_ok=True)
+        inotify = None
+        if INotify is not None:
+            inotify = INotify()
+            inotify.add_watch(self.directory, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+                              | inotify_flags.DELETE | inotify_flags.MOVED_FROM)
+        last_full = 0.0
+        pending: Set[str] = set()
+        while not stop.is_set():
+            if time.time() - last_full >= JOB_FEED_RESCAN_S or inotify is None or self.backlog:
+                self.run_once()
+                last_full = time.time()
+                pending.clear()
+            elif pending:
+                self.run_once(list(pending))
+                pending.clear()
+            else:
+                self.run_once([])  # resumes + heartbeat
+            if inotify is not None:
+                events = inotify.read(timeout=int(JOB_FEED_POLL_S * 1000))
+                pending.update(os.path.join(self.directory, e.name) for e in events if e.name)
+                if pending:
+                    stop.wait(JOB_FEED_SETTLE_S)
+            else:
+                stop.wait(JOB_FEED_POLL_S)
+
+
+_STORE: Optional[FeedStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_feed_store() -> FeedStore:
+    """Process-wide feed store, opened once (module state survives Streamlit reruns)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = FeedStore()
+    return _STORE
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Watch a folder of JD files and queue resume matches.")
+    ap.add_argument("directory", nargs="?", default=JOB_FEED_DIR)
+    ap.add_argument("--once", action="store_true", help="ingest what is there now and exit")
+    args = ap.parse_args(argv)
+    watcher = FeedWatcher(args.directory)
+    if args.once:
+        print(f"Ingested {watcher.run_once()} file(s); {json.dumps(watcher.store.stats())}")
+        return
+    print(f"Watching {watcher.directory} ({'inotify' if INotify is not None else 'polling'}); Ctrl+C to stop.")
+    try:
+        watcher.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
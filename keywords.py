@@ -0,0 +1,49 @@
+# keywords.py
+# Skill keyword vocabulary, extraction and keyword-overlap fit scoring.
+
+import re
+from typing import Dict, Iterable, List
+
+TECH_KEYWORDS = {
+    "python","r","sql","excel","tableau","power bi","pandas","numpy","sklearn","scikit-learn",
+    "tensorflow","pytorch","spark","hadoop","airflow","dbt","git","github","docker","kubernetes",
+    "aws","azure","gcp","bigquery","snowflake","databricks","redshift","postgres","mysql","graphql",
+    "rest","fastapi","flask","django","react","typescript","javascript","bash","linux","terraform",
+    "ansible","mlops","nlp","llm","security","nist","rmf","fedramp","stigs","clearance"
+}
+SOFT_SKILLS = {
+    "leadership","communication","collaboration","mentoring","stakeholder","ownership",
+    "problem solving","critical thinking","presentation","planning","prioritization"
+}
+ALL_KEYWORDS = TECH_KEYWORDS | SOFT_SKILLS
+
+TECH_WEIGHT, SOFT_WEIGHT = 70, 30
+
+
+def normalize(text:str) -> str:
+    return re.sub(r"\s+"," ", (text or "").lower()).strip()
+
+
+def extract_keywords(text:str) -> List[str]:
+    t = normalize(text)
+    found = set()
+    for kw in ALL_KEYWORDS:
+        if kw in t:
+            found.add(kw)
+    return sorted(found)
+
+
+def keyword_fit(jd_keys: Iterable[str], rs_keys: Iterable[str]) -> Dict:
+    """Weighted keyword overlap: 70% technical, 30% soft skills, capped at 100."""
+    jd_keys, rs_keys = set(jd_keys), set(rs_keys)
+    jd_tech, jd_soft = jd_keys & TECH_KEYWORDS, jd_keys & SOFT_SKILLS
+    rs_tech, rs_soft = rs_keys & TECH_KEYWORDS, rs_keys & SOFT_SKILLS
+    tech_score = (len(rs_tech & jd_tech) / max(1, len(jd_tech))) * TECH_WEIGHT
+    soft_score = (len(rs_soft & jd_soft) / max(1, len(jd_soft))) * SOFT_WEIGHT
+    return {
+        "fit_score": round(min(100, tech_score + soft_score), 1),
+        "matched": sorted(jd_keys & rs_keys),
+        "missing": sorted(jd_keys - rs_keys),
+        "jd_keys": sorted(jd_keys),
+        "rs_keys": sorted(rs_keys),
+    }
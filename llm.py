@@ -0,0 +1,188 @@
+# llm.py
+# Shared layer in front of every OpenAI chat-completions call.
+#
+# Streamlit serves each browser session on its own thread in one process, so
+# identical requests from different sessions (a workshop pasting the same
+# sample JD, a double-clicked "Analyze Fit") arrive concurrently. Requests with
+# the same model, messages and parameters are coalesced ("singleflight"): the
+# first caller makes the upstream call, the rest wait and share its result.
+#
+# Calls made on behalf of a user are first charged against that user's
+# requests/min and tokens/min buckets (quota.py) and then wait for a fair
+# upstream slot, so one heavy user can't exhaust the organisation's rate limit.
+
+import json
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+
+from quota import INTERACTIVE, QuotaExceeded, get_limiter, get_scheduler
+
+DEFAULT_COMPLETION_TOKENS = 500
+
+_metrics = {"requests": 0, "upstream_calls": 0, "coalesced": 0, "errors": 0, "throttled": 0}
+_metrics_lock = threading.Lock()
+
+
+def _bump(name: str, n: int = 1):
+    with _metrics_lock:
+        _metrics[name] = _metrics.get(name, 0) + n
+
+
+def llm_metrics() -> Dict[str, int]:
+    """Process-wide counters: requests, upstream_calls, coalesced, errors, throttled."""
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+# ---------------- Singleflight ----------------
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight: Dict[str, _Call] = {}
+_inflight_lock = threading.Lock()
+
+
+def request_key(**params) -> str:
+    """Stable hash of a request's model, messages and parameters."""
+    blob = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def singleflight(key: str, fn: Callable):
+    """Run ``fn`` once per ``key`` among concurrent callers; everyone gets its result (or exception)."""
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+    if not leader:
+        _bump("coalesced")
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+    try:
+        call.result = fn()
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call.done.set()
+    return call.result
+
+
+def estimate_tokens(messages: List[dict], max_tokens: Optional[int] = None) -> int:
+    """Rough prompt + completion token count (~4 chars/token) used for quota admission."""
+    chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return chars // 4 + 4 * len(messages) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class _SlotStream:
+    """A streaming response that keeps its scheduler slot until it is exhausted or closed."""
+
+    def __init__(self, stream, slot):
+        self._stream = stream
+        self._slot = slot
+
+    def __iter__(self):
+        try:
+            yield from self._stream
+        finally:
+            self.close()
+
+    def close(self):
+        slot, self._slot = self._slot, None
+        if slot is None:
+            return
+        try:
+            close = getattr(self._stream, "close", None)
+            if close:
+                close()
+        finally:
+            slot.__exit__(None, None, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def charge_quota(username: str, params: Dict) -> int:
+    """Take one request and the estimated tokens of ``params`` from ``username``'s quota.
+
+    Returns the estimate (to settle or refund later); raises ``quota.QuotaExceeded``.
+    """
+    estimated = estimate_tokens(params.get("messages", []), params.get("max_tokens"))
+    try:
+        get_limiter().acquire(username, estimated)
+    except QuotaExceeded:
+        _bump("throttled")
+        raise
+    return estimated
+
+
+def chat_completion(client, username: Optional[str] = None, priority: str = INTERACTIVE, quota: bool = True,
+                    **params):
+    """``client.chat.completions.create(**params)``, coalesced with identical in-flight requests.
+
+    ``client`` is an ``OpenAI`` instance or the ``openai`` module itself.
+    With ``username`` the call is charged to that user's quota first and raises
+    ``quota.QuotaExceeded`` when the buckets are empty; ``quota=False`` means
+    the caller has already charged it (see ``charge_quota``) and the user only
+    decides scheduling. ``priority`` is ``"interactive"`` or ``"batch"``.
+    Streaming requests are passed straight through (a stream can't be shared)
+    and hold their upstream slot until the stream is read to the end or
+    closed. Tokens taken for a call that fails are refunded.
+    """
+    _bump("requests")
+    charged = bool(username and quota)
+    estimated = charge_quota(username, params) if charged else 0
+
+    def _call():
+        with get_scheduler().slot(username or "", priority):
+            _bump("upstream_calls")
+            try:
+                return client.chat.completions.create(**params)
+            except Exception:
+                _bump("errors")
+                raise
+
+    def _stream():
+        slot = get_scheduler().slot(username or "", priority)
+        slot.__enter__()
+        _bump("upstream_calls")
+        try:
+            return _SlotStream(client.chat.completions.create(**params), slot)
+        except BaseException:
+            _bump("errors")
+            slot.__exit__(None, None, None)
+            raise
+
+    try:
+        resp = _stream() if params.get("stream") else singleflight(request_key(**params), _call)
+    except BaseException:
+        if charged:
+            get_limiter().refund(username, estimated)
+        raise
+    if params.get("stream"):
+        return resp
+    if charged:
+        usage = getattr(resp, "usage", None)
+        get_limiter().settle(username, estimated, getattr(usage, "total_tokens", 0) or 0)
+    return resp
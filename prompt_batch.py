@@ -0,0 +1,202 @@
+# prompt_batch.py
+# Run a prompt_templates template over many {user_input} rows (CSV or JSONL).
+#
+# Rows go through router.routed_completion (task "prompt_batch", batch
+# priority, so interactive users go first) with at most ``concurrency`` calls
+# in flight. Each result is appended to the output JSONL and flushed as soon
+# as it completes; that file is the checkpoint. Every line carries a key made
+# from the row number, the input text, the template and the model settings.
+# A rerun with the same output file skips keys already written without an
+# error, so a crashed or interrupted run resumes without paying for finished
+# rows again. Rows that failed are retried. A partly written last line (crash
+# mid-write) is ignored. A user's quota running out pauses the run for the
+# quota's retry-after instead of failing rows.
+#
+#   python prompt_batch.py --template "Tech Summary" --input rows.csv --out runs/tech.jsonl
+
+import os
+import csv
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+from prompt_bench import QUOTA_RETRIES, bench_messages
+from prompt_templates import prompt_templates
+from quota import BATCH, QuotaExceeded
+from router import cost_of, routed_completion
+
+PROMPT_BATCH_CONCURRENCY = int(os.getenv("PROMPT_BATCH_CONCURRENCY", "4"))
+PROMPT_BATCH_MAX_TOKENS = 800
+INPUT_FIELD = "user_input"
+
+
+def read_inputs(path: str, field: str = INPUT_FIELD) -> Iterator[Tuple[int, str]]:
+    """(row number, text) for each row of a CSV or JSONL file, streamed.
+
+    Reads ``field`` (CSV column or JSON key); a CSV without that column uses
+    its first column, and a JSONL line that is a bare string is used as is.
+    """
+    if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        with open(path, encoding="utf-8") as fh:
+            for n, line in enumerate(fh):
+                if line.strip():
+                    obj = json.loads(line)
+                    yield n, obj if isinstance(obj, str) else str(obj.get(field) or "")
+        return
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.DictReader(fh)
+        column = field if field in (reader.fieldnames or []) else (reader.fieldnames or [None])[0]
+        for n, row in enumerate(reader):
+            yield n, row.get(column) or ""
+
+
+def render(template: str, user_input: str) -> str:
+    return prompt_templates[template].replace("{user_input}", user_input)
+
+
+def row_key(row: int, text: str, template: str, settings: Dict) -> str:
+    blob = json.dumps([row, text, template, settings], sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def completed_keys(out_path: str) -> Set[str]:
+    """Keys already written to ``out_path`` without an error (the checkpoint)."""
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            if not rec.get("error"):
+                done.add(rec.get("key"))
+    return done
+
+
+def run_row(client, template: str, row: int, text: str, key: str, username: Optional[str],
+            model: Optional[str], max_tokens: int, temperature: float) -> Dict:
+    """One completion; errors are recorded on the record, quota waits are retried."""
+    rec = {"key": key, "row": row, "template": template, "input": text, "output": "", "model": None,
+           "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "latency_s": None, "error": ""}
+    start = time.perf_counter()
+    for _ in range(QUOTA_RETRIES):
+        try:
+            resp = routed_completion(client, "prompt_batch", bench_messages(render(template, text)),
+                                     username=username, priority=BATCH, page="prompt_batch", model=model,
+                                     max_tokens=max_tokens, temperature=temperature)
+        except QuotaExceeded as e:
+            time.sleep(max(1.0, e.retry_after))
+            continue
+        except Exception as e:
+            rec["error"] = f"{type(e).__name__}: {e}"
+            break
+        usage = getattr(resp, "usage", None)
+        rec.update(output=(resp.choices[0].message.content or "").strip(), model=getattr(resp, "model", model),
+                   prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                   completion_tokens=getattr(usage, "completion_tokens", 0) or 0)
+        rec["cost_usd"] = round(cost_of(rec["model"] or "", rec["prompt_tokens"], rec["completion_tokens"]), 6)
+        break
+    else:
+        rec["error"] = "quota: gave up waiting"
+    rec["latency_s"] = round(time.perf_counter() - start, 3)
+    return rec
+
+
+def run_batch(client, template: str, input_path: str, out_path: str, username: Optional[str] = None,
+              model: Optional[str] = None, concurrency: int = PROMPT_BATCH_CONCURRENCY,
+              max_tokens: int = PROMPT_BATCH_MAX_TOKENS, temperature: float = 0.7, field: str = INPUT_FIELD,
+              limit: Optional[int] = None, progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Run (or resume) a batch and return its stats.
+
+    Stats: total, skipped (already in the checkpoint), done, errors, elapsed_s,
+    rows_per_min (over rows run in this call), prompt/completion tokens and
+    cost_usd. ``progress(stats)`` is called on the calling thread after
+    each row.
+    """
+    if template not in prompt_templates:
+        raise ValueError(f"Unknown template: {template}")
+    settings = {"model": model, "max_tokens": max_tokens, "temperature": temperature}
+    done_keys = completed_keys(out_path)
+    stats = {"total": 0, "skipped": 0, "done": 0, "errors": 0, "elapsed_s": 0.0, "rows_per_min": 0.0,
+             "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    start = time.perf_counter()
+
+    def _pending():
+        for row, text in read_inputs(input_path, field):
+            if limit is not None and stats["total"] >= limit:
+                return
+            stats["total"] += 1
+            key = row_key(row, text, template, settings)
+            if key in done_keys or not text.strip():
+                stats["skipped"] += 1
+                continue
+            yield row, text, key
+
+    with open(out_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        rows, inflight = _pending(), set()
+        while True:
+            # Keep at most ``concurrency`` rows in flight; inputs are read lazily.
+            for row, text, key in rows:
+                inflight.add(pool.submit(run_row, client, template, row, text, key, username, model,
+                                         max_tokens, temperature))
+                if len(inflight) >= concurrency:
+                    break
+            if not inflight:
+                break
+            finished, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                rec = fut.result()
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                out.flush()
+                stats["done" if not rec["error"] else "errors"] += 1
+                stats["prompt_tokens"] += rec["prompt_tokens"]
+                stats["completion_tokens"] += rec["completion_tokens"]
+                stats["cost_usd"] = round(stats["cost_usd"] + rec["cost_usd"], 6)
+                stats["elapsed_s"] = round(time.perf_counter() - start, 2)
+                ran = stats["done"] + stats["errors"]
+                stats["rows_per_min"] = round(ran / max(stats["elapsed_s"], 1e-6) * 60, 1)
+                if progress:
+                    progress(dict(stats))
+    stats["elapsed_s"] = round(time.perf_counter() - start, 2)
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run a prompt template over CSV/JSONL inputs, resumably.")
+    ap.add_argument("--template", required=True, choices=sorted(prompt_templates))
+    ap.add_argument("--input", required=True, help="CSV or JSONL of inputs")
+    ap.add_argument("--out", required=True, help="output JSONL (also the resume checkpoint)")
+    ap.add_argument("--field", default=INPUT_FIELD, help="CSV column / JSON key holding the input")
+    ap.add_argument("--model", default=None, help="pin a model (default: routed)")
+    ap.add_argument("--concurrency", type=int, default=PROMPT_BATCH_CONCURRENCY)
+    ap.add_argument("--max-tokens", type=int, default=PROMPT_BATCH_MAX_TOKENS)
+    ap.add_argument("--temperature", type=float, default=0.7)
+    ap.add_argument("--user", default="batch", help="quota account to charge")
+    ap.add_argument("--limit", type=int, default=None, help="only the first N rows")
+    args = ap.parse_args(argv)
+
+    from openai import OpenAI
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL") or None)
+    last = [0.0]
+
+    def report(s):
+        if time.time() - last[0] >= 2:
+            last[0] = time.time()
+            print(f"  {s['done'] + s['errors']} run, {s['skipped']} skipped, {s['errors']} errors, "
+                  f"{s['rows_per_min']} rows/min, ${s['cost_usd']:.4f}", flush=True)
+
+    stats = run_batch(client, args.template, args.input, args.out, username=args.user, model=args.model,
+                      concurrency=args.concurrency, max_tokens=args.max_tokens, temperature=args.temperature,
+                      field=args.field, limit=args.limit, progress=report)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# prompt_bench.py
+# Prompt Lab benchmark mode: one prompt across a grid of models x temperatures
+# x max_tokens, run concurrently.
+#
+# Every run streams its completion so time-to-first-token can be measured
+# next to total latency; token usage comes from the final stream chunk
+# (stream_options.include_usage) or is estimated when the API omits it. Cost
+# uses the router's price table. Repeats of the same configuration are
+# summarized with mean/stdev/min/max latency so noisy models stand out.
+# Runs go at batch priority and wait for the user's quota to refill (as
+# prompt_batch does) instead of failing the rest of the grid.
+
+import io
+import csv
+import time
+import itertools
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from llm import chat_completion, estimate_tokens
+from quota import BATCH, QuotaExceeded
+from router import cost_of
+
+SYSTEM_PROMPT = "You are a professional resume writer and career assistant."
+MAX_GRID_RUNS = 60
+QUOTA_RETRIES = 20
+CSV_FIELDS = ("model", "temperature", "max_tokens", "repeat", "latency_s", "ttft_s", "prompt_tokens",
+              "completion_tokens", "cost_usd", "error", "output")
+
+
+def bench_messages(prompt: str) -> List[dict]:
+    return [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}]
+
+
+def grid(models: Sequence[str], temperatures: Sequence[float], max_tokens: Sequence[int],
+         repeats: int = 1) -> List[Dict]:
+    """Every run of the grid, one full round per repeat (so repeats don't run back to back)."""
+    configs = list(itertools.product(models, temperatures, max_tokens))
+    return [{"model": m, "temperature": t, "max_tokens": n, "repeat": r}
+            for r in range(1, repeats + 1) for m, t, n in configs]
+
+
+def run_one(client, messages: List[dict], config: Dict, username: Optional[str] = None) -> Dict:
+    """Stream one completion and time it (from when the quota admits it); errors are recorded on
+    the row, not raised. An exhausted quota is waited out up to QUOTA_RETRIES times."""
+    row = dict(config, latency_s=None, ttft_s=None, prompt_tokens=0, completion_tokens=0, cost_usd=0.0,
+               error="", output="")
+    start = time.perf_counter()
+    parts, usage = [], None
+    try:
+        for attempt in range(QUOTA_RETRIES):
+            start = time.perf_counter()
+            try:
+                stream = chat_completion(client, username=username, priority=BATCH, model=config["model"],
+                                         messages=messages, temperature=config["temperature"],
+                                         max_tokens=config["max_tokens"], stream=True,
+                                         stream_options={"include_usage": True})
+                break
+            except QuotaExceeded as e:
+                if attempt + 1 == QUOTA_RETRIES:
+                    raise
+                time.sleep(max(1.0, e.retry_after))
+        for chunk in stream:
+            usage = getattr(chunk, "usage", None) or usage
+            for choice in getattr(chunk, "choices", None) or ():
+                delta = getattr(getattr(choice, "delta", None), "content", None)
+                if delta:
+                    if row["ttft_s"] is None:
+                        row["ttft_s"] = round(time.perf_counter() - start, 3)
+                    parts.append(delta)
+    except QuotaExceeded as e:
+        row["error"] = f"quota: retry in {e.retry_after:.0f}s"
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["latency_s"] = round(time.perf_counter() - start, 3)
+    row["output"] = "".join(parts)
+    if row["error"] and not parts:
+        return row
+    row["prompt_tokens"] = getattr(usage, "prompt_tokens", 0) or estimate_tokens(messages, 1) - 1
+    row["completion_tokens"] = getattr(usage, "completion_tokens", 0) or len(row["output"]) // 4
+    row["cost_usd"] = round(cost_of(config["model"], row["prompt_tokens"], row["completion_tokens"]), 6)
+    return row
+
+
+def run_grid(client, prompt: str, configs: Sequence[Dict], username: Optional[str] = None,
+             concurrency: int = 4) -> List[Dict]:
+    """Run every configuration concurrently; rows come back in ``configs`` order."""
+    messages = bench_messages(prompt)
+    configs = list(configs)[:MAX_GRID_RUNS]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        return list(pool.map(lambda c: run_one(client, messages, c, username), configs))
+
+
+def summarize(rows: Sequence[Dict]) -> List[Dict]:
+    """Per (model, temperature, max_tokens): runs, errors, latency mean/stdev/min/max, mean TTFT, tokens, cost."""
+    groups: Dict[tuple, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault((row["model"], row["temperature"], row["max_tokens"]), []).append(row)
+    out = []
+    for (model, temp, max_tokens), runs in groups.items():
+        ok = [r for r in runs if not r["error"]]
+        lat = [r["latency_s"] for r in ok]
+        ttft = [r["ttft_s"] for r in ok if r["ttft_s"] is not None]
+        out.append({
+            "model": model,
+            "temperature": temp,
+            "max_tokens": max_tokens,
+            "runs": len(runs),
+            "errors": len(runs) - len(ok),
+            "latency_mean_s": round(statistics.mean(lat), 3) if lat else None,
+            "latency_stdev_s": round(statistics.stdev(lat), 3) if len(lat) > 1 else None,
+            "latency_min_s": min(lat) if lat else None,
+            "latency_max_s": max(lat) if lat else None,
+            "ttft_mean_s": round(statistics.mean(ttft), 3) if ttft else None,
+            "completion_tokens_mean": round(statistics.mean(r["completion_tokens"] for r in ok), 1) if ok else None,
+            "cost_usd_total": round(sum(r["cost_usd"] for r in runs), 6),
+        })
+    return out
+
+
+def rows_to_csv(rows: Sequence[Dict]) -> bytes:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8")
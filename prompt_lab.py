@@ -1,8 +1,16 @@
 # prompt_lab.py
 import os
+import hashlib
+import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 
+from prompt_batch import PROMPT_BATCH_CONCURRENCY, read_inputs, run_batch
+from prompt_bench import MAX_GRID_RUNS, grid, rows_to_csv, run_grid, summarize
+from prompt_templates import prompt_templates
+from quota import QuotaExceeded
+from router import INTERACTIVE_LATENCY_S, MODELS, routed_completion
+
 # OpenAI 1.x client + exceptions
 try:
     from openai import OpenAI, APIError, RateLimitError, APIConnectionError
@@ -18,11 +26,13 @@ API_KEY = (
     or os.getenv("api_key")
 )
 
+PROMPT_BATCH_DIR = os.getenv("PROMPT_BATCH_DIR", "batch_runs")
+
 # Build client if possible
 client = None
 if OpenAI and API_KEY:
     try:
-        client = OpenAI(api_key=API_KEY)
+        client = OpenAI(api_key=API_KEY, base_url=os.getenv("OPENAI_BASE_URL") or None)
     except Exception:
         client = None  # don’t crash page if something’s off
 
@@ -39,7 +49,7 @@ def _offline_mock(prompt: str) -> str:
     )
 
 
-def prompt_lab_ui():
+def prompt_lab_ui(username=None):
     st.title("🧪 Prompt Lab")
 
     st.markdown(
@@ -52,7 +62,18 @@ Use this tool to test any custom prompt in real-time.
 """
     )
 
+    single_tab, bench_tab, batch_tab = st.tabs(["Single run", "Benchmark", "Batch"])
+    with bench_tab:
+        _benchmark_ui(username)
+    with batch_tab:
+        _batch_ui(username)
+    with single_tab:
+        _single_run_ui(username)
+
+
+def _single_run_ui(username=None):
     user_prompt = st.text_area("Custom Prompt", height=150, placeholder="Type a prompt…")
+    model = st.selectbox("Model", ["Auto (router)"] + sorted(MODELS))
 
     if st.button("Run") and user_prompt.strip():
         # If client isn’t available (no key / bad import), use offline mock
@@ -64,19 +85,28 @@ Use this tool to test any custom prompt in real-time.
 
         try:
             with st.spinner("Generating response…"):
-                resp = client.chat.completions.create(
-                    model="gpt-3.5-turbo",     # change to gpt-4o-mini later if desired
-                    messages=[
-                        {"role": "system", "content": "You are a professional resume writer and career assistant."},
-                        {"role": "user", "content": user_prompt},
-                    ],
+                messages = [
+                    {"role": "system", "content": "You are a professional resume writer and career assistant."},
+                    {"role": "user", "content": user_prompt},
+                ]
+                resp = routed_completion(
+                    client,
+                    "prompt_lab",
+                    messages,
+                    username=username,
+                    page="prompt_lab",
+                    latency_budget=INTERACTIVE_LATENCY_S,
+                    model=model if model in MODELS else None,
                     max_tokens=800,
                     temperature=0.7,
                 )
             out = (resp.choices[0].message.content or "").strip()
             st.markdown("### ✨ Response")
+            st.caption(f"Model: {getattr(resp, 'model', None) or model}")
             st.write(out if out else "(Empty response)")
 
+        except QuotaExceeded as e:
+            st.warning(f"You've reached your usage limit. Try again in about {e.retry_after:.0f}s.")
         except (RateLimitError,) as e:
             st.error("Rate limit or quota issue. Once billing is enabled, try again.")
         except (APIConnectionError,) as e:
@@ -85,3 +115,103 @@ Use this tool to test any custom prompt in real-time.
             st.error(f"OpenAI API Error: {e}")
         except Exception as e:
             st.error(f"Unexpected Error: {e}")
+
+
+def _benchmark_ui(username=None):
+    st.markdown("Run one prompt across a grid of models and parameters, concurrently.")
+    source = st.selectbox("Prompt", ["Custom prompt"] + list(prompt_templates), key="bench_source")
+    if source == "Custom prompt":
+        prompt = st.text_area("Prompt", height=150, key="bench_prompt")
+    else:
+        user_input = st.text_area("Template input ({user_input})", height=120, key="bench_input")
+        prompt = prompt_templates[source].replace("{user_input}", user_input)
+        with st.expander("Rendered prompt"):
+            st.text(prompt)
+
+    c1, c2, c3 = st.columns(3)
+    models = c1.multiselect("Models", sorted(MODELS), default=["gpt-4o-mini"], key="bench_models")
+    temps = c2.multiselect("Temperatures", [0.0, 0.3, 0.7, 1.0], default=[0.7], key="bench_temps")
+    max_tokens = c3.multiselect("max_tokens", [200, 400, 800, 1600], default=[800], key="bench_max_tokens")
+    c4, c5 = st.columns(2)
+    repeats = c4.slider("Repeats per configuration", 1, 5, 1, key="bench_repeats")
+    concurrency = c5.slider("Concurrent requests", 1, 8, 4, key="bench_concurrency")
+
+    configs = grid(models, temps, max_tokens, repeats)
+    st.caption(f"{len(configs)} runs" + (f" (capped at {MAX_GRID_RUNS})" if len(configs) > MAX_GRID_RUNS else ""))
+    if st.button("Run Benchmark", key="bench_run") and prompt.strip() and configs:
+        if client is None:
+            st.info("No API key detected or client unavailable; benchmarks need a live API.")
+            return
+        with st.spinner(f"Running {min(len(configs), MAX_GRID_RUNS)} completions (pausing whenever your quota "
+                        "needs to refill)…"):
+            st.session_state["bench_rows"] = run_grid(client, prompt, configs, username, concurrency)
+
+    rows = st.session_state.get("bench_rows")
+    if not rows:
+        return
+    st.markdown("### Summary")
+    st.dataframe(pd.DataFrame(summarize(rows)), use_container_width=True, hide_index=True)
+    st.markdown("### Runs")
+    df = pd.DataFrame(rows)
+    st.dataframe(df.drop(columns=["output"]), use_container_width=True, hide_index=True)
+    st.download_button("⬇️ Download results (.csv)", rows_to_csv(rows), file_name="prompt_benchmark.csv",
+                       mime="text/csv")
+
+    st.markdown("### Outputs")
+    first = [r for r in rows if r["repeat"] == 1]
+    for start in range(0, len(first), 3):
+        for col, r in zip(st.columns(3), first[start:start + 3]):
+            with col:
+                st.caption(f"{r['model']} · t={r['temperature']} · max {r['max_tokens']} · {r['latency_s']}s")
+                if r["error"]:
+                    st.error(r["error"])
+                else:
+                    st.markdown(r["output"] or "(Empty response)")
+
+
+def _batch_ui(username=None):
+    st.markdown("Run a template over every row of a CSV (`user_input` column) or JSONL file. "
+                "Re-running the same file resumes where it stopped; finished rows are not billed again.")
+    template = st.selectbox("Template", list(prompt_templates), key="batch_template")
+    upload = st.file_uploader("Inputs (CSV or JSONL)", type=["csv", "jsonl"], key="batch_file")
+    c1, c2 = st.columns(2)
+    model = c1.selectbox("Model", ["Auto (router)"] + sorted(MODELS), key="batch_model")
+    concurrency = c2.slider("Concurrent requests", 1, 8, PROMPT_BATCH_CONCURRENCY, key="batch_concurrency")
+    if not upload:
+        return
+
+    # Same file + template -> same run directory, so a rerun picks up the checkpoint.
+    data = upload.getvalue()
+    run_id = hashlib.sha1(data + template.encode("utf-8")).hexdigest()[:12]
+    run_dir = os.path.join(PROMPT_BATCH_DIR, run_id)
+    os.makedirs(run_dir, exist_ok=True)
+    input_path = os.path.join(run_dir, "input" + os.path.splitext(upload.name)[1].lower())
+    out_path = os.path.join(run_dir, "output.jsonl")
+    if not os.path.exists(input_path):
+        with open(input_path, "wb") as fh:
+            fh.write(data)
+    total = sum(1 for _ in read_inputs(input_path))
+    st.caption(f"{total} rows · run {run_id}")
+
+    if st.button("Run batch", key="batch_run"):
+        if client is None:
+            st.info("No API key detected or client unavailable; batch runs need a live API.")
+            return
+        bar = st.progress(0.0)
+        status = st.empty()
+
+        def show(s):
+            bar.progress(min(1.0, (s["skipped"] + s["done"] + s["errors"]) / max(1, total)))
+            status.caption(f"{s['done']} done, {s['skipped']} resumed from checkpoint, {s['errors']} errors · "
+                           f"{s['rows_per_min']} rows/min · ${s['cost_usd']:.4f}")
+
+        stats = run_batch(client, template, input_path, out_path, username=username,
+                          model=model if model in MODELS else None, concurrency=concurrency, progress=show)
+        show(stats)
+        st.success(f"Finished: {stats['done']} rows run in {stats['elapsed_s']}s "
+                   f"({stats['rows_per_min']} rows/min), {stats['skipped']} skipped, {stats['errors']} errors.")
+
+    if os.path.exists(out_path):
+        with open(out_path, "rb") as fh:
+            st.download_button("⬇️ Download outputs (.jsonl)", fh, file_name=f"{run_id}.jsonl",
+                               mime="application/x-ndjson", key="batch_download")
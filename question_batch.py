@@ -0,0 +1,180 @@
+# question_batch.py
+# Batched interview-question generation with structured (JSON-schema) output.
+#
+# Several resumes are packed into one chat request, each tagged with an id,
+# and the model must answer with {"results": [{"id", "questions": [...]}]}
+# via response_format=json_schema. Replies are parsed strictly (every id, the
+# requested number of non-empty questions); when a batch reply is malformed
+# the batch is split in half and retried, down to single documents, which fall
+# back to the old line-splitting of free text and then to the offline
+# generator. A failed call (timeout, 5xx, ...) is not split: its documents go
+# straight to the offline generator. Stats report round-trips and tokens
+# against one call per document, counting only documents GPT answered.
+
+import os
+import re
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analysis import questions_offline
+from llm import estimate_tokens
+from quota import BATCH, QuotaExceeded
+from resume_model import QUESTION_SECTIONS, segment_resume
+from router import routed_completion
+
+QUESTION_BATCH_SIZE = int(os.getenv("QUESTION_BATCH_SIZE", "8"))
+MAX_DOC_CHARS = 4000
+TOKENS_PER_QUESTION = 40
+
+QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "questions": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["id", "questions"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["results"],
+    "additionalProperties": False,
+}
+RESPONSE_FORMAT = {"type": "json_schema",
+                   "json_schema": {"name": "interview_questions", "strict": True, "schema": QUESTIONS_SCHEMA}}
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def _doc_text(text: str) -> str:
+    return segment_resume(text or "").relevant_text(QUESTION_SECTIONS)[:MAX_DOC_CHARS]
+
+
+def batch_messages(docs: Sequence[Tuple[str, str]], qtype: str, count: int) -> List[dict]:
+    parts = [f'<resume id="{doc_id}">\n{_doc_text(text)}\n</resume>' for doc_id, text in docs]
+    return [
+        {"role": "system", "content": (
+            f"You write interview questions. For EACH resume below, write exactly {count} {qtype} interview "
+            "questions tailored to that resume. Reply only with JSON: "
+            '{"results": [{"id": "<resume id>", "questions": ["...", ...]}]}, one entry per resume id.')},
+        {"role": "user", "content": "\n\n".join(parts)},
+    ]
+
+
+def single_messages(text: str, qtype: str, count: int) -> List[dict]:
+    """The per-document prompt the batch replaces (used for the savings baseline)."""
+    return [{"role": "user", "content": f"Generate {count} {qtype} interview questions tailored to the "
+                                        f"following resume content:\n{_doc_text(text)}"}]
+
+
+def parse_batch(content: str, ids: Sequence[str], count: int) -> Dict[str, List[str]]:
+    """Questions per id from a batch reply; raises ValueError unless every id has ``count`` questions."""
+    content = _FENCE.sub("", (content or "").strip())
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in reply")
+    data = json.loads(content[start:end + 1])
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list):
+        raise ValueError("reply has no 'results' list")
+    out = {}
+    for item in results:
+        if not isinstance(item, dict) or str(item.get("id")) not in ids:
+            continue
+        qs = [str(q).strip() for q in item.get("questions") or [] if str(q).strip()]
+        if len(qs) >= count:
+            out[str(item["id"])] = qs[:count]
+    missing = [i for i in ids if i not in out]
+    if missing:
+        raise ValueError(f"no valid questions for {', '.join(missing)}")
+    return out
+
+
+def split_lines(content: str, count: int) -> List[str]:
+    """Legacy free-text parsing: one question per non-empty line."""
+    return [x.strip("- ").strip() for x in (content or "").split("\n") if x.strip()][:count]
+
+
+def generate_questions_batch(client, docs: Sequence[Tuple[str, str]], qtype: str, count: int,
+                             username: Optional[str] = None, model: Optional[str] = None,
+                             batch_size: int = QUESTION_BATCH_SIZE,
+                             offline_ids: Optional[set] = None) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """Questions for every ``(doc_id, text)`` in ``docs`` using as few requests as possible.
+
+    The model is routed as task "questions" unless ``model`` pins one.
+    Returns (questions by doc id, stats). Stats: docs, round_trips,
+    baseline_round_trips, tokens, baseline_tokens, tokens_saved, splits,
+    fallbacks. Prompt tokens are estimated the same way for the batch and the
+    per-document baseline; completion tokens come from the API's usage. The
+    baseline covers only documents GPT answered.
+    Ids answered by the offline generator are added to ``offline_ids``.
+    ``QuotaExceeded`` is raised to the caller.
+    """
+    ids = [str(d) for d, _ in docs]
+    texts = dict(zip(ids, (t for _, t in docs)))
+    stats = {"docs": len(ids), "round_trips": 0, "baseline_round_trips": len(ids), "tokens": 0,
+             "baseline_tokens": 0, "tokens_saved": 0, "splits": 0, "fallbacks": 0}
+    out: Dict[str, List[str]] = {}
+    answered: List[str] = []  # ids GPT answered (the savings baseline covers only these)
+    completion_tokens = 0
+
+    def offline(doc_id: str):
+        out[doc_id] = questions_offline(texts[doc_id], qtype, count)
+        stats["fallbacks"] += 1
+        if offline_ids is not None:
+            offline_ids.add(doc_id)
+
+    def run(chunk: List[str]):
+        nonlocal completion_tokens
+        messages = batch_messages([(i, texts[i]) for i in chunk], qtype, count)
+        try:
+            resp = routed_completion(client, "questions", messages, username=username, priority=BATCH, model=model,
+                                     response_format=RESPONSE_FORMAT,
+                                     max_tokens=len(chunk) * count * TOKENS_PER_QUESTION + 100)
+            content = resp.choices[0].message.content or ""
+        except QuotaExceeded:
+            raise
+        except Exception:
+            # Transport/upstream failure: smaller batches would only repeat it.
+            for doc_id in chunk:
+                offline(doc_id)
+            return
+        stats["round_trips"] += 1
+        usage = getattr(resp, "usage", None)
+        completion = getattr(usage, "completion_tokens", 0) or len(content) // 4
+        stats["tokens"] += estimate_tokens(messages, 1) - 1 + completion
+        try:
+            out.update(parse_batch(content, chunk, count))
+        except ValueError:
+            pass
+        else:
+            answered.extend(chunk)
+            completion_tokens += completion  # baseline would have produced the same questions
+            return
+        if len(chunk) > 1:
+            stats["splits"] += 1
+            mid = len(chunk) // 2
+            run(chunk[:mid])
+            run(chunk[mid:])
+            return
+        qs = split_lines(content, count) if not content.lstrip().startswith("{") else []
+        if len(qs) < count:
+            offline(chunk[0])
+            return
+        out[chunk[0]] = qs
+        answered.extend(chunk)
+        completion_tokens += completion
+
+    for k in range(0, len(ids), max(1, batch_size)):
+        run(ids[k:k + batch_size])
+
+    stats["baseline_round_trips"] = len(answered)
+    stats["baseline_tokens"] = completion_tokens + sum(
+        estimate_tokens(single_messages(texts[i], qtype, count), 1) - 1 for i in answered)
+    stats["tokens_saved"] = stats["baseline_tokens"] - stats["tokens"]
+    return out, stats
@@ -0,0 +1,206 @@
+# quota.py
+# Per-user LLM quotas (token buckets shared across processes) and a fair scheduler.
+#
+# Each user has two buckets, requests/min and tokens/min, kept in SQLite so every
+# Streamlit server process draws from the same balance. Refill is computed lazily
+# from the elapsed time inside a BEGIN IMMEDIATE transaction, so there is no
+# background refiller. Admitted requests then go through FairScheduler, which
+# hands out a bounded number of upstream slots round-robin across users, with
+# interactive callers ahead of batch jobs.
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+LLM_QUOTA_DB = os.getenv("LLM_QUOTA_DB", "llm_quota.sqlite3")
+REQUESTS_PER_MIN = float(os.getenv("LLM_REQUESTS_PER_MIN", "10"))
+TOKENS_PER_MIN = float(os.getenv("LLM_TOKENS_PER_MIN", "40000"))
+MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", "4"))
+
+INTERACTIVE, BATCH = "interactive", "batch"
+_PRIORITY = {INTERACTIVE: 0, BATCH: 1}
+
+
+class QuotaExceeded(Exception):
+    """Raised when a user's request or token bucket cannot cover a call."""
+
+    def __init__(self, username: str, retry_after: float):
+        super().__init__(f"LLM quota exceeded for {username}; retry in {retry_after:.0f}s.")
+        self.username = username
+        self.retry_after = retry_after
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    username TEXT PRIMARY KEY,
+    requests REAL NOT NULL,
+    tokens   REAL NOT NULL,
+    updated  REAL NOT NULL,
+    admitted INTEGER NOT NULL DEFAULT 0,
+    rejected INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class TokenBucketLimiter:
+    """Cross-process requests/min + tokens/min buckets keyed by username."""
+
+    def __init__(self, path: str = LLM_QUOTA_DB, requests_per_min: float = REQUESTS_PER_MIN,
+                 tokens_per_min: float = TOKENS_PER_MIN):
+        self.requests_per_min = requests_per_min
+        self.tokens_per_min = tokens_per_min
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _refilled(self, row, now: float):
+        if row is None:
+            return float(self.requests_per_min), float(self.tokens_per_min), 0, 0
+        requests, tokens, updated, admitted, rejected = row
+        elapsed = max(0.0, now - updated) / 60.0
+        return (min(self.requests_per_min, requests + elapsed * self.requests_per_min),
+                min(self.tokens_per_min, tokens + elapsed * self.tokens_per_min),
+                admitted, rejected)
+
+    def _write(self, username, requests, tokens, now, admitted, rejected):
+        self._conn.execute(
+            "INSERT INTO buckets(username, requests, tokens, updated, admitted, rejected) VALUES (?,?,?,?,?,?) "
+            "ON CONFLICT(username) DO UPDATE SET requests=excluded.requests, tokens=excluded.tokens, "
+            "updated=excluded.updated, admitted=excluded.admitted, rejected=excluded.rejected",
+            (username, requests, tokens, now, admitted, rejected),
+        )
+
+    def acquire(self, username: str, tokens: int):
+        """Take one request and ``tokens`` tokens from the user's buckets or raise QuotaExceeded."""
+        tokens = min(tokens, self.tokens_per_min)  # one oversized call can still run on a full bucket
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT requests, tokens, updated, admitted, rejected FROM buckets WHERE username = ?",
+                    (username,),
+                ).fetchone()
+                req_left, tok_left, admitted, rejected = self._refilled(row, now)
+                if req_left >= 1 and tok_left >= tokens:
+                    self._write(username, req_left - 1, tok_left - tokens, now, admitted + 1, rejected)
+                    retry_after = None
+                else:
+                    self._write(username, req_left, tok_left, now, admitted, rejected + 1)
+                    retry_after = max((1 - req_left) / self.requests_per_min,
+                                      (tokens - tok_left) / self.tokens_per_min) * 60.0
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if retry_after is not None:
+            raise QuotaExceeded(username, retry_after)
+
+    def settle(self, username: str, estimated: int, actual: int):
+        """Correct the token bucket once the real usage is known (refunds over-estimates)."""
+        if not actual or actual == estimated:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE username = ?",
+                (self.tokens_per_min, estimated - actual, username),
+            )
+
+    def refund(self, username: str, tokens: int):
+        """Give back the tokens taken for a call that failed upstream (the request still counts)."""
+        if not tokens:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE username = ?",
+                (self.tokens_per_min, min(tokens, self.tokens_per_min), username),
+            )
+
+    def snapshot(self) -> List[Dict]:
+        """Current (refilled) bucket levels for every user, for the Admin Dashboard."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT username, requests, tokens, updated, admitted, rejected FROM buckets ORDER BY username"
+            ).fetchall()
+        out = []
+        for username, *row in rows:
+            req_left, tok_left, admitted, rejected = self._refilled(row, now)
+            out.append({"username": username, "requests_left": round(req_left, 1), "tokens_left": int(tok_left),
+                        "admitted": admitted, "rejected": rejected})
+        return out
+
+
+class FairScheduler:
+    """Bounded upstream concurrency, round-robin across users, interactive before batch."""
+
+    def __init__(self, slots: int = MAX_CONCURRENT):
+        self.slots = slots
+        self._free = slots
+        self._cond = threading.Condition()
+        self._queues = {p: OrderedDict() for p in sorted(_PRIORITY.values())}  # user -> deque of tickets
+        self._granted = set()
+
+    def _dispatch(self):
+        granted = False
+        while self._free > 0:
+            queue = next((q for _, q in sorted(self._queues.items()) if q), None)
+            if queue is None:
+                break
+            user, tickets = next(iter(queue.items()))
+            self._granted.add(tickets.popleft())
+            if tickets:
+                queue.move_to_end(user)  # next turn goes to another user
+            else:
+                del queue[user]
+            self._free -= 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, username: str, priority: str = INTERACTIVE):
+        ticket = object()
+        with self._cond:
+            self._queues[_PRIORITY.get(priority, 0)].setdefault(username, deque()).append(ticket)
+            self._dispatch()
+            while ticket not in self._granted:
+                self._cond.wait()
+            self._granted.discard(ticket)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._free += 1
+                self._dispatch()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"slots": self.slots, "in_use": self.slots - self._free,
+                    "waiting": sum(len(t) for q in self._queues.values() for t in q.values())}
+
+
+_limiter: Optional[TokenBucketLimiter] = None
+_scheduler: Optional[FairScheduler] = None
+_init_lock = threading.Lock()
+
+
+def get_limiter() -> TokenBucketLimiter:
+    global _limiter
+    with _init_lock:
+        if _limiter is None:
+            _limiter = TokenBucketLimiter()
+    return _limiter
+
+
+def get_scheduler() -> FairScheduler:
+    global _scheduler
+    with _init_lock:
+        if _scheduler is None:
+            _scheduler = FairScheduler()
+    return _scheduler
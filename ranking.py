@@ -0,0 +1,157 @@
+# ranking.py
+# Rank one resume against many job descriptions.
+#
+# The resume is segmented and keyworded once. Each JD is keyworded into one
+# row of a (jobs x vocabulary) boolean matrix, and fit scores for all jobs are
+# computed in a single vectorized pass with the same 70/30 tech/soft weighting
+# as keywords.keyword_fit. Salary alignment for every job goes through
+# compare_salary_batch. LLM narratives are left to the caller for the top N.
+# Reposted JDs can be collapsed first (MinHash/LSH, see dedup.py) so each
+# posting is scored once and occupies one ranking slot.
+
+import os
+import re
+from typing import Dict, List, Optional, Sequence
+
+from dedup import group_duplicates
+from keywords import ALL_KEYWORDS, SOFT_SKILLS, SOFT_WEIGHT, TECH_KEYWORDS, TECH_WEIGHT, extract_keywords
+from resume_model import segment_resume
+from salary import compare_salary_batch, resolve_role
+
+# Optional deps (gracefully degrade)
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+VOCAB = sorted(ALL_KEYWORDS)
+_VOCAB_INDEX = {k: i for i, k in enumerate(VOCAB)}
+MAX_JOBS = int(os.getenv("RANK_MAX_JOBS", "200"))
+NARRATIVE_JD_CHARS = 1500
+ROLE_SCAN_LINES = 15
+ROLE_MAX_CHARS = 80
+_TITLE_PREFIX = re.compile(r"^\s*(?:job\s+title|title|position|role)\s*[:\-\u2013]\s*", re.I)
+
+
+def job_title(text: str, name: str = "") -> str:
+    """Best-guess title for a JD: its first non-empty line, else the file name stem."""
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if line:
+            return line[:120]
+    return os.path.splitext(name)[0].replace("_", " ")
+
+
+def job_role(text: str, name: str = "") -> str:
+    """Salary role for a JD: the short line among its first ROLE_SCAN_LINES (a "Title:" line,
+    the heading, ...) or the file name that best matches a known band role, else ``job_title``."""
+    lines = [line.strip() for line in (text or "").splitlines() if line.strip()][:ROLE_SCAN_LINES]
+    lines.append(os.path.splitext(name)[0].replace("_", " "))
+    best, best_score = None, 0.0
+    for line in lines:
+        candidate = _TITLE_PREFIX.sub("", line)
+        if not candidate or len(candidate) > ROLE_MAX_CHARS:
+            continue
+        role, _, score = resolve_role(candidate)
+        if role and score > best_score:
+            best, best_score = candidate, score
+    return best or job_title(text, name)
+
+
+def skipped_jobs(submitted: int, rows: Sequence[Dict]) -> int:
+    """How many of ``submitted`` jobs fell past MAX_JOBS (neither ranked nor folded into a ranked row)."""
+    return max(0, submitted - len(rows) - sum(len(r.get("duplicates", ())) for r in rows))
+
+
+def _fit_columns(jd_keys: List[List[str]], rs_keys: Sequence[str]) -> List[float]:
+    if np is not None:
+        jd = np.zeros((len(jd_keys), len(VOCAB)), dtype=bool)
+        for r, keys in enumerate(jd_keys):
+            jd[r, [_VOCAB_INDEX[k] for k in keys]] = True
+        rs = np.zeros(len(VOCAB), dtype=bool)
+        rs[[_VOCAB_INDEX[k] for k in rs_keys]] = True
+        tech = np.array([k in TECH_KEYWORDS for k in VOCAB])
+        soft = np.array([k in SOFT_SKILLS for k in VOCAB])
+        hit = jd & rs
+        tech_score = hit[:, tech].sum(1) / np.maximum(1, jd[:, tech].sum(1)) * TECH_WEIGHT
+        soft_score = hit[:, soft].sum(1) / np.maximum(1, jd[:, soft].sum(1)) * SOFT_WEIGHT
+        return [round(min(100, s), 1) for s in (tech_score + soft_score).tolist()]
+
+    rs = set(rs_keys)
+    rs_tech, rs_soft = rs & TECH_KEYWORDS, rs & SOFT_SKILLS
+    out = []
+    for keys in jd_keys:
+        jd_tech, jd_soft = set(keys) & TECH_KEYWORDS, set(keys) & SOFT_SKILLS
+        score = (len(rs_tech & jd_tech) / max(1, len(jd_tech))) * TECH_WEIGHT \
+            + (len(rs_soft & jd_soft) / max(1, len(jd_soft))) * SOFT_WEIGHT
+        out.append(round(min(100, score), 1))
+    return out
+
+
+def rank_jobs(resume_text: str, jobs: Sequence[Dict], location_level: str = "standard",
+              level: Optional[str] = None, expected_salary: Optional[int] = None,
+              collapse_duplicates: bool = False) -> List[Dict]:
+    """Score ``resume_text`` against every job and return rows sorted best fit first.
+
+    Each job is a dict with ``text`` and optional ``name`` and ``role`` (defaults
+    to ``job_role``). Only the first MAX_JOBS (distinct) jobs are ranked; see
+    ``skipped_jobs``. Rows carry rank, index (into ``jobs``), name, role,
+    fit_score, matched, missing, and salary status/band/delta_pct when a band
+    matches the role. With ``collapse_duplicates`` near-duplicate JDs are
+    folded into the first copy, whose row lists the others' names under
+    ``duplicates``.
+    """
+    all_jobs = list(jobs)
+    if collapse_duplicates:
+        owner = group_duplicates([j.get("text", "") for j in all_jobs])
+        keep = [k for k in range(len(all_jobs)) if owner[k] == k][:MAX_JOBS]
+    else:
+        owner, keep = None, list(range(len(all_jobs)))[:MAX_JOBS]
+    jobs = [all_jobs[k] for k in keep]
+    dups: Dict[int, List[str]] = {}
+    for d, o in enumerate(owner or ()):
+        if o != d:
+            dups.setdefault(o, []).append(all_jobs[d].get("name") or f"#{d + 1}")
+    if not jobs:
+        return []
+    rs_keys = segment_resume(resume_text or "").keywords()
+    jd_keys = [extract_keywords(j.get("text", "")) for j in jobs]
+    scores = _fit_columns(jd_keys, rs_keys)
+
+    roles = [j.get("role") or job_role(j.get("text", ""), j.get("name", "")) for j in jobs]
+    salary = compare_salary_batch([int(expected_salary or 0)] * len(jobs), roles, location_level, level)
+
+    rs = set(rs_keys)
+    rows = []
+    for k, job in enumerate(jobs):
+        row = {
+            "index": keep[k],
+            "name": job.get("name") or roles[k],
+            "role": roles[k],
+            "fit_score": scores[k],
+            "matched": [x for x in jd_keys[k] if x in rs],
+            "missing": [x for x in jd_keys[k] if x not in rs],
+            "salary_status": salary["status"][k] if expected_salary else None,
+            "band_low": salary["band_low"][k] or None,
+            "band_mid": salary["band_mid"][k] or None,
+            "band_high": salary["band_high"][k] or None,
+            "delta_pct": salary["delta_pct"][k] if expected_salary else None,
+        }
+        if owner is not None:
+            row["duplicates"] = dups.get(keep[k], [])
+        rows.append(row)
+    rows.sort(key=lambda r: -r["fit_score"])
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def narrative_prompt(resume_text: str, row: Dict, jd_text: str) -> str:
+    """Short prompt for a fit narrative on one ranked job (use for the top N only)."""
+    return (
+        f"A candidate is comparing job postings. For the role '{row['role']}' (keyword fit {row['fit_score']}%), "
+        f"write 3 bullets: why they fit, the biggest gaps ({', '.join(row['missing']) or 'none'}), "
+        f"and one tailoring tip for their resume.\n\n"
+        f"Job description:\n{jd_text[:NARRATIVE_JD_CHARS]}\n\n"
+        f"Resume highlights:\n{segment_resume(resume_text).relevant_text()[:NARRATIVE_JD_CHARS]}"
+    )
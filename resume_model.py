@@ -0,0 +1,122 @@
+# resume_model.py
+# Parsed-resume representation and the section segmentation engine.
+#
+# A resume is segmented once into typed spans over the original text
+# (summary, experience, education, skills, projects, other). Spans live in
+# three parallel arrays, so a parsed resume costs a few dozen bytes on top of
+# the text itself instead of a dict of copied section strings. Consumers ask
+# for the sections they need (fit scoring, question generation, prompts).
+
+import re
+import sys
+from array import array
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from keywords import extract_keywords
+
+SECTIONS = ("other", "summary", "experience", "education", "skills", "projects")
+_SECTION_CODE = {name: i for i, name in enumerate(SECTIONS)}
+
+# Sections used by default for fit scoring, questions and prompts.
+FIT_SECTIONS = ("summary", "experience", "skills", "projects", "education")
+QUESTION_SECTIONS = ("experience", "projects", "skills")
+
+_HEADINGS = {
+    "summary": r"(professional |executive |career )?(summary|profile|objective)|about me",
+    "experience": r"(professional |work |relevant |employment )?(experience|history)|employment",
+    "education": r"education( (and|&) (training|certifications?))?|certifications?|academic background",
+    "skills": r"(technical |core |key )?(skills|competencies|technologies)|tools( (and|&) technologies)?",
+    "projects": r"(selected |personal |academic |key )?projects",
+}
+_HEADING_RE = [
+    (_SECTION_CODE[name], re.compile(rf"^\s*(?:#+\s*)?[*_]*(?:{pattern})[*_]*\s*(?::(?P<inline>.*))?$", re.I))
+    for name, pattern in _HEADINGS.items()
+]
+MAX_HEADING_LEN = 48
+
+
+class ParsedResume:
+    """Original text plus (section, start, end) spans stored in compact arrays."""
+
+    __slots__ = ("text", "kinds", "starts", "ends")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.kinds = array("B")
+        self.starts = array("I")
+        self.ends = array("I")
+
+    def _add(self, kind: int, start: int, end: int):
+        if end <= start:
+            return
+        if self.kinds and self.kinds[-1] == kind and self.ends[-1] == start:
+            self.ends[-1] = end  # merge adjacent spans of the same kind
+            return
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def spans(self) -> Iterator[Tuple[str, int, int]]:
+        for k, s, e in zip(self.kinds, self.starts, self.ends):
+            yield SECTIONS[k], s, e
+
+    def section_names(self) -> List[str]:
+        return list(dict.fromkeys(SECTIONS[k] for k in self.kinds))
+
+    def has_sections(self) -> bool:
+        """False when no headings were recognised (the whole text is 'other')."""
+        return any(k != 0 for k in self.kinds)
+
+    def section(self, *names: str) -> str:
+        """Concatenated text of the named sections, in document order."""
+        wanted = {_SECTION_CODE[n] for n in names}
+        return "\n".join(self.text[s:e].strip() for k, s, e in zip(self.kinds, self.starts, self.ends) if k in wanted)
+
+    def relevant_text(self, names: Iterable[str] = FIT_SECTIONS) -> str:
+        """Text of ``names``; the full text when segmentation found no sections."""
+        if not self.has_sections():
+            return self.text
+        return self.section(*names) or self.text
+
+    def keywords(self, names: Iterable[str] = FIT_SECTIONS) -> List[str]:
+        return extract_keywords(self.relevant_text(names))
+
+    def memory_bytes(self, include_text: bool = False) -> int:
+        """Bytes held by this record (arrays + object), optionally plus the text."""
+        size = sys.getsizeof(self) + sum(sys.getsizeof(a) for a in (self.kinds, self.starts, self.ends))
+        return size + (sys.getsizeof(self.text) if include_text else 0)
+
+
+def _heading(line: str) -> Optional[Tuple[int, int]]:
+    """(section code, offset where content starts) if ``line`` is a section heading.
+
+    Handles both a heading on its own line and 'Skills: Python, SQL' style.
+    """
+    body = line.rstrip("\r\n")
+    for code, rx in _HEADING_RE:
+        m = rx.match(body)
+        if not m:
+            continue
+        inline = m.group("inline")
+        if inline and inline.strip():
+            return code, m.start("inline")
+        if len(body.strip()) <= MAX_HEADING_LEN:
+            return code, len(line)
+    return None
+
+
+@lru_cache(maxsize=256)
+def segment_resume(text: str) -> ParsedResume:
+    """Split resume text into typed sections (memoized per document text)."""
+    text = text or ""
+    parsed = ParsedResume(text)
+    kind, start, pos = _SECTION_CODE["other"], 0, 0
+    for line in text.splitlines(keepends=True):
+        heading = _heading(line) if len(line) < 400 else None
+        if heading is not None:
+            parsed._add(kind, start, pos)
+            kind, start = heading[0], pos + heading[1]  # the heading itself isn't section content
+        pos += len(line)
+    parsed._add(kind, start, pos)
+    return parsed
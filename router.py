@@ -0,0 +1,218 @@
+# router.py
+# Cost/latency-aware model routing for every LLM call.
+#
+# Callers name a task ("summary", "questions", "fit_analysis", ...) instead of
+# a model. The task's policy picks a small, fast model by default and switches
+# to the large model only when the estimated input is long. An optional
+# latency budget drops candidates whose observed (or catalogued) latency
+# doesn't fit (UI pages pass INTERACTIVE_LATENCY_S). On a timeout or upstream
+# rate limit the call falls back to the next cheaper model, or, for the
+# cheapest one, to the next model up. A logical request is charged to the
+# user's quota once, however many models it tries. Per-model latency, token
+# and cost stats are kept per process for the Admin Dashboard.
+#
+# Policies can be overridden without code changes: LLM_MODEL_SMALL /
+# LLM_MODEL_LARGE swap the default models, and MODEL_ROUTER_CONFIG points at a
+# JSON file {"models": {...}, "policies": {...}} merged over the defaults.
+# Policies are looked up as "<page>/<task>", then "<task>", then "default".
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from llm import charge_quota, chat_completion, estimate_tokens
+from quota import INTERACTIVE, get_limiter
+
+# OpenAI 1.x exceptions (optional; matched by name otherwise)
+try:
+    from openai import APITimeoutError, RateLimitError
+    _FALLBACK_ERRORS = (APITimeoutError, RateLimitError)
+except Exception:
+    _FALLBACK_ERRORS = ()
+
+MODEL_ROUTER_CONFIG = os.getenv("MODEL_ROUTER_CONFIG", "model_router.json")
+SMALL_MODEL = os.getenv("LLM_MODEL_SMALL", "gpt-4o-mini")
+LARGE_MODEL = os.getenv("LLM_MODEL_LARGE", "gpt-4o")
+MIN_LATENCY_SAMPLES = 5
+# Latency budget (s) for calls a user waits on in the UI.
+INTERACTIVE_LATENCY_S = float(os.getenv("LLM_INTERACTIVE_LATENCY_S", "10"))
+
+# USD per 1k tokens (input, output) and a typical end-to-end latency prior.
+MODELS: Dict[str, Dict] = {
+    "gpt-4o-mini": {"input_per_1k": 0.00015, "output_per_1k": 0.0006, "latency_s": 3.0},
+    "gpt-3.5-turbo": {"input_per_1k": 0.0005, "output_per_1k": 0.0015, "latency_s": 2.5},
+    "gpt-4o": {"input_per_1k": 0.0025, "output_per_1k": 0.01, "latency_s": 6.0},
+    "gpt-4-turbo": {"input_per_1k": 0.01, "output_per_1k": 0.03, "latency_s": 10.0},
+    "gpt-4": {"input_per_1k": 0.03, "output_per_1k": 0.06, "latency_s": 12.0},
+}
+
+# model: default choice; large: used when estimated tokens exceed large_above;
+# timeout_s: per-attempt timeout before falling back to a cheaper model.
+POLICIES: Dict[str, Dict] = {
+    "default": {"model": SMALL_MODEL, "large": None, "large_above": 0, "timeout_s": 30},
+    "summary": {"model": SMALL_MODEL, "large": None, "large_above": 0, "timeout_s": 20},
+    "questions": {"model": SMALL_MODEL, "large": None, "large_above": 0, "timeout_s": 30},
+    "fit_explain": {"model": SMALL_MODEL, "large": None, "large_above": 0, "timeout_s": 20},
+    "fit_analysis": {"model": SMALL_MODEL, "large": LARGE_MODEL, "large_above": 2500, "timeout_s": 60},
+    "fit_narrative": {"model": SMALL_MODEL, "large": None, "large_above": 0, "timeout_s": 20},
+    "prompt_lab": {"model": SMALL_MODEL, "large": LARGE_MODEL, "large_above": 4000, "timeout_s": 60},
+    "prompt_batch": {"model": SMALL_MODEL, "large": None, "large_above": 0, "timeout_s": 60},
+}
+
+
+def load_config(path: str = MODEL_ROUTER_CONFIG):
+    """Merge a JSON config file over the built-in models and policies (missing file is fine)."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as fh:
+        cfg = json.load(fh)
+    for name, spec in (cfg.get("models") or {}).items():
+        MODELS.setdefault(name, {}).update(spec)
+    for name, spec in (cfg.get("policies") or {}).items():
+        POLICIES[name] = {**POLICIES.get(name, POLICIES["default"]), **spec}
+
+
+load_config()
+
+
+# ---------------- Stats ----------------
+_stats: Dict[str, Dict] = {}
+_stats_lock = threading.Lock()
+
+
+def _model_stats(model: str) -> Dict:
+    s = _stats.get(model)
+    if s is None:
+        s = _stats[model] = {"calls": 0, "errors": 0, "fallbacks": 0, "input_tokens": 0, "output_tokens": 0,
+                             "cost": 0.0, "latencies": deque(maxlen=200)}
+    return s
+
+
+def cost_of(model: str, input_tokens: int, output_tokens: int) -> float:
+    spec = MODELS.get(model, {})
+    return input_tokens / 1000 * spec.get("input_per_1k", 0) + output_tokens / 1000 * spec.get("output_per_1k", 0)
+
+
+def expected_latency(model: str) -> float:
+    """Observed median latency once there are enough samples, else the catalogue prior."""
+    with _stats_lock:
+        lat = sorted(_stats.get(model, {}).get("latencies", ()))
+    if len(lat) >= MIN_LATENCY_SAMPLES:
+        return lat[len(lat) // 2]
+    return MODELS.get(model, {}).get("latency_s", 10.0)
+
+
+def model_stats() -> List[Dict]:
+    """Per-model rows: calls, errors, fallbacks, tokens, cost (USD), p50/p95 latency (s)."""
+    rows = []
+    with _stats_lock:
+        for model, s in sorted(_stats.items()):
+            lat = sorted(s["latencies"])
+            rows.append({
+                "model": model,
+                "calls": s["calls"],
+                "errors": s["errors"],
+                "fallbacks": s["fallbacks"],
+                "input_tokens": s["input_tokens"],
+                "output_tokens": s["output_tokens"],
+                "cost_usd": round(s["cost"], 4),
+                "p50_s": round(lat[len(lat) // 2], 2) if lat else None,
+                "p95_s": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))], 2) if lat else None,
+            })
+    return rows
+
+
+# ---------------- Routing ----------------
+def policy_for(task: str, page: Optional[str] = None) -> Dict:
+    return POLICIES.get(f"{page}/{task}") or POLICIES.get(task) or POLICIES["default"]
+
+
+def _price(model: str) -> float:
+    spec = MODELS.get(model, {})
+    return spec.get("input_per_1k", 0) + spec.get("output_per_1k", 0)
+
+
+def route(task: str, messages: List[dict], page: Optional[str] = None, latency_budget: Optional[float] = None,
+          max_tokens: Optional[int] = None) -> List[str]:
+    """Models to try for this call, in order: the routed choice, then cheaper fallbacks
+    (the next-priced model when nothing is cheaper)."""
+    policy = policy_for(task, page)
+    primary = policy["model"]
+    if policy.get("large") and estimate_tokens(messages, max_tokens) > policy.get("large_above", 0):
+        primary = policy["large"]
+    fallbacks = policy.get("fallbacks")
+    if fallbacks is None:
+        fallbacks = sorted((m for m in MODELS if _price(m) < _price(primary)), key=_price, reverse=True)
+        if not fallbacks:
+            fallbacks = sorted((m for m in MODELS if m != primary), key=_price)[:1]
+    order = [primary] + [m for m in fallbacks if m != primary]
+    if latency_budget:
+        fits = [m for m in order if expected_latency(m) <= latency_budget]
+        order = fits + [m for m in order if m not in fits] if fits else sorted(order, key=expected_latency)
+    return order
+
+
+def _should_fall_back(e: Exception) -> bool:
+    if _FALLBACK_ERRORS and isinstance(e, _FALLBACK_ERRORS):
+        return True
+    return type(e).__name__ in ("APITimeoutError", "RateLimitError", "Timeout", "TimeoutError")
+
+
+def routed_completion(client, task: str, messages: List[dict], username: Optional[str] = None,
+                      priority: str = INTERACTIVE, page: Optional[str] = None,
+                      latency_budget: Optional[float] = None, model: Optional[str] = None, **params):
+    """``llm.chat_completion`` with the model picked by ``route``; falls back on timeout/rate limit.
+
+    Passing ``model`` pins it (no routing, no fallback). The model actually
+    used is on the returned response as ``resp.model``. The user's quota is
+    charged once up front and refunded if every attempt fails.
+    ``quota.QuotaExceeded`` and other errors propagate unchanged.
+    """
+    models = [model] if model else route(task, messages, page, latency_budget, params.get("max_tokens"))
+    timeout = params.pop("timeout", None) or policy_for(task, page).get("timeout_s")
+    if latency_budget:
+        timeout = min(timeout or latency_budget, latency_budget * 2)
+    estimated = charge_quota(username, {"messages": messages, **params}) if username else 0
+    try:
+        resp = _attempt(client, models, messages, username, priority, timeout, params)
+    except BaseException:
+        if username:
+            get_limiter().refund(username, estimated)
+        raise
+    if username and not params.get("stream"):
+        usage = getattr(resp, "usage", None)
+        get_limiter().settle(username, estimated, getattr(usage, "total_tokens", 0) or 0)
+    return resp
+
+
+def _attempt(client, models: List[str], messages: List[dict], username: Optional[str], priority: str,
+             timeout: Optional[float], params: Dict):
+    for i, name in enumerate(models):
+        start = time.perf_counter()
+        try:
+            resp = chat_completion(client, username=username, priority=priority, quota=False, model=name,
+                                   messages=messages, timeout=timeout, **params)
+        except Exception as e:
+            retry = _should_fall_back(e) and i + 1 < len(models)
+            with _stats_lock:
+                s = _model_stats(name)
+                s["errors"] += 1
+                s["fallbacks"] += 1 if retry else 0
+            if retry:
+                continue
+            raise
+        elapsed = time.perf_counter() - start
+        usage = getattr(resp, "usage", None)
+        tin = getattr(usage, "prompt_tokens", 0) or 0
+        tout = getattr(usage, "completion_tokens", 0) or 0
+        with _stats_lock:
+            s = _model_stats(name)
+            s["calls"] += 1
+            s["input_tokens"] += tin
+            s["output_tokens"] += tout
+            s["cost"] += cost_of(name, tin, tout)
+            s["latencies"].append(elapsed)
+        return resp
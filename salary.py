@@ -0,0 +1,348 @@
+# salary.py
+# Salary band tables, fuzzy role-title resolution and market comparison.
+#
+# Bands are keyed by role x location x level. The built-in table below covers
+# the common titles; a larger table (100k+ rows) can be dropped in as a CSV
+# with columns: role,location,level,low,mid,high  (see SALARY_BANDS_CSV).
+
+import os
+import re
+import csv
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Optional deps (gracefully degrade)
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+SALARY_BANDS_CSV = os.getenv("SALARY_BANDS_CSV", "salary_bands.csv")
+
+SALARY_BANDS = {
+    "data analyst": (65000, 85000, 110000),
+    "data scientist": (100000, 135000, 175000),
+    "ml engineer": (120000, 160000, 210000),
+    "software engineer": (100000, 140000, 190000),
+    "devops engineer": (110000, 145000, 185000),
+    "cloud engineer": (115000, 150000, 200000),
+    "product manager": (110000, 145000, 190000),
+    "it project manager": (95000, 120000, 150000),
+    "security engineer": (115000, 155000, 210000),
+    "solutions architect": (125000, 165000, 220000),
+}
+LOCATION_MULTIPLIER = {"remote": 1.0, "low-cost": 0.9, "standard": 1.0, "high-cost": 1.15}
+# Only applied when a table has no row for the requested level.
+LEVEL_MULTIPLIER = {"junior": 0.8, "mid": 1.0, "senior": 1.2, "lead": 1.3, "staff": 1.35, "principal": 1.5}
+
+DEFAULT_LOCATION = "standard"
+DEFAULT_LEVEL = "mid"
+
+# Title tokens that carry seniority rather than role; stripped before matching.
+LEVEL_ALIASES = {
+    "jr": "junior", "junior": "junior", "entry": "junior", "associate": "junior", "i": "junior",
+    "ii": "mid", "mid": "mid", "intermediate": "mid",
+    "sr": "senior", "senior": "senior", "iii": "senior",
+    "lead": "lead", "staff": "staff", "principal": "principal", "iv": "staff", "v": "principal",
+}
+TITLE_ABBREVIATIONS = {
+    "eng": "engineer", "engr": "engineer", "dev": "developer", "mgr": "manager",
+    "pm": "product manager", "swe": "software engineer", "sde": "software engineer",
+}
+# Tried when the title itself is not a known role: "Machine Learning Engineer" -> "ml engineer".
+TITLE_PHRASES = {"machine learning": "ml"}
+# Head nouns that name the same job family.
+HEAD_SYNONYMS = {"developer": "engineer", "programmer": "engineer"}
+
+_LOCATION_MULTIPLIER = {_k.replace("-", " "): _v for _k, _v in LOCATION_MULTIPLIER.items()}  # keyed like _norm()
+
+STATUS_BELOW, STATUS_WITHIN, STATUS_ABOVE = "Below Market", "Within Market", "Above Market"
+MIN_ROLE_SIMILARITY = 0.45
+# Per-word trigram similarity for two title words to count as the same word (typos).
+MIN_WORD_SIMILARITY = 0.6
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9+#/ ]", " ", (text or "").lower())).strip()
+
+
+def parse_title(title: str) -> Tuple[str, Optional[str]]:
+    """Split a job title into (role text, level or None): 'Sr. Data Scientist' -> ('data scientist', 'senior')."""
+    level = None
+    words = []
+    for w in _norm(title).split():
+        if w in LEVEL_ALIASES:
+            level = level or LEVEL_ALIASES[w]
+            continue
+        words.append(TITLE_ABBREVIATIONS.get(w, w))
+    return " ".join(words), level
+
+
+def _trigrams(text: str) -> set:
+    t = f"  {text} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+def _same_word(a: str, b: str) -> bool:
+    if a == b or HEAD_SYNONYMS.get(a, a) == HEAD_SYNONYMS.get(b, b):
+        return True
+    ga, gb = _trigrams(a), _trigrams(b)
+    return 2.0 * len(ga & gb) / (len(ga) + len(gb)) >= MIN_WORD_SIMILARITY
+
+
+def _role_compatible(query_words: Sequence[str], role: str) -> bool:
+    """A fuzzy match must share the role's head noun (its last word: engineer, analyst, ...) and, when the
+    role has other words, at least one of them. A shared generic head alone ('QA Engineer' vs 'ML Engineer')
+    is not a match."""
+    *modifiers, head = role.split()
+    rest = [w for w in query_words if not _same_word(w, head)]
+    if len(rest) == len(query_words):
+        return False
+    return not modifiers or any(_same_word(w, m) for w in rest for m in modifiers)
+
+
+# ---------------- Columnar band table ----------------
+class BandTable:
+    """Array-backed role x location x level salary bands with a trigram role index.
+
+    Strings are dictionary-encoded once; each row is stored as small integer codes
+    plus three int32 salary columns, so 100k+ rows stay a few MB.
+    """
+
+    def __init__(self):
+        self.roles: List[str] = []
+        self.locations: List[str] = []
+        self.levels: List[str] = []
+        self._role_ids: Dict[str, int] = {}
+        self._location_ids: Dict[str, int] = {}
+        self._level_ids: Dict[str, int] = {}
+        self.role_col = array("I")
+        self.location_col = array("H")
+        self.level_col = array("H")
+        self.low = array("i")
+        self.mid = array("i")
+        self.high = array("i")
+        self._rows: Dict[int, int] = {}
+        self._trigram_index: Dict[str, array] = {}
+        self._role_grams = array("H")
+        self.resolve_role = lru_cache(maxsize=8192)(self._resolve_role)
+
+    def __len__(self):
+        return len(self.low)
+
+    @staticmethod
+    def _code(value: str, values: List[str], ids: Dict[str, int]) -> int:
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(values)
+            values.append(value)
+        return code
+
+    @staticmethod
+    def _key(role_id: int, location_id: int, level_id: int) -> int:
+        return (role_id << 32) | (location_id << 16) | level_id
+
+    def add(self, role: str, location: str, level: str, low: int, mid: int, high: int):
+        role = _norm(role)
+        is_new_role = role not in self._role_ids
+        r = self._code(role, self.roles, self._role_ids)
+        loc = self._code(_norm(location) or DEFAULT_LOCATION, self.locations, self._location_ids)
+        lvl = self._code(_norm(level) or DEFAULT_LEVEL, self.levels, self._level_ids)
+        key = self._key(r, loc, lvl)
+        if key in self._rows:  # later rows win, like dict.update
+            i = self._rows[key]
+            self.low[i], self.mid[i], self.high[i] = int(low), int(mid), int(high)
+        else:
+            self._rows[key] = len(self.low)
+            self.role_col.append(r)
+            self.location_col.append(loc)
+            self.level_col.append(lvl)
+            self.low.append(int(low))
+            self.mid.append(int(mid))
+            self.high.append(int(high))
+        if is_new_role:
+            grams = _trigrams(role)
+            self._role_grams.append(len(grams))
+            for g in grams:
+                self._trigram_index.setdefault(g, array("I")).append(r)
+            self.resolve_role.cache_clear()
+
+    # ---- role resolution ----
+    def _resolve_role(self, title: str) -> Tuple[Optional[str], Optional[str], float]:
+        role_text, level = parse_title(title)
+        if not role_text:
+            return None, level, 0.0
+        if role_text in self._role_ids:
+            return role_text, level, 1.0
+        short = role_text
+        for phrase, abbr in TITLE_PHRASES.items():
+            short = re.sub(rf"\b{phrase}\b", abbr, short)
+        if short in self._role_ids:
+            return short, level, 1.0
+        query = _trigrams(role_text)
+        overlap: Dict[int, int] = {}
+        for g in query:
+            for r in self._trigram_index.get(g, ()):
+                overlap[r] = overlap.get(r, 0) + 1
+        # Dice coefficient over padded trigrams, best first; the first word-compatible role wins.
+        scored = sorted(((2.0 * common / (len(query) + self._role_grams[r]), r) for r, common in overlap.items()),
+                        reverse=True)
+        words = role_text.split()
+        for score, r in scored:
+            if score < MIN_ROLE_SIMILARITY:
+                break
+            if _role_compatible(words, self.roles[r]):
+                return self.roles[r], level, round(score, 3)
+        return None, level, round(scored[0][0], 3) if scored else 0.0
+
+    # ---- band lookup ----
+    def row_for(self, role: str, location: str, level: str) -> Tuple[int, float]:
+        """Return (row index, multiplier) for a resolved role, or (-1, 0.0) if no band applies."""
+        r = self._role_ids.get(role)
+        if r is None:
+            return -1, 0.0
+        # Same normalization as add(): the table stores "high-cost" as "high cost".
+        location = _norm(location) or DEFAULT_LOCATION
+        level = _norm(level) or DEFAULT_LEVEL
+        loc_id = self._location_ids.get(location)
+        std_id = self._location_ids.get(DEFAULT_LOCATION)
+        for lvl_name, lvl_mult in ((level, 1.0), (DEFAULT_LEVEL, LEVEL_MULTIPLIER.get(level, 1.0))):
+            lvl_id = self._level_ids.get(lvl_name)
+            if lvl_id is None:
+                continue
+            if loc_id is not None:
+                i = self._rows.get(self._key(r, loc_id, lvl_id))
+                if i is not None:
+                    return i, lvl_mult
+            if std_id is not None:
+                i = self._rows.get(self._key(r, std_id, lvl_id))
+                if i is not None:
+                    return i, lvl_mult * _LOCATION_MULTIPLIER.get(location, 1.0)
+        return -1, 0.0
+
+    def band(self, title: str, location_level: str = DEFAULT_LOCATION, level: Optional[str] = None):
+        role, title_level, _ = self.resolve_role(title or "")
+        if role is None:
+            return None
+        i, mult = self.row_for(role, location_level, level or title_level)
+        if i < 0:
+            return None
+        return (int(self.low[i] * mult), int(self.mid[i] * mult), int(self.high[i] * mult))
+
+
+def build_default_table() -> BandTable:
+    table = BandTable()
+    for role, (lo, mid, hi) in SALARY_BANDS.items():
+        table.add(role, DEFAULT_LOCATION, DEFAULT_LEVEL, lo, mid, hi)
+    return table
+
+
+def load_band_table(path: str, table: Optional[BandTable] = None) -> BandTable:
+    """Stream a role,location,level,low,mid,high CSV into a BandTable (built-in bands first)."""
+    table = table or build_default_table()
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                table.add(row["role"], row.get("location", ""), row.get("level", ""),
+                          int(float(row["low"])), int(float(row["mid"])), int(float(row["high"])))
+            except (KeyError, TypeError, ValueError):
+                continue  # skip malformed rows
+    return table
+
+
+_TABLE: Optional[BandTable] = None
+
+
+def get_band_table() -> BandTable:
+    """Process-wide table, loaded once from SALARY_BANDS_CSV if present."""
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = load_band_table(SALARY_BANDS_CSV) if os.path.exists(SALARY_BANDS_CSV) else build_default_table()
+    return _TABLE
+
+
+def resolve_role(title: str) -> Tuple[Optional[str], Optional[str], float]:
+    """Fuzzy-resolve a job title to (known role, parsed level, similarity)."""
+    return get_band_table().resolve_role(title or "")
+
+
+def estimate_salary_band(role: str, location_level: str = "standard", level: Optional[str] = None):
+    return get_band_table().band(role, location_level, level)
+
+
+def compare_salary(expected: int, band: tuple[int,int,int]) -> dict:
+    lo, mid, hi = band
+    if expected < lo:
+        status = STATUS_BELOW
+        note = f"Your expectation (${expected:,}) is **below** market (${lo:,}–${hi:,}). Consider asking closer to mid."
+    elif expected > hi:
+        status = STATUS_ABOVE
+        note = f"Your expectation (${expected:,}) is **above** market (${lo:,}–${hi:,}). Consider moderating by 10–20% or justify scope/impact."
+    else:
+        status = STATUS_WITHIN
+        note = f"Your expectation (${expected:,}) is **within** market (${lo:,}–${hi:,})."
+    return {"status": status, "note": note, "band_low": lo, "band_mid": mid, "band_high": hi}
+
+
+def compare_salary_batch(expected: Sequence[int], roles, location_level="standard", level=None) -> Dict[str, list]:
+    """Compare many expectations at once.
+
+    ``roles``, ``location_level`` and ``level`` may each be a single value or a
+    sequence aligned with ``expected``. Returns column lists: status (None when
+    no band applies), band_low/mid/high and delta_pct (expected vs. mid).
+    """
+    n = len(expected)
+    table = get_band_table()
+
+    def _col(v):
+        return [v] * n if v is None or isinstance(v, str) else list(v)
+
+    roles, locs, levels = _col(roles), _col(location_level), _col(level)
+    rows, mults = array("i", bytes(4 * n)), array("d", bytes(8 * n))
+    seen: Dict[tuple, Tuple[int, float]] = {}
+    for k in range(n):
+        key = (roles[k], locs[k], levels[k])
+        hit = seen.get(key)
+        if hit is None:
+            role, title_level, _ = table.resolve_role(key[0] or "")
+            hit = seen[key] = table.row_for(role, key[1], key[2] or title_level) if role else (-1, 0.0)
+        rows[k], mults[k] = hit
+
+    if np is not None:
+        idx = np.frombuffer(rows, dtype=np.int32)
+        mult = np.frombuffer(mults, dtype=np.float64)
+        exp = np.asarray(expected, dtype=np.float64)
+        ok = idx >= 0
+        safe = np.where(ok, idx, 0)
+        lo = (np.frombuffer(table.low, dtype=np.int32)[safe] * mult).astype(np.int64)
+        md = (np.frombuffer(table.mid, dtype=np.int32)[safe] * mult).astype(np.int64)
+        hi = (np.frombuffer(table.high, dtype=np.int32)[safe] * mult).astype(np.int64)
+        status = np.where(exp < lo, STATUS_BELOW, np.where(exp > hi, STATUS_ABOVE, STATUS_WITHIN)).astype(object)
+        status[~ok] = None
+        delta = np.where(ok, np.round((exp - md) / np.maximum(md, 1) * 100, 1), np.nan)
+        return {
+            "status": status.tolist(),
+            "band_low": np.where(ok, lo, 0).tolist(),
+            "band_mid": np.where(ok, md, 0).tolist(),
+            "band_high": np.where(ok, hi, 0).tolist(),
+            "delta_pct": [None if d != d else d for d in delta.tolist()],
+        }
+
+    out = {"status": [], "band_low": [], "band_mid": [], "band_high": [], "delta_pct": []}
+    for k in range(n):
+        i, m = rows[k], mults[k]
+        if i < 0:
+            for col in ("band_low", "band_mid", "band_high"):
+                out[col].append(0)
+            out["status"].append(None)
+            out["delta_pct"].append(None)
+            continue
+        lo, md, hi = int(table.low[i] * m), int(table.mid[i] * m), int(table.high[i] * m)
+        e = expected[k]
+        out["status"].append(STATUS_BELOW if e < lo else STATUS_ABOVE if e > hi else STATUS_WITHIN)
+        out["band_low"].append(lo)
+        out["band_mid"].append(md)
+        out["band_high"].append(hi)
+        out["delta_pct"].append(round((e - md) / max(md, 1) * 100, 1))
+    return out
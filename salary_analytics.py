@@ -0,0 +1,329 @@
+# salary_analytics.py
+# Persisted salary alignments and the leadership dashboard aggregates.
+#
+# Every fit analysis shown to a candidate (app or API) appends its salary
+# comparison as one row: time, matched role, location tier, level, expected
+# salary, the band and the status. Expected salaries outside SALARY_MIN..
+# SALARY_MAX are not logged, and the same user repeating the same comparison
+# within SALARY_LOG_DEDUP_S (retries, scripts) is logged once. Rows without a
+# user (anonymous API callers) are never deduplicated: different people would
+# collapse into one.
+#
+# New rows land in a small SQLite staging table (cheap, safe across processes).
+# Once SALARY_SEAL_ROWS rows have piled up they are sealed into an immutable,
+# zstd-compressed Parquet segment under SALARY_ANALYTICS_DIR, with
+# role/location/level dictionary-encoded. A segment's name carries the last
+# staging id it holds, so rows are never counted twice, even if a seal crashed
+# halfway. Without pyarrow everything stays in the staging table.
+#
+# The dashboard loads the segments (each read once per process) plus staging
+# into one pandas frame and computes everything with NumPy masks and group-bys:
+# share below/within/above market, the distribution of expected vs. the band
+# midpoint, per role x location tier splits and weekly trends. Frames and
+# aggregates are cached per data version (segment names + staging high-water
+# mark), so a dashboard rerun with no new analyses costs a dict lookup.
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from salary import STATUS_ABOVE, STATUS_BELOW, STATUS_WITHIN
+
+# Optional deps (gracefully degrade)
+try:
+    import numpy as np
+    import pandas as pd
+except Exception:
+    np = pd = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    pa = pq = None
+
+SALARY_ANALYTICS_DB = os.getenv("SALARY_ANALYTICS_DB", "salary_analytics.sqlite3")
+SALARY_ANALYTICS_DIR = os.getenv("SALARY_ANALYTICS_DIR", "salary_analytics")
+SALARY_SEAL_ROWS = int(os.getenv("SALARY_SEAL_ROWS", "50000"))
+SALARY_LOG_DEDUP_S = int(os.getenv("SALARY_LOG_DEDUP_S", "3600"))
+SALARY_MIN, SALARY_MAX = 10_000, 2_000_000  # plausible annual USD expectations
+DELTA_STEP, DELTA_RANGE = 5, 50  # histogram of expected vs. mid, in %, clipped to +/-50
+TREND_BUCKET_S = 7 * 24 * 3600
+AGG_CACHE_SIZE = 32
+
+STATUS_CODES = {STATUS_BELOW: -1, STATUS_WITHIN: 0, STATUS_ABOVE: 1}
+COLUMNS = ("ts", "role", "location", "level", "expected", "band_low", "band_mid", "band_high", "status")
+_CATEGORIES = ("role", "location", "level")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS staged (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts        INTEGER NOT NULL,
+    role      TEXT NOT NULL,
+    location  TEXT NOT NULL,
+    level     TEXT NOT NULL,
+    expected  INTEGER NOT NULL,
+    band_low  INTEGER NOT NULL,
+    band_mid  INTEGER NOT NULL,
+    band_high INTEGER NOT NULL,
+    status    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recent (
+    key TEXT PRIMARY KEY,
+    ts  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recent_ts ON recent(ts);
+"""
+
+
+def _segment_range(name: str) -> Tuple[int, int]:
+    first, last = name[len("seg-"):-len(".parquet")].split("-")
+    return int(first), int(last)
+
+
+class SalaryLog:
+    """Append-only salary alignment log with cached, vectorized aggregates."""
+
+    def __init__(self, path: str = SALARY_ANALYTICS_DB, directory: str = SALARY_ANALYTICS_DIR):
+        self.path = path
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._segments: Dict[str, "pa.Table"] = {}  # immutable, so read once
+        self._frame: Tuple[Optional[tuple], Optional["pd.DataFrame"]] = (None, None)
+        self._aggs: "OrderedDict[tuple, Dict]" = OrderedDict()
+
+    def _tx(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn()
+                self._conn.execute("COMMIT")
+                return out
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ---- writes ----
+    def record(self, alignment: Optional[Dict], expected_salary, location_level: str = "standard",
+               ts: Optional[int] = None, source: str = "") -> bool:
+        """Log one ``analysis.salary_alignment`` result that has a status for ``source`` (the user).
+
+        Returns True if logged; False for no status, an implausible salary or a
+        repeat by the same ``source`` within SALARY_LOG_DEDUP_S. Rows with an
+        empty ``source`` (unknown user) are never treated as repeats.
+        """
+        if not alignment or alignment.get("status") not in STATUS_CODES or not expected_salary:
+            return False
+        if not SALARY_MIN <= int(expected_salary) <= SALARY_MAX:
+            return False
+        row = (int(ts if ts is not None else time.time()), alignment.get("matched_role") or "unknown",
+               location_level or "standard", alignment.get("level") or "mid", int(expected_salary),
+               alignment["band_low"], alignment["band_mid"], alignment["band_high"],
+               STATUS_CODES[alignment["status"]])
+        key = "|".join(str(v) for v in (source,) + row[1:5])
+
+        def _write():
+            if SALARY_LOG_DEDUP_S > 0 and source:
+                self._conn.execute("DELETE FROM recent WHERE ts < ?", (row[0] - SALARY_LOG_DEDUP_S,))
+                if self._conn.execute("SELECT 1 FROM recent WHERE key = ?", (key,)).fetchone():
+                    return False
+                self._conn.execute("INSERT INTO recent(key, ts) VALUES (?, ?)", (key, row[0]))
+            self._insert([row])
+            return True
+        logged = self._tx(_write)
+        self._maybe_seal()
+        return logged
+
+    def record_many(self, rows: Iterable[tuple]):
+        """Append rows shaped like ``COLUMNS`` (status as -1/0/1); seals a segment when enough are staged."""
+        self._tx(lambda: self._insert(rows))
+        self._maybe_seal()
+
+    def _insert(self, rows: Iterable[tuple]):
+        placeholders = ", ".join("?" * len(COLUMNS))
+        self._conn.executemany(f"INSERT INTO staged({', '.join(COLUMNS)}) VALUES ({placeholders})", rows)
+
+    def _maybe_seal(self):
+        if pq is not None and self.staged_count() >= SALARY_SEAL_ROWS:
+            self.seal()
+
+    def staged_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM staged WHERE id > ?", (self._sealed_upto(),)).fetchone()[0]
+
+    def seal(self, min_rows: int = SALARY_SEAL_ROWS) -> Optional[str]:
+        """Move staged rows into a new Parquet segment (at least ``min_rows``); returns its path."""
+        if pq is None:
+            return None
+
+        def _seal():
+            upto = self._sealed_upto()
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(COLUMNS)} FROM staged WHERE id > ? ORDER BY id", (upto,)).fetchall()
+            if not rows or len(rows) < min_rows:
+                return None
+            ids = [r[0] for r in rows]
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"seg-{ids[0]:012d}-{ids[-1]:012d}.parquet")
+            tmp = f"{path}.{os.getpid()}.tmp"
+            pq.write_table(_arrow_table(list(zip(*rows))[1:]), tmp, compression="zstd")
+            os.replace(tmp, path)
+            # A crash before this delete leaves rows that are already in the segment;
+            # reads skip staged ids <= the newest segment's last id.
+            self._conn.execute("DELETE FROM staged WHERE id <= ?", (ids[-1],))
+            return path
+
+        return self._tx(_seal)
+
+    # ---- reads ----
+    def _segment_names(self) -> List[str]:
+        try:
+            return sorted(e for e in os.listdir(self.directory) if e.startswith("seg-") and e.endswith(".parquet"))
+        except FileNotFoundError:
+            return []
+
+    def _sealed_upto(self) -> int:
+        names = self._segment_names()
+        return _segment_range(names[-1])[1] if names else 0
+
+    def version(self) -> tuple:
+        """Changes whenever a row is logged or a segment is sealed."""
+        names = self._segment_names()
+        upto = _segment_range(names[-1])[1] if names else 0
+        with self._lock:
+            staged = self._conn.execute("SELECT COUNT(*), MAX(id) FROM staged WHERE id > ?", (upto,)).fetchone()
+        return tuple(names), upto, staged[0], staged[1]
+
+    def frame(self, version: Optional[tuple] = None) -> "pd.DataFrame":
+        """All logged rows as one DataFrame (role/location/level categorical), cached per version."""
+        if pd is None:
+            raise RuntimeError("salary analytics need numpy and pandas")
+        version = version or self.version()
+        if self._frame[0] == version:
+            return self._frame[1]
+        names, upto = version[0], version[1]
+        with self._lock:
+            staged = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM staged WHERE id > ? ORDER BY id", (upto,)).fetchall()
+        if pa is not None:
+            for name in names:
+                if name not in self._segments:
+                    self._segments[name] = pq.read_table(os.path.join(self.directory, name),
+                                                         read_dictionary=list(_CATEGORIES))
+            for name in set(self._segments) - set(names):
+                del self._segments[name]
+            tables = [self._segments[n] for n in names]
+            tables.append(_arrow_table(list(zip(*staged)) if staged else [[] for _ in COLUMNS]))
+            # Chunks with different dictionaries are unified into one categorical per column.
+            df = pa.concat_tables(tables).to_pandas()
+        else:
+            df = pd.DataFrame.from_records(staged, columns=list(COLUMNS))
+            df = df.astype({c: "category" for c in _CATEGORIES})
+        self._frame = (version, df)
+        return df
+
+    def dimensions(self) -> Dict[str, List[str]]:
+        """Distinct roles and location tiers present, for dashboard filters."""
+        df = self.frame()
+        return {c: sorted(df[c].cat.remove_unused_categories().cat.categories) for c in ("role", "location")}
+
+    def dashboard(self, role: Optional[str] = None, location: Optional[str] = None) -> Dict:
+        """``aggregate`` over the current data, cached per (data version, filters)."""
+        version = self.version()
+        key = (version, role, location)
+        with self._lock:
+            hit = self._aggs.get(key)
+            if hit is not None:
+                self._aggs.move_to_end(key)
+                return hit
+        out = aggregate(self.frame(version), role, location)
+        with self._lock:
+            self._aggs[key] = out
+            while len(self._aggs) > AGG_CACHE_SIZE:
+                self._aggs.popitem(last=False)
+        return out
+
+
+def _arrow_table(columns) -> "pa.Table":
+    arrays = {}
+    for name, values in zip(COLUMNS, columns):
+        if name in _CATEGORIES:
+            arrays[name] = pa.array(values, pa.string()).dictionary_encode()
+        elif name == "status":
+            arrays[name] = pa.array(values, pa.int8())
+        elif name == "ts":
+            arrays[name] = pa.array(values, pa.int64())
+        else:
+            arrays[name] = pa.array(values, pa.int32())
+    return pa.table(arrays)
+
+
+def _shares(group_by, below, above, delta) -> "pd.DataFrame":
+    frame = pd.DataFrame({"below": below, "above": above, "delta": delta})
+    g = frame.groupby(group_by, observed=True, sort=False)
+    out = g.agg(analyses=("delta", "size"), below=("below", "mean"), above=("above", "mean"),
+                median_delta_pct=("delta", "median"))
+    out["within"] = 1.0 - out["below"] - out["above"]
+    return out[["analyses", "below", "within", "above", "median_delta_pct"]]
+
+
+def aggregate(df: "pd.DataFrame", role: Optional[str] = None, location: Optional[str] = None) -> Dict:
+    """Dashboard aggregates over ``df`` (optionally one role and/or location tier).
+
+    overview: analyses, below/within/above shares, median expected vs. mid (%).
+    distribution: counts of expected vs. band mid in DELTA_STEP% buckets (clipped).
+    segments: per (role, location) shares and median delta, largest first.
+    trend: the same per week.
+    """
+    if role is not None:
+        df = df[df["role"] == role]
+    if location is not None:
+        df = df[df["location"] == location]
+    exp = df["expected"].to_numpy(np.float64)
+    mid = df["band_mid"].to_numpy(np.float64)
+    status = df["status"].to_numpy()
+    delta = (exp - mid) / np.maximum(mid, 1) * 100
+    below, above = status < 0, status > 0
+    n = len(df)
+
+    edges = np.arange(-DELTA_RANGE, DELTA_RANGE + DELTA_STEP, DELTA_STEP)
+    counts, _ = np.histogram(np.clip(delta, -DELTA_RANGE, DELTA_RANGE), bins=edges)
+    distribution = pd.DataFrame({"analyses": counts}, index=pd.Index(edges[:-1], name="delta_pct"))
+
+    segments = _shares([df["role"].array, df["location"].array], below, above, delta)
+    segments.index.names = ["role", "location"]
+    segments = segments.sort_values("analyses", ascending=False)
+
+    week = df["ts"].to_numpy() // TREND_BUCKET_S * TREND_BUCKET_S
+    trend = _shares(week, below, above, delta).sort_index()
+    trend.index = pd.to_datetime(trend.index, unit="s")
+    trend.index.name = "week"
+
+    overview = {
+        "analyses": n,
+        "below": float(below.mean()) if n else 0.0,
+        "within": float(1 - below.mean() - above.mean()) if n else 0.0,
+        "above": float(above.mean()) if n else 0.0,
+        "median_delta_pct": round(float(np.median(delta)), 1) if n else None,
+    }
+    return {"overview": overview, "distribution": distribution, "segments": segments, "trend": trend}
+
+
+_LOG: Optional[SalaryLog] = None
+_LOG_LOCK = threading.Lock()
+
+
+def get_salary_log() -> SalaryLog:
+    """Process-wide log, opened once (module state survives Streamlit reruns)."""
+    global _LOG
+    with _LOG_LOCK:
+        if _LOG is None:
+            _LOG = SalaryLog()
+    return _LOG
@@ -0,0 +1,123 @@
+# static_assets.py
+# Pre-resized image thumbnails served through Streamlit's static file route.
+#
+# ``st.image("assets/ceo.jpg", width=150)`` re-reads the full-size file,
+# resizes it and ships the bytes over the websocket on every rerun. Instead,
+# each (image, display width) pair is resized once (at 2x for HiDPI screens),
+# saved as WebP (JPEG if Pillow lacks WebP) under ./static/ with a content hash
+# in the name, and pages pass the /app/static/... URL to st.image. A rerun then
+# sends only that URL; the browser fetches the file once and revalidates it by
+# ETag. Because a changed source gets a new name, a reverse proxy can safely
+# serve /app/static/ with "Cache-Control: public, max-age=31536000, immutable".
+#
+# Thumbnails are built on first use in a process (fast no-op when already on
+# disk) or ahead of time with ``python static_assets.py``. Needs
+# ``server.enableStaticServing = true`` (.streamlit/config.toml).
+
+import os
+import hashlib
+import threading
+from typing import Dict, Tuple
+
+# Optional: Pillow for resizing (falls back to the original file)
+try:
+    from PIL import Image, features
+    _FORMAT = "WEBP" if features.check("webp") else "JPEG"
+except Exception:
+    Image = None
+    _FORMAT = "JPEG"
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, "static")
+STATIC_URL = "/app/static"
+HIDPI_SCALE = 2
+THUMB_QUALITY = 82
+
+# Every image shown in the apps, with the display widths it is used at.
+THUMBNAILS = {
+    "assets/ceo.jpg": (150, 200),
+    "assets/avatar.png": (150,),
+    "assets/ceo_photo.jpg": (150,),
+}
+
+_urls: Dict[Tuple[str, int], str] = {}
+_lock = threading.Lock()
+
+
+def _thumb_name(src: str, width: int, data: bytes) -> str:
+    digest = hashlib.sha1(data + f"{width}:{HIDPI_SCALE}:{_FORMAT}:{THUMB_QUALITY}".encode()).hexdigest()[:10]
+    ext = ".webp" if _FORMAT == "WEBP" else ".jpg"
+    return f"{os.path.splitext(os.path.basename(src))[0]}-{width}w-{digest}{ext}"
+
+
+def build(src: str, width: int) -> str:
+    """Write the thumbnail for ``src`` at ``width`` (if missing) and return its static URL.
+
+    Returns ``src`` unchanged when it can't be thumbnailed (no Pillow, not an image).
+    """
+    path = os.path.join(ROOT, src)
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return src
+    name = _thumb_name(src, width, data)
+    out = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(out):
+        if Image is None:
+            return src
+        try:
+            with Image.open(path) as img:
+                img.load()
+                img = img.convert("RGBA" if _FORMAT == "WEBP" and "A" in img.getbands() else "RGB")
+                target = min(img.width, width * HIDPI_SCALE)
+                img = img.resize((target, round(img.height * target / img.width)), Image.LANCZOS)
+                os.makedirs(STATIC_DIR, exist_ok=True)
+                tmp = f"{out}.{os.getpid()}.tmp"
+                if _FORMAT == "WEBP":
+                    img.save(tmp, _FORMAT, quality=THUMB_QUALITY, method=4)
+                else:
+                    img.save(tmp, _FORMAT, quality=THUMB_QUALITY, optimize=True, progressive=True)
+                os.replace(tmp, out)
+        except Exception:
+            return src
+        _remove_stale(src, width, keep=name)
+    return f"{STATIC_URL}/{name}"
+
+
+def _remove_stale(src: str, width: int, keep: str):
+    prefix = f"{os.path.splitext(os.path.basename(src))[0]}-{width}w-"
+    for entry in os.listdir(STATIC_DIR):
+        if entry.startswith(prefix) and entry != keep:
+            try:
+                os.remove(os.path.join(STATIC_DIR, entry))
+            except OSError:
+                pass
+
+
+def thumbnail(src: str, width: int) -> str:
+    """Static URL of ``src`` resized for ``width`` px, for ``st.image(url, width=width)``.
+
+    Built once per process; later calls are a dict lookup.
+    """
+    key = (src, width)
+    url = _urls.get(key)
+    if url is None:
+        with _lock:
+            url = _urls.get(key) or build(src, width)
+            _urls[key] = url
+    return url
+
+
+def build_all() -> Dict[Tuple[str, int], str]:
+    for src, widths in THUMBNAILS.items():
+        for width in widths:
+            thumbnail(src, width)
+    return dict(_urls)
+
+
+if __name__ == "__main__":
+    for (src, width), url in build_all().items():
+        out = os.path.join(STATIC_DIR, os.path.basename(url))
+        size = os.path.getsize(out) if url.startswith(STATIC_URL) else os.path.getsize(os.path.join(ROOT, src))
+        print(f"{src} @ {width}px -> {url} ({size / 1024:.1f} KB)")
@@ -1,7 +1,7 @@
 # streamlit_app.py
 
 import os
-import json
+import time
 import secrets
 from datetime import datetime
 
@@ -9,14 +9,23 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 from dotenv import load_dotenv
-from PyPDF2 import PdfReader
-from docx import Document
 from fpdf import FPDF
 from PIL import Image  # (unused now, but OK to keep if you plan images)
 import streamlit_authenticator as stauth
 import openai
 
+from extractors import UploadRejected, extract_text_docx_stream, extract_text_pdf_bounded
+from history import FIT_ANALYSIS, HISTORY_PAGE_SIZE, QUESTIONS, SUMMARY, cursor, get_history, input_hash
+from incremental import explain_prompt, keyword_changes, score_delta, update_fit
+from job_feed import JOB_ALERT_THRESHOLD, get_feed_store
+from llm import llm_metrics
 from prompt_lab import prompt_lab_ui
+from quota import QuotaExceeded, get_limiter, get_scheduler
+from resume_model import QUESTION_SECTIONS, segment_resume
+from router import INTERACTIVE_LATENCY_S, model_stats, routed_completion
+from static_assets import thumbnail
+from user_store import auth_credentials, get_store
+from uploads import count_script_run, extract_once, ingest_upload, upload_stats
 
 
 # ---------------------- Utilities: file/text extraction ----------------------
@@ -38,15 +47,15 @@ def extract_text_from_upload(uploaded_file):
     name = (uploaded_file.name or "").lower()
     try:
         if name.endswith(".pdf"):
-            reader = PdfReader(uploaded_file)
-            return "\n".join([(p.extract_text() or "") for p in reader.pages])
+            return extract_text_pdf_bounded(uploaded_file)
         elif name.endswith(".docx"):
-            doc = Document(uploaded_file)
-            return "\n".join([p.text for p in doc.paragraphs])
+            return extract_text_docx_stream(uploaded_file)
         elif name.endswith(".txt"):
             return _read_txt(uploaded_file)
         else:
             return _read_txt(uploaded_file)  # best effort
+    except UploadRejected:
+        raise
     except Exception:
         return ""
 
@@ -54,94 +63,116 @@ def extract_text_from_upload(uploaded_file):
 # ---------------------- Env / OpenAI ----------------------
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")  # may be empty during offline dev
+if os.getenv("OPENAI_BASE_URL"):
+    # e.g. the local stub_server.py; the module-level client needs the trailing slash
+    openai.base_url = os.getenv("OPENAI_BASE_URL").rstrip("/") + "/"
 
 
-# ---------------------- Simple JSON storage ----------------------
-USERS_DB = "user_data.json"
-
-
-def _ensure_db():
-    if not os.path.exists(USERS_DB):
-        with open(USERS_DB, "w") as f:
-            json.dump({}, f)
-
-
-def load_users():
-    _ensure_db()
-    with open(USERS_DB, "r") as f:
-        return json.load(f)
+def llm_text(username: str, page: str, task: str, prompt: str, **params):
+    """Run a single-prompt GPT call for ``task`` on ``page`` and return its text; shows the error and returns None
+    on failure."""
+    try:
+        resp = routed_completion(
+            openai,
+            task,
+            [{"role": "user", "content": prompt}],
+            username=username,
+            page=page,
+            latency_budget=INTERACTIVE_LATENCY_S,
+            **params,
+        )
+        return resp.choices[0].message.content
+    except QuotaExceeded as e:
+        st.warning(f"You've reached your usage limit. Try again in about {e.retry_after:.0f}s.")
+    except Exception as e:
+        st.error("OpenAI call failed (likely no billing/quota yet).")
+        st.caption(f"(Debug: {e})")
+    return None
 
 
-def save_users(data):
-    with open(USERS_DB, "w") as f:
-        json.dump(data, f, indent=4)
+# ---------------------- Shared user store ----------------------
+# SQLite-backed and safe across server processes; the old user_data.json is
+# imported on first run. See user_store.py.
+store = get_store()
+# Watched resumes and job-feed match alerts (filled by the job_feed.py daemon).
+feed = get_feed_store()
+# Saved GPT results per user, reused instead of repeating a call. See history.py.
+history = get_history()
 
 
-user_data = load_users()
+def saved_on(record: dict) -> str:
+    return datetime.fromtimestamp(record["created_at"]).strftime("%Y-%m-%d %H:%M")
 
 
 # ---------------------- Auth helpers (local) ----------------------
 def user_exists(username: str) -> bool:
-    return isinstance(user_data, dict) and username in user_data
+    return store.exists(username)
 
 
 def create_reset_token(username: str):
     """Create and store a one-time reset token for a user."""
-    if not user_exists(username):
-        return False, "No such user."
     token = secrets.token_urlsafe(12)
-    user_data[username].setdefault("meta", {})
-    user_data[username]["meta"]["reset_token"] = token
-    user_data[username]["meta"]["reset_issued_at"] = datetime.utcnow().isoformat() + "Z"
-    save_users(user_data)
+
+    def _set_token(rec):
+        if rec is None:
+            return None
+        rec.setdefault("meta", {})
+        rec["meta"]["reset_token"] = token
+        rec["meta"]["reset_issued_at"] = datetime.utcnow().isoformat() + "Z"
+        return rec
+
+    if store.update(username, _set_token) is None:
+        return False, "No such user."
     return True, token
 
 
 def reset_password_with_token(username: str, token: str, new_password: str):
     """Verify token and set a new password. Clears token after use."""
-    if not user_exists(username):
-        return False, "No such user."
-    meta = user_data[username].get("meta", {})
-    stored = meta.get("reset_token", "")
-    if not stored:
-        return False, "No reset token exists for this user."
-    if token.strip() != stored:
-        return False, "Invalid token."
-
-    user_data[username]["password"] = new_password  # stauth re-hashes on load
-    user_data[username]["meta"]["reset_token"] = ""
-    save_users(user_data)
-    return True, "Password reset successful."
+    result = []
+
+    def _reset(rec):
+        if rec is None:
+            result.append((False, "No such user."))
+            return None
+        stored = rec.get("meta", {}).get("reset_token", "")
+        if not stored:
+            result.append((False, "No reset token exists for this user."))
+            return None
+        if token.strip() != stored:
+            result.append((False, "Invalid token."))
+            return None
+        rec["password"] = new_password  # stauth re-hashes on load
+        rec["meta"]["reset_token"] = ""
+        result.append((True, "Password reset successful."))
+        return rec
+
+    store.update(username, _reset)  # check + clear in one transaction: a token works once
+    return result[0]
 
 
 def change_password_direct(username: str, old_password: str, new_password: str):
     """Validate old password and update to new password."""
-    if not user_exists(username):
-        return False, "No such user."
-    current = user_data[username].get("password", "")
-    if old_password != current:
-        return False, "Old password is incorrect."
-    user_data[username]["password"] = new_password
-    save_users(user_data)
-    return True, "Password changed."
+    result = []
 
+    def _change(rec):
+        if rec is None:
+            result.append((False, "No such user."))
+            return None
+        if old_password != rec.get("password", ""):
+            result.append((False, "Old password is incorrect."))
+            return None
+        rec["password"] = new_password
+        result.append((True, "Password changed."))
+        return rec
+
+    store.update(username, _change)
+    return result[0]
 
-# ---------------------- Streamlit Authenticator setup ----------------------
-# Build credentials from local JSON (password stored plaintext here; stauth will hash)
-user_credentials = {"usernames": {}}
-for uname, uinfo in user_data.items():
-    if isinstance(uinfo, dict) and "password" in uinfo:
-        user_credentials["usernames"][uname] = {
-            "name": uinfo.get("name", uname),
-            "password": stauth.Hasher([uinfo["password"]]).generate()[0],
-        }
 
-# Seed an admin if missing
-if "admin" not in user_credentials["usernames"]:
-    user_credentials["usernames"]["admin"] = {
-        "name": "Admin",
-        "password": stauth.Hasher(["adminpass"]).generate()[0],
-    }
+# ---------------------- Streamlit Authenticator setup ----------------------
+# Passwords are stored plaintext; stauth checks against bcrypt hashes, which are
+# computed once per process (warmup.py precomputes them before traffic arrives).
+user_credentials = auth_credentials(store.all())
 
 authenticator = stauth.Authenticate(
     user_credentials, "resume_ready", "abcdef", cookie_expiry_days=30
@@ -150,6 +181,7 @@ authenticator = stauth.Authenticate(
 
 # ---------------------- Streamlit page config ----------------------
 st.set_page_config(page_title="ResumeReadyPro", page_icon="🧠", layout="wide")
+count_script_run()
 
 
 # ---------------------- Login ----------------------
@@ -159,8 +191,11 @@ name, auth_status, username = authenticator.login("Login", "main")
 # ---------------------- App (when logged-in) ----------------------
 if auth_status:
     authenticator.logout("Logout", "sidebar")
-    st.sidebar.image("assets/ceo.jpg", width=150)
+    st.sidebar.image(thumbnail("assets/ceo.jpg", 150), width=150)
     st.sidebar.markdown(f"### Welcome, {username}")
+    new_alerts = feed.unseen_count(username)
+    if new_alerts:
+        st.sidebar.caption(f"🔔 {new_alerts} new job match{'es' if new_alerts != 1 else ''} — see **Job Alerts**")
 
     page = st.sidebar.radio(
         "Navigate",
@@ -168,7 +203,9 @@ if auth_status:
             "Generate Summary",
             "Upload Resume",
             "Job Fit & Salary",
+            "Job Alerts",
             "Prompt Lab",
+            "History",
             "Admin Dashboard",
             "Register User",
             "Change Password",
@@ -177,10 +214,9 @@ if auth_status:
         ],
     )
 
-    # seed counters for first-time users
-    if username not in user_data:
-        user_data[username] = {"summaries": 0, "resumes": 0, "questions": 0}
-        save_users(user_data)
+    # seed counters for first-time users (exists() is a cached read; ensure() takes the write lock)
+    if not store.exists(username):
+        store.ensure(username, {"summaries": 0, "resumes": 0, "questions": 0})
 
     st.title("📄 ResumeReadyPro")
 
@@ -192,21 +228,36 @@ if auth_status:
         experience = st.text_area("Brief Work Experience")
         skills = st.text_area("Skills / Technologies")
 
-        if st.button("Generate"):
+        summary_key = input_hash(SUMMARY, full_name, career_goal, experience, skills)
+        prior = history.find(username, SUMMARY, summary_key) if (career_goal or experience or skills) else None
+        gen_col, reuse_col = st.columns(2)
+        generate = gen_col.button("Generate")
+        if prior and reuse_col.button(f"Reuse summary from {saved_on(prior)}"):
+            st.success("Saved Summary (no GPT call)")
+            st.text_area("Summary", prior["output"], height=150)
+
+        if generate:
             prompt = (
                 f"Write a 3-sentence resume summary for {full_name}, targeting a role in "
                 f"{career_goal}. Use this experience: {experience}. Highlight these skills: {skills}."
             )
             try:
-                resp = openai.chat.completions.create(
-                    model="gpt-4",
-                    messages=[{"role": "user", "content": prompt}],
+                resp = routed_completion(
+                    openai,
+                    "summary",
+                    [{"role": "user", "content": prompt}],
+                    username=username,
+                    page="summary",
+                    latency_budget=INTERACTIVE_LATENCY_S,
                 )
                 summary = resp.choices[0].message.content
                 st.success("Generated Summary")
                 st.text_area("Summary", summary, height=150)
-                user_data[username]["summaries"] += 1
-                save_users(user_data)
+                store.increment(username, "summaries")
+                history.record(username, SUMMARY, summary_key, summary, title=f"{career_goal}: {summary}",
+                               model=getattr(resp, "model", None))
+            except QuotaExceeded as e:
+                st.warning(f"You've reached your usage limit. Try again in about {e.retry_after:.0f}s.")
             except Exception as e:
                 st.error("OpenAI call failed (likely no billing/quota yet).")
                 st.caption(f"(Debug: {e})")
@@ -216,23 +267,41 @@ if auth_status:
         st.subheader("📤 Upload Resume")
         uploaded = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
         if uploaded:
-            text = "\n".join([(p.extract_text() or "") for p in PdfReader(uploaded).pages])
+            text = extract_once(uploaded, extract_text_from_upload)
             st.text_area("Resume Text", text, height=250)
+            parsed = segment_resume(text)
+            if parsed.has_sections():
+                st.caption(f"Detected sections: {', '.join(parsed.section_names())}")
             qtype = st.selectbox("Question Type", ["Behavioral", "Technical", "Mixed"])
             qcount = st.slider("Number of Questions", 1, 10, 5)
 
-            if st.button("Generate Interview Questions"):
-                prompt = f"Create {qcount} {qtype} interview questions based on this resume:\n{text}"
+            resume_focus = parsed.relevant_text(QUESTION_SECTIONS)
+            questions_key = input_hash(QUESTIONS, resume_focus, qtype, qcount)
+            prior = history.find(username, QUESTIONS, questions_key)
+            gen_col, reuse_col = st.columns(2)
+            generate = gen_col.button("Generate Interview Questions")
+            if prior and reuse_col.button(f"Reuse questions from {saved_on(prior)}"):
+                st.text_area("Saved Questions", prior["output"], height=250)
+
+            if generate:
+                prompt = f"Create {qcount} {qtype} interview questions based on this resume:\n{resume_focus}"
                 try:
-                    resp = openai.chat.completions.create(
-                        model="gpt-4",
-                        messages=[{"role": "user", "content": prompt}],
+                    resp = routed_completion(
+                        openai,
+                        "questions",
+                        [{"role": "user", "content": prompt}],
+                        username=username,
+                        page="upload_resume",
+                        latency_budget=INTERACTIVE_LATENCY_S,
                     )
                     questions = resp.choices[0].message.content
                     st.text_area("Generated Questions", questions, height=250)
-                    user_data[username]["resumes"] += 1
-                    user_data[username]["questions"] += qcount
-                    save_users(user_data)
+                    store.increment(username, "resumes")
+                    store.increment(username, "questions", qcount)
+                    history.record(username, QUESTIONS, questions_key, questions,
+                                   title=f"{qcount} {qtype}: {questions}", model=getattr(resp, "model", None))
+                except QuotaExceeded as e:
+                    st.warning(f"You've reached your usage limit. Try again in about {e.retry_after:.0f}s.")
                 except Exception as e:
                     st.error("OpenAI call failed (likely no billing/quota yet).")
                     st.caption(f"(Debug: {e})")
@@ -246,47 +315,169 @@ if auth_status:
             jd_file = st.file_uploader(
                 "Upload Job Description (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="jd_up"
             )
-            jd_text = st.text_area("…or paste JD text", value="", height=220, key="jd_text")
-            if jd_file and not jd_text.strip():
-                st.session_state["jd_text"] = extract_text_from_upload(jd_file)
-                st.experimental_rerun()
+            ingest_upload(jd_file, "jd_text", extract_text_from_upload)
+            jd_text = st.text_area("…or paste JD text", height=220, key="jd_text")
 
         with resume_col:
             rs_file = st.file_uploader(
                 "Upload Your Resume (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"], key="rs_up"
             )
-            resume_text = st.text_area("…or paste your resume text", value="", height=220, key="rs_text")
-            if rs_file and not resume_text.strip():
-                st.session_state["rs_text"] = extract_text_from_upload(rs_file)
-                st.experimental_rerun()
+            ingest_upload(rs_file, "rs_text", extract_text_from_upload)
+            resume_text = st.text_area("…or paste your resume text", height=220, key="rs_text")
 
         st.caption("Tip: uploading a file auto-fills the text box; you can still edit it before analysis.")
 
-        if st.button("Analyze Fit"):
-            job_desc = st.session_state.get("jd_text", "") if not jd_text else jd_text
-            resume_input = st.session_state.get("rs_text", "") if not resume_text else resume_text
+        job_desc, resume_input = jd_text.strip(), resume_text.strip()
+        resume_focus = segment_resume(resume_input).relevant_text() if resume_input else ""
+        # Same JD and resume as an earlier analysis: offer it instead of a new GPT call.
+        prior = (history.find(username, FIT_ANALYSIS, input_hash(FIT_ANALYSIS, job_desc, resume_focus))
+                 if job_desc and resume_focus else None)
+        analyze_col, reuse_col = st.columns(2)
+        analyze = analyze_col.button("Analyze Fit")
+        reuse = bool(prior) and reuse_col.button(f"Reuse analysis from {saved_on(prior)}")
+        full_analysis = False
+        if analyze or reuse:
             if not job_desc or not resume_input:
                 st.warning("Please provide both a JD and a resume (upload or paste).")
             else:
+                # Re-keywords only the paragraphs that changed since the last click.
+                st.session_state["fit_state"] = update_fit(st.session_state.get("fit_state"), job_desc, resume_focus)
+                st.session_state["fit_inputs"] = (job_desc, resume_focus)
+                if reuse:
+                    st.session_state["fit_state"].update(analysis=prior["output"], changed=False, explanation="")
+                    st.caption(f"Loaded your saved analysis from {saved_on(prior)} (no GPT call). "
+                               "Use **History** to browse older ones.")
+                # The first analysis goes to GPT in full; later edits are scored
+                # incrementally and can be explained with a much smaller call.
+                full_analysis = not st.session_state["fit_state"]["analysis"]
+
+        fit_state = st.session_state.get("fit_state")
+        if fit_state:
+            fit = fit_state["fit"]
+            st.metric("Keyword Fit Score", f"{fit['fit_score']}%", delta=score_delta(fit_state))
+            st.caption(
+                f"Re-scored {fit_state['recomputed']} of {fit_state['paragraphs']} paragraphs"
+                + (" (no changes since last analysis)." if fit_state["unchanged"] else ".")
+            )
+            have_col, missing_col = st.columns(2)
+            with have_col:
+                st.markdown("**You Have**")
+                st.write(", ".join(fit["matched"]) or "—")
+            with missing_col:
+                st.markdown("**Missing**")
+                st.write(", ".join(fit["missing"]) or "—")
+
+            if fit_state["changed"]:
+                kc = keyword_changes(fit_state)
+                st.info(
+                    f"Edits detected. Newly matched: {', '.join(kc['newly_matched']) or '—'} · "
+                    f"No longer matched: {', '.join(kc['no_longer_matched']) or '—'}"
+                )
+                explain_col, full_col = st.columns(2)
+                if explain_col.button("Explain what changed"):
+                    explanation = llm_text(username, "job_fit", "fit_explain", explain_prompt(fit_state),
+                                           max_tokens=300)
+                    if explanation is not None:
+                        fit_state["explanation"] = explanation
+                if full_col.button("Run full re-analysis"):
+                    full_analysis = True
+                if fit_state.get("explanation"):
+                    st.text_area("What Changed", fit_state["explanation"], height=200)
+
+            if full_analysis:
+                job_desc, resume_focus = st.session_state["fit_inputs"]
+                fit_key = input_hash(FIT_ANALYSIS, job_desc, resume_focus)
                 prompt = (
                     "Analyze how well this resume fits the job description. Identify strengths, clear gaps, "
                     "and 3–5 concrete action steps the candidate should take next. Return a short, scannable output.\n\n"
-                    f"Job Description:\n{job_desc}\n\nResume:\n{resume_input}"
+                    f"Job Description:\n{job_desc}\n\nResume:\n{resume_focus}"
                 )
-                try:
-                    resp = openai.chat.completions.create(
-                        model="gpt-4",
-                        messages=[{"role": "user", "content": prompt}],
-                    )
-                    analysis = resp.choices[0].message.content
-                    st.text_area("Fit Analysis", analysis, height=380)
-                except Exception as e:
-                    st.error("OpenAI call failed (likely no billing/quota yet).")
-                    st.caption(f"(Debug: {e})")
+                analysis = llm_text(username, "job_fit", "fit_analysis", prompt)
+                if analysis is not None:
+                    fit_state.update(analysis=analysis, changed=False, explanation="")
+                    history.record(username, FIT_ANALYSIS, fit_key, analysis, title=f"{fit['fit_score']}% fit: {analysis}")
+            if fit_state["analysis"]:
+                st.text_area("Fit Analysis", fit_state["analysis"], height=380)
+
+            with st.expander("🔔 Alert me about new jobs that fit this resume"):
+                watched = feed.resume(username)
+                threshold = st.slider("Minimum keyword fit %", 0, 100,
+                                      int(watched["threshold"] if watched else JOB_ALERT_THRESHOLD))
+                if st.button("Watch the job feed with this resume"):
+                    keys = feed.save_resume(username, st.session_state["fit_inputs"][1], threshold)
+                    st.success(f"Watching with {len(keys)} resume keywords. Matches appear under **Job Alerts**.")
+
+    # --- PAGE: Job Alerts ---
+    elif page == "Job Alerts":
+        st.subheader("🔔 Job Alerts")
+        watched = feed.resume(username)
+        if not watched:
+            st.info("No resume is being watched. On **Job Fit & Salary**, analyze your resume and choose "
+                    "**Watch the job feed with this resume**.")
+        else:
+            st.caption(f"Watching for postings with at least {watched['threshold']:g}% keyword fit "
+                       f"({len(watched['keywords'])} resume keywords).")
+            unseen_only = st.checkbox("New only", value=True)
+            alerts = feed.matches(username, unseen_only=unseen_only)
+            if alerts:
+                st.dataframe(pd.DataFrame([{
+                    "Job": a["title"], "File": a["name"], "Fit %": a["fit_score"],
+                    "Missing": ", ".join(a["missing"]) or "—",
+                    "Found": datetime.fromtimestamp(a["created_at"]).strftime("%Y-%m-%d %H:%M"),
+                    "New": not a["seen"],
+                } for a in alerts]), use_container_width=True, hide_index=True)
+                st.button("Mark all as seen", on_click=feed.mark_seen, args=(username,))
+            else:
+                st.info("No matching postings yet.")
+            st.button("Stop watching", on_click=feed.remove_resume, args=(username,))
+
+        stats = feed.stats()
+        if stats:
+            age = time.time() - stats["heartbeat"]
+            st.caption(
+                f"Feed ({stats['watch']}, {stats['directory']}): {stats['jobs']} postings indexed, "
+                f"backlog {stats['backlog']}, ingest latency p50 {stats['latency_p50_s']}s / "
+                f"p95 {stats['latency_p95_s']}s, {stats['errors']} errors; last pass {age:.0f}s ago."
+            )
+            for name, reason in (stats.get("failed") or {}).items():
+                st.caption(f"Skipped until changed: {name} ({reason})")
+        else:
+            st.caption("The job feed daemon has not run yet (`python job_feed.py`).")
 
     # --- PAGE: Prompt Lab ---
     elif page == "Prompt Lab":
-        prompt_lab_ui()
+        prompt_lab_ui(username)
+
+    # --- PAGE: History ---
+    elif page == "History":
+        st.subheader("🗂️ Analysis History")
+        kinds = {"All": None, "Summaries": SUMMARY, "Interview questions": QUESTIONS, "Fit analyses": FIT_ANALYSIS}
+        kind = kinds[st.selectbox("Show", list(kinds))]
+        # Rows are fetched a page at a time (metadata only) and kept in the session;
+        # an output is loaded when it is opened.
+        if st.session_state.get("history_view") != (username, kind):
+            st.session_state.update(history_view=(username, kind), history_rows=[], history_done=False)
+        rows = st.session_state["history_rows"]
+        if not st.session_state["history_done"] and (not rows or st.button("Load more")):
+            batch = history.page(username, kind, before=cursor(rows[-1]) if rows else None)
+            rows.extend(batch)
+            st.session_state["history_done"] = len(batch) < HISTORY_PAGE_SIZE
+
+        if not rows:
+            st.info("Nothing saved yet. Summaries, interview questions and fit analyses appear here.")
+        else:
+            table = pd.DataFrame(rows)
+            table["created_at"] = table["created_at"].map(lambda t: saved_on({"created_at": t}))
+            st.dataframe(table[["created_at", "kind", "title", "model"]], use_container_width=True, hide_index=True)
+            st.caption(f"Showing {len(rows)} of {history.count(username, kind)} saved results.")
+            by_id = {r["id"]: r for r in rows}
+            picked = st.selectbox(
+                "Open", list(by_id), format_func=lambda i: f"{saved_on(by_id[i])} · {by_id[i]['kind']} · {by_id[i]['title']}"
+            )
+            record = history.get(username, picked)
+            if record:
+                st.text_area("Saved Output", record["output"], height=300)
+                st.download_button("Download", record["output"], file_name=f"{record['kind']}_{record['id']}.txt")
 
     # --- PAGE: Admin Dashboard ---
     elif page == "Admin Dashboard":
@@ -295,7 +486,7 @@ if auth_status:
         # keep only real users (dicts with counters)
         real_users = {
             u: d
-            for u, d in user_data.items()
+            for u, d in store.all().items()
             if isinstance(d, dict) and any(k in d for k in ["summaries", "resumes", "questions", "gap_analyses"])
         }
         df = pd.DataFrame.from_dict(real_users, orient="index")
@@ -327,6 +518,36 @@ if auth_status:
             except Exception as e:
                 st.info(f"Chart unavailable: {e}")
 
+        stats = upload_stats()
+        st.caption(
+            f"This session: {stats['script_runs']} script runs, {stats['uploads']} uploads ingested, "
+            f"{stats['extractions']} extractions."
+        )
+        llm = llm_metrics()
+        st.caption(
+            f"LLM (this process): {llm['requests']} requests, {llm['upstream_calls']} upstream calls, "
+            f"{llm['coalesced']} coalesced, {llm['errors']} errors, {llm['throttled']} throttled."
+        )
+
+        st.markdown("#### Models")
+        models = model_stats()
+        if models:
+            st.dataframe(pd.DataFrame(models).set_index("model"), use_container_width=True)
+        else:
+            st.info("No model calls recorded in this process yet.")
+
+        st.markdown("#### LLM Quotas")
+        limiter, sched = get_limiter(), get_scheduler().stats()
+        st.caption(
+            f"Per user: {limiter.requests_per_min:g} requests/min, {limiter.tokens_per_min:,.0f} tokens/min. "
+            f"Upstream slots (this process): {sched['in_use']}/{sched['slots']} in use, {sched['waiting']} waiting."
+        )
+        quotas = limiter.snapshot()
+        if quotas:
+            st.dataframe(pd.DataFrame(quotas).set_index("username"), use_container_width=True)
+        else:
+            st.info("No LLM usage recorded yet.")
+
     # --- PAGE: Register User ---
     elif page == "Register User":
         st.subheader("Register New User")
@@ -336,19 +557,17 @@ if auth_status:
         if st.button("Register"):
             if not new_user or not new_pass:
                 st.error("Username and password are required.")
-            elif user_exists(new_user):
-                st.error("User already exists.")
-            else:
-                user_data[new_user] = {
-                    "name": new_name or new_user,
-                    "password": new_pass,
-                    "summaries": 0,
-                    "resumes": 0,
-                    "questions": 0,
-                    "meta": {"reset_token": "", "reset_issued_at": ""},
-                }
-                save_users(user_data)
+            elif store.register(new_user, {
+                "name": new_name or new_user,
+                "password": new_pass,
+                "summaries": 0,
+                "resumes": 0,
+                "questions": 0,
+                "meta": {"reset_token": "", "reset_issued_at": ""},
+            }):
                 st.success("User registered.")
+            else:
+                st.error("User already exists.")
 
     # --- PAGE: Change Password ---
     elif page == "Change Password":
@@ -404,7 +623,7 @@ if auth_status:
     # --- PAGE: About ---
     elif page == "About":
         st.subheader("About ResumeReadyPro")
-        st.image("assets/ceo.jpg", width=200)
+        st.image(thumbnail("assets/ceo.jpg", 200), width=200)
         st.markdown(
             """
 **ResumeReadyPro** is a professional résumé optimization and job readiness platform built for modern job seekers.
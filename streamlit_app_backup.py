@@ -13,22 +13,28 @@
 # Toggle GPT on by setting USE_GPT=True and providing OPENAI_API_KEY in your env.
 # This file runs fully offline by default.
 
-import os, json, re, io, hashlib
+import os, json, io, hashlib, itertools
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
 import streamlit as st
 
+import api_client
+from analysis import analyze_fit, fit_report, questions_offline, summary_offline
+from dedup import get_index
+from exports import FORMATS, export
+from extractors import UploadRejected, extract_text
+from question_batch import generate_questions_batch
+from quota import QuotaExceeded
+from ranking import MAX_JOBS, narrative_prompt, rank_jobs, skipped_jobs
+from router import INTERACTIVE_LATENCY_S, model_stats, routed_completion
+from salary_analytics import get_salary_log
+
 # Optional deps (gracefully degrade)
 try:
     import pandas as pd
 except Exception:
     pd = None
 
-try:
-    from PyPDF2 import PdfReader
-except Exception:
-    PdfReader = None
-
 try:
     from docx import Document as DocxDocument  # python-docx
 except Exception:
@@ -46,15 +52,16 @@ try:
 except Exception:
     plt = None
 
-# GPT toggle
-USE_GPT = False
-OPENAI_MODEL = "gpt-4o-mini"  # change later if desired
+# GPT toggle (USE_GPT=1 in the env also turns it on, e.g. against the local stub_server.py)
+USE_GPT = os.getenv("USE_GPT", "").lower() in ("1", "true", "yes")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None  # e.g. http://localhost:8089/v1
+RANK_JD_DIR = os.getenv("RANK_JD_DIR") or None  # server folder the Rank page may read saved JDs from
 try:
     import openai
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     if USE_GPT and OPENAI_API_KEY:
         from openai import OpenAI
-        client = OpenAI(api_key=OPENAI_API_KEY)  # type: ignore
+        client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)  # type: ignore
     else:
         client = None
 except Exception:
@@ -177,92 +184,23 @@ Here’s how to get value fast:
         if st.button("Got it — hide this"):
             st.session_state.onboarded = True
 
-# ---------------- Common text utilities ----------------
-TECH_KEYWORDS = {
-    "python","r","sql","excel","tableau","power bi","pandas","numpy","sklearn","scikit-learn",
-    "tensorflow","pytorch","spark","hadoop","airflow","dbt","git","github","docker","kubernetes",
-    "aws","azure","gcp","bigquery","snowflake","databricks","redshift","postgres","mysql","graphql",
-    "rest","fastapi","flask","django","react","typescript","javascript","bash","linux","terraform",
-    "ansible","mlops","nlp","llm","security","nist","rmf","fedramp","stigs","clearance"
-}
-SOFT_SKILLS = {
-    "leadership","communication","collaboration","mentoring","stakeholder","ownership",
-    "problem solving","critical thinking","presentation","planning","prioritization"
-}
-
-def normalize(text:str) -> str:
-    return re.sub(r"\s+"," ", (text or "").lower()).strip()
-
-def extract_keywords(text:str) -> List[str]:
-    t = normalize(text)
-    found = set()
-    for kw in TECH_KEYWORDS.union(SOFT_SKILLS):
-        if kw in t:
-            found.add(kw)
-    return sorted(found)
-
-# ---------------- Salary helpers ----------------
-SALARY_BANDS = {
-    "data analyst": (65000, 85000, 110000),
-    "data scientist": (100000, 135000, 175000),
-    "ml engineer": (120000, 160000, 210000),
-    "software engineer": (100000, 140000, 190000),
-    "devops engineer": (110000, 145000, 185000),
-    "cloud engineer": (115000, 150000, 200000),
-    "product manager": (110000, 145000, 190000),
-    "it project manager": (95000, 120000, 150000),
-    "security engineer": (115000, 155000, 210000),
-    "solutions architect": (125000, 165000, 220000),
-}
-LOCATION_MULTIPLIER = {"remote": 1.0, "low-cost": 0.9, "standard": 1.0, "high-cost": 1.15}
-
-def estimate_salary_band(role: str, location_level: str = "standard"):
-    role_key = (role or "").strip().lower()
-    base = SALARY_BANDS.get(role_key)
-    mult = LOCATION_MULTIPLIER.get(location_level or "standard", 1.0)
-    if not base: return None
-    lo, mid, hi = base
-    return (int(lo*mult), int(mid*mult), int(hi*mult))
-
-def compare_salary(expected: int, band: tuple[int,int,int]) -> dict:
-    lo, mid, hi = band
-    if expected < lo:
-        status = "Below Market"
-        note = f"Your expectation (${expected:,}) is **below** market (${lo:,}–${hi:,}). Consider asking closer to mid."
-    elif expected > hi:
-        status = "Above Market"
-        note = f"Your expectation (${expected:,}) is **above** market (${lo:,}–${hi:,}). Consider moderating by 10–20% or justify scope/impact."
-    else:
-        status = "Within Market"
-        note = f"Your expectation (${expected:,}) is **within** market (${lo:,}–${hi:,})."
-    return {"status": status, "note": note, "band_low": lo, "band_mid": mid, "band_high": hi}
+# ---------------- API or in-process ----------------
+def api_or_local(call_api, run_local):
+    """``call_api()`` when RESUMEREADY_API_URL is set, else (or if the API fails) ``run_local()``."""
+    if api_client.api_enabled():
+        try:
+            return call_api()
+        except api_client.APIClientError as e:
+            st.caption(f"(API unavailable, running locally: {e})")
+    return run_local()
 
 # ---------------- Extractors ----------------
-def extract_text_pdf(uploaded_file) -> str:
-    if not PdfReader: return ""
+def extract_text_generic(uploaded_file, name: str = "") -> str:
     try:
-        reader = PdfReader(uploaded_file)
-        return "\n".join([(p.extract_text() or "") for p in reader.pages])
-    except Exception:
-        return ""
-
-def extract_text_docx(uploaded_file) -> str:
-    if not DocxDocument: return ""
-    try:
-        doc = DocxDocument(uploaded_file)
-        return "\n".join([p.text for p in doc.paragraphs])
-    except Exception:
-        return ""
-
-def extract_text_generic(uploaded_file) -> str:
-    name = (uploaded_file.name or "").lower()
-    if name.endswith(".pdf"):
-        return extract_text_pdf(uploaded_file)
-    if name.endswith(".docx"):
-        return extract_text_docx(uploaded_file)
-    try:
-        return uploaded_file.read().decode("utf-8", errors="ignore")
-    except Exception:
+        return api_or_local(lambda: api_client.extract_text(uploaded_file, name),
+                            lambda: extract_text(uploaded_file, name))
+    except UploadRejected as e:
+        st.error(f"{name or uploaded_file.name}: {e}")
         return ""
 
 # ---------------- Exports ----------------
@@ -288,51 +226,22 @@ def export_docx(text: str) -> bytes:
     buf.seek(0)
     return buf.read()
 
-# ---------------- Offline generators ----------------
-def summary_offline(full_name:str, role:str, experience:str, skills:str) -> str:
-    exp_kw = extract_keywords(experience)
-    skill_kw = extract_keywords(skills)
-    highlights = list(dict.fromkeys(exp_kw + skill_kw))[:10]
-    bullets = "\n".join([f"- Experience with **{kw}**" for kw in highlights]) if highlights else "- Strong fundamentals and rapid learning"
-    return f"""**{full_name or 'Candidate'}** — {role or 'Target Role'}
-
-Collaborative professional delivering reliable solutions in fast-paced environments, translating requirements into measurable outcomes.
-
-**Highlights**
-{bullets}
-
-**Value**
-- Communicates clearly with technical & non-technical stakeholders
-- Ownership mindset: deliver, measure, iterate
-- Continuous improvement and mentoring culture
-"""
-
-def questions_offline(text:str, qtype:str, count:int) -> List[str]:
-    base = extract_keywords(text) or ["teamwork","problem solving","ownership","python"]
-    out = []
-    for i in range(count):
-        kw = base[i % len(base)]
-        if qtype == "Behavioral":
-            out.append(f"Tell me about a time you demonstrated {kw}. What was the context, actions, and outcome?")
-        elif qtype == "Technical":
-            out.append(f"How would you use {kw} to design or troubleshoot a real-world system? Be specific.")
-        else:
-            if i % 2 == 0:
-                out.append(f"Walk me through a project where {kw} was critical. What design decisions did you make?")
-            else:
-                out.append(f"Describe a challenge involving {kw}. How did you collaborate and ensure delivery?")
-    return out
-
 # ---------------- GPT helpers (only used when USE_GPT=True) ----------------
-def gpt_chat(prompt: str) -> str:
+def gpt_chat(prompt: str, task: str = "default", page: str = None) -> str:
     if not (USE_GPT and client):
         return f"(Offline mock)\n\n{prompt[:300]}\n\n— This would be replaced by GPT output when you enable billing."
     try:
-        resp = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[{"role":"user","content":prompt}]
+        resp = routed_completion(
+            client,
+            task,
+            [{"role":"user","content":prompt}],
+            username=st.session_state.auth.get("user"),
+            page=page,
+            latency_budget=INTERACTIVE_LATENCY_S,
         )
         return resp.choices[0].message.content.strip()
+    except QuotaExceeded as e:
+        return f"(Usage limit reached) Try again in about {e.retry_after:.0f}s."
     except Exception as e:
         return f"(GPT error) {e}"
 
@@ -368,9 +277,11 @@ def page_generate_summary():
     if st.button("Generate Summary"):
         if use_gpt and USE_GPT and client:
             prompt = f"Write a concise, ATS-friendly professional summary for {full_name} targeting {role}. Experience: {experience}. Skills: {skills}. 3-5 bullet highlights."
-            out = gpt_chat(prompt)
+            out = gpt_chat(prompt, "summary", "summary")
         else:
-            out = summary_offline(full_name, role, experience, skills)
+            out = api_or_local(
+                lambda: api_client.summary(full_name=full_name, role=role, experience=experience, skills=skills),
+                lambda: summary_offline(full_name, role, experience, skills))
 
         st.success("Summary generated!")
         st.markdown(out)
@@ -396,11 +307,27 @@ def page_upload_resume():
     use_gpt = st.checkbox("Use GPT (if enabled)", value=False and USE_GPT)
     if st.button("Generate Questions"):
         if use_gpt and USE_GPT and client:
-            prompt = f"Generate {count} {qtype} interview questions tailored to the following resume content:\n{text}"
-            out = gpt_chat(prompt)
-            qs = [x.strip("- ").strip() for x in out.split("\n") if x.strip()][:count]
+            # re-uploads of the same candidate with minor edits reuse that user's earlier GPT questions
+            username = st.session_state.auth.get("user")
+            index = get_index(f"questions:{username}:{qtype}:{count}")
+            hit = index.find_duplicate(text)
+            if hit is not None:
+                qs = index.payload(hit[0])
+                st.caption("Near-duplicate of an earlier upload — reusing its questions.")
+            else:
+                offline = set()
+                try:
+                    out, _ = generate_questions_batch(client, [("resume", text)], qtype, count, username=username,
+                                                      offline_ids=offline)
+                    qs = out["resume"]
+                    if not offline:
+                        index.add(getattr(pdf, "file_id", None) or pdf.name, text, payload=qs)
+                except QuotaExceeded as e:
+                    st.warning(f"Usage limit reached; showing offline questions. Try GPT again in about {e.retry_after:.0f}s.")
+                    qs = questions_offline(text, qtype, count)
         else:
-            qs = questions_offline(text, qtype, count)
+            qs = api_or_local(lambda: api_client.questions(text=text, qtype=qtype, count=count),
+                              lambda: questions_offline(text, qtype, count))
 
         st.success("Questions:")
         for i, q in enumerate(qs, 1):
@@ -414,6 +341,55 @@ def page_upload_resume():
         dl = "\n".join([f"{i}. {q}" for i, q in enumerate(qs, 1)])
         st.download_button("Download Questions (.txt)", dl.encode("utf-8"), file_name="interview_questions.txt")
 
+def page_cohort_questions():
+    st.subheader("👥 Cohort Interview Prep")
+    st.caption("Generate interview questions for many resumes at once.")
+    files = st.file_uploader("Resumes (PDF/DOCX/TXT)", type=["pdf","docx","txt"], accept_multiple_files=True,
+                             key="cohort_files")
+    qtype = st.selectbox("Question Type", ["Behavioral", "Technical", "Mixed"], key="cohort_qtype")
+    count = st.slider("Questions per resume", 1, 10, 5, key="cohort_count")
+    use_gpt = st.checkbox("Use GPT (if enabled)", value=False and USE_GPT, key="cohort_gpt")
+    if not files or not st.button("Generate for All"):
+        return
+
+    names = [f.name for f in files]
+    docs = [(n if names.count(n) == 1 else f"{n} ({k + 1})", extract_text_generic(f))
+            for k, (n, f) in enumerate(zip(names, files))]
+    docs = [(name, text) for name, text in docs if text.strip()]
+    stats = None
+    if use_gpt and USE_GPT and client:
+        try:
+            with st.spinner(f"Generating questions for {len(docs)} resumes…"):
+                results, stats = generate_questions_batch(client, docs, qtype, count,
+                                                          username=st.session_state.auth.get("user"))
+        except QuotaExceeded as e:
+            st.error(f"Usage limit reached. Try again in about {e.retry_after:.0f}s.")
+            return
+    else:
+        results = {name: questions_offline(text, qtype, count) for name, text in docs}
+
+    if stats:
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Round-trips", stats["round_trips"], delta=stats["round_trips"] - stats["baseline_round_trips"],
+                  delta_color="inverse")
+        c2.metric("Tokens (est.)", f"{stats['tokens']:,}", delta=-stats["tokens_saved"], delta_color="inverse")
+        c3.metric("Batch splits / fallbacks", f"{stats['splits']} / {stats['fallbacks']}")
+
+    for name, _ in docs:
+        with st.expander(name):
+            for i, q in enumerate(results[name], 1):
+                st.markdown(f"**{i}.** {q}")
+
+    dl = "\n\n".join(f"{name}\n" + "\n".join(f"{i}. {q}" for i, q in enumerate(results[name], 1)) for name, _ in docs)
+    st.download_button("Download All Questions (.txt)", dl.encode("utf-8"), file_name="cohort_questions.txt")
+    st.download_button("Download All Questions (.json)", json.dumps(results, indent=2).encode("utf-8"),
+                       file_name="cohort_questions.json", mime="application/json")
+
+    DB["metrics"]["resumes"] += len(docs)
+    DB["metrics"]["questions"] += sum(len(q) for q in results.values())
+    save_db(DB)
+    st.session_state.metrics = DB["metrics"]
+
 def page_job_fit_salary():
     st.subheader("🧭 Job Fit & Salary Alignment Analyzer")
     c1, c2 = st.columns(2)
@@ -431,6 +407,8 @@ def page_job_fit_salary():
     st.divider()
     role = st.text_input("Target Role (e.g., Data Scientist)")
     location_level = st.selectbox("Location Cost Tier", ["standard","high-cost","low-cost","remote"])
+    level = st.selectbox("Level", ["(from title)","junior","mid","senior","lead","staff","principal"])
+    level = None if level == "(from title)" else level
     expected_salary = st.number_input("Your Expected Salary (USD, annual)", min_value=30000, max_value=500000, step=1000)
 
     if st.button("Analyze"):
@@ -438,18 +416,21 @@ def page_job_fit_salary():
             st.error("Please provide both a JD and resume (upload or paste).")
             return
 
-        # keyword overlap
-        jd_keys = set(extract_keywords(jd_text))
-        rs_keys = set(extract_keywords(resume_text))
-        matched = sorted(jd_keys & rs_keys)
-        missing = sorted(jd_keys - rs_keys)
-        jd_tech, jd_soft = jd_keys & TECH_KEYWORDS, jd_keys & SOFT_SKILLS
-        rs_tech, rs_soft = rs_keys & TECH_KEYWORDS, rs_keys & SOFT_SKILLS
-        tech_score = (len(rs_tech & jd_tech) / max(1, len(jd_tech))) * 70
-        soft_score = (len(rs_soft & jd_soft) / max(1, len(jd_soft))) * 30
-        fit_score = round(min(100, tech_score + soft_score), 1)
+        kwargs = dict(jd_text=jd_text, resume_text=resume_text, role=role, location_level=location_level,
+                      level=level, expected_salary=int(expected_salary))
+
+        def analyze_locally():
+            local = analyze_fit(**kwargs)
+            get_salary_log().record(local["salary"], int(expected_salary), location_level,  # the API logs its own
+                                    source=st.session_state.auth.get("user") or "")
+            return local
+
+        result = api_or_local(lambda: api_client.analyze_fit(**kwargs), analyze_locally)
+        fit_score, matched, missing = result["fit_score"], result["matched"], result["missing"]
 
         st.success(f"Fit Score: **{fit_score}%**")
+        if result["sections"]:
+            st.caption(f"Resume sections: {', '.join(result['sections'])}")
         colA, colB = st.columns(2)
         with colA:
             st.markdown("**You Have**")
@@ -458,46 +439,20 @@ def page_job_fit_salary():
             st.markdown("**Missing**")
             st.write(", ".join(missing) if missing else "—")
 
-        band = estimate_salary_band(role, location_level)
-        if band:
-            s = compare_salary(int(expected_salary), band)
+        s = result["salary"]
+        if s:
             st.info(f"**Salary Alignment:** {s['status']}")
+            st.caption(f"Matched role: {s['matched_role'].title()} ({s['level']})")
             st.caption(f"Market band: ${s['band_low']:,}–${s['band_high']:,} (mid ${s['band_mid']:,})")
             st.write(s["note"])
         else:
             st.warning("No salary band found for this role yet. Try a common title (e.g., 'Data Scientist').")
 
-        # Recs
-        recs = []
-        if missing:
-            recs.append("Add bullets showing experience with missing items; quantify impact (latency↓, cost↓, throughput↑).")
-            if any(m in {"aws","azure","gcp"} for m in missing):
-                recs.append("Consider an Associate-level cloud cert to boost credibility fast.")
-        if fit_score < 80:
-            recs.append("Tailor the summary to include 3–5 JD keywords you already match.")
-        if band and s["status"] == "Above Market":
-            recs.append("Lower ask by ~10–15% or justify with scope (team size, budget, uptime).")
-        if not recs:
-            recs.append("You're well aligned. Focus on STAR stories for top projects.")
-
         st.markdown("### Recommendations")
-        for r in recs:
+        for r in result["recommendations"]:
             st.markdown(f"- {r}")
 
-        report = (
-            f"ResumeReadyPro — Job Fit & Salary Alignment Report\n"
-            f"Generated: {datetime.utcnow().isoformat()}Z\n\n"
-            f"Role: {role or '(unspecified)'}  |  Location: {location_level}\n"
-            f"Expected salary: ${int(expected_salary):,}\n"
-            f"Fit Score: {fit_score}%\n\n"
-            f"JD Keywords: {', '.join(sorted(jd_keys)) or '—'}\n"
-            f"Resume Keywords: {', '.join(sorted(rs_keys)) or '—'}\n"
-            f"Matched: {', '.join(matched) or '—'}\n"
-            f"Missing: {', '.join(missing) or '—'}\n\n"
-            + (f"Market Band: ${s['band_low']:,}–${s['band_high']:,} (mid ${s['band_mid']:,})\n"
-               f"Salary Alignment: {s['status']}\n{s['note']}\n\n" if band else "")
-            + "Recommendations:\n" + "\n".join([f"- {x}" for x in recs])
-        )
+        report = fit_report(result, role, location_level, int(expected_salary))
 
         st.download_button("⬇️ Download Report (.txt)", report.encode("utf-8"),
                            file_name="job_fit_salary_report.txt", mime="text/plain")
@@ -511,25 +466,135 @@ def page_job_fit_salary():
         save_db(DB)
         st.session_state.metrics = DB["metrics"]
 
+def page_rank_jobs():
+    st.subheader("🏆 Rank Saved Job Postings")
+    st.caption("Score one resume against many JDs at once; the resume is parsed a single time.")
+    resume_file = st.file_uploader("Your Resume (PDF/DOCX/TXT)", type=["pdf","docx","txt"], key="rank_resume")
+    resume_text = st.text_area("…or paste resume text", height=160, key="rank_resume_text")
+    if resume_file and not resume_text.strip():
+        resume_text = extract_text_generic(resume_file)
+
+    jd_files = st.file_uploader("Job Descriptions (PDF/DOCX/TXT)", type=["pdf","docx","txt"],
+                                accept_multiple_files=True, key="rank_jds")
+    jd_folder = st.text_input(f"…or a subfolder of {RANK_JD_DIR}") if RANK_JD_DIR else ""
+    jd_pasted = st.text_area("…or paste JDs separated by a line containing only ---", height=120)
+
+    location_level = st.selectbox("Location Cost Tier", ["standard","high-cost","low-cost","remote"], key="rank_loc")
+    expected_salary = st.number_input("Your Expected Salary (USD, annual)", min_value=30000, max_value=500000,
+                                      step=1000, key="rank_salary")
+    target_role = st.text_input("Target role for salary bands (optional; defaults to each JD's title)",
+                                key="rank_role")
+    collapse = st.checkbox("Collapse near-duplicate postings", value=True)
+    top_n = st.slider("GPT narratives for the top N", 0, 10, 3) if USE_GPT and client else 0
+
+    if not st.button("Rank Jobs"):
+        return
+    jobs = [{"name": f.name, "text": extract_text_generic(f)} for f in jd_files or []]
+    if jd_folder.strip():
+        base = os.path.realpath(RANK_JD_DIR)
+        folder = os.path.realpath(os.path.join(base, jd_folder.strip()))
+        if os.path.commonpath([base, folder]) != base:
+            st.warning(f"Only folders inside {RANK_JD_DIR} can be read.")
+        elif os.path.isdir(folder):
+            for name in sorted(os.listdir(folder)):
+                path = os.path.join(folder, name)
+                if name.lower().endswith((".pdf", ".docx", ".txt")) and os.path.realpath(path).startswith(base + os.sep):
+                    with open(path, "rb") as fh:
+                        jobs.append({"name": name, "text": extract_text_generic(io.BytesIO(fh.read()), name)})
+        else:
+            st.warning(f"Folder not found: {jd_folder}")
+    jobs += [{"text": t.strip()} for t in jd_pasted.split("\n---\n") if t.strip()]
+    jobs = [dict(j, role=target_role.strip()) if target_role.strip() else j for j in jobs if j["text"].strip()]
+    if not resume_text.strip() or not jobs:
+        st.error("Please provide a resume and at least one JD.")
+        return
+
+    rows = rank_jobs(resume_text, jobs, location_level, expected_salary=int(expected_salary),
+                     collapse_duplicates=collapse)
+    skipped = skipped_jobs(len(jobs), rows)
+    if skipped:
+        st.warning(f"Only the first {MAX_JOBS} postings were ranked; {skipped} more were left out (RANK_MAX_JOBS).")
+    table = [{"Rank": r["rank"], "Job": r["name"], "Fit %": r["fit_score"],
+              "Missing": ", ".join(r["missing"]) or "—", "Salary": r["salary_status"] or "no band",
+              "Δ vs mid %": r["delta_pct"], "Reposts": ", ".join(r.get("duplicates", []))} for r in rows]
+    if pd is not None:
+        df = pd.DataFrame(table)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.download_button("⬇️ Download Ranking (.csv)", df.to_csv(index=False).encode("utf-8"),
+                           file_name="job_ranking.csv", mime="text/csv")
+    else:
+        st.table(table)
+
+    for r in rows[:top_n]:
+        with st.expander(f"#{r['rank']} {r['name']} — {r['fit_score']}%"):
+            st.markdown(gpt_chat(narrative_prompt(resume_text, r, jobs[r["index"]]["text"]), "fit_narrative", "rank_jobs"))
+
+    DB["metrics"]["gap_analyses"] += len(rows)
+    save_db(DB)
+    st.session_state.metrics = DB["metrics"]
+
+# ---------------- Admin exports ----------------
+ADMIN_PREVIEW_ROWS = 200
+
+def _db_version():
+    """Changes whenever save_db rewrites the users/metrics file."""
+    try:
+        info = os.stat(USERS_DB)
+        return info.st_mtime_ns, info.st_size
+    except OSError:
+        return None
+
+def _user_rows():
+    for u, info in DB.get("users", {}).items():
+        yield {"username": u, "name": info.get("name"), "created": info.get("created")}
+
+def _metric_rows():
+    for metric, value in DB.get("metrics", {}).items():
+        yield {"metric": metric, "value": value}
+
+# dataset -> (row generator, column types)
+EXPORTS = {
+    "users": (_user_rows, {"username": "str", "name": "str", "created": "str"}),
+    "metrics": (_metric_rows, {"metric": "str", "value": "int"}),
+}
+
 def page_admin():
     st.subheader("📊 Admin Dashboard")
     metrics = DB.get("metrics", {})
     st.write("**Totals**")
     st.json(metrics)
+    st.download_button("Download metrics.json", json.dumps(metrics, indent=2).encode("utf-8"), file_name="metrics.json")
 
     users = DB.get("users", {})
     if users and pd is not None:
-        df = pd.DataFrame([{"username": u, "name": info.get("name"), "created": info.get("created")} for u, info in users.items()])
-        st.dataframe(df, use_container_width=True)
-        csv = df.to_csv(index=False).encode("utf-8")
-    else:
-        df, csv = None, b""
-
-    c1, c2 = st.columns(2)
-    with c1:
-        st.download_button("Download metrics.json", json.dumps(metrics, indent=2).encode("utf-8"), file_name="metrics.json")
-    with c2:
-        st.download_button("Download users.csv", csv, file_name="users.csv")
+        preview = list(itertools.islice(_user_rows(), ADMIN_PREVIEW_ROWS))
+        st.dataframe(pd.DataFrame(preview), use_container_width=True)
+        if len(users) > ADMIN_PREVIEW_ROWS:
+            st.caption(f"Showing {ADMIN_PREVIEW_ROWS} of {len(users)} users; export for the full list.")
+
+    st.markdown("### Export")
+    c1, c2, c3 = st.columns(3)
+    dataset = c1.selectbox("Data", list(EXPORTS))
+    fmt = c2.selectbox("Format", list(FORMATS))
+    c3.write("")
+    # Built only on request, a chunk at a time, and reused until the data file changes.
+    if c3.button("Prepare export"):
+        rows, fields = EXPORTS[dataset]
+        mime, ext = FORMATS[fmt]
+        st.session_state.export = {"path": export(dataset, fmt, rows, fields, _db_version()),
+                                   "file_name": dataset + ext, "mime": mime}
+    ready = st.session_state.get("export")
+    if ready and os.path.exists(ready["path"]):
+        with open(ready["path"], "rb") as fh:
+            st.download_button(f"Download {ready['file_name']}", fh, file_name=ready["file_name"], mime=ready["mime"])
+
+    if pd is not None:
+        _salary_dashboard()
+
+    models = model_stats()
+    if models:
+        st.markdown("### Models")
+        st.dataframe(pd.DataFrame(models).set_index("model") if pd is not None else models, use_container_width=True)
 
     if pd is not None and plt is not None and users:
         st.markdown("### Usage Chart")
@@ -539,6 +604,32 @@ def page_admin():
         ax.set_title("ResumeReadyPro Usage Metrics")
         st.pyplot(fig)
 
+def _salary_dashboard():
+    st.markdown("### Salary Alignment")
+    log = get_salary_log()
+    dims = log.dimensions()
+    if not dims["role"]:
+        st.info("No salary comparisons recorded yet.")
+        return
+    c1, c2 = st.columns(2)
+    role = c1.selectbox("Role", ["All roles"] + dims["role"], key="salary_dash_role")
+    location = c2.selectbox("Location tier", ["All tiers"] + dims["location"], key="salary_dash_location")
+    agg = log.dashboard(None if role == "All roles" else role, None if location == "All tiers" else location)
+    o = agg["overview"]
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Analyses", f"{o['analyses']:,}")
+    m2.metric("Below market", f"{o['below']:.0%}")
+    m3.metric("Above market", f"{o['above']:.0%}")
+    m4.metric("Median vs. band mid", "—" if o["median_delta_pct"] is None else f"{o['median_delta_pct']:+.1f}%")
+    if not o["analyses"]:
+        return
+    st.caption("Expected salary vs. band midpoint (%, clipped to ±50)")
+    st.bar_chart(agg["distribution"])
+    st.caption("Share below / above market by role and location tier")
+    st.dataframe(agg["segments"].head(500), use_container_width=True)
+    st.caption("Weekly share below / above market")
+    st.line_chart(agg["trend"][["below", "above"]])
+
 def page_register():
     st.subheader("👤 Register New User")
     u = st.text_input("Username (lowercase)")
@@ -597,7 +688,9 @@ def nav():
     return st.sidebar.radio("Go to", [
         "Generate Summary",
         "Upload Resume",
+        "Cohort Interview Prep",
         "Job Fit & Salary Alignment",
+        "Rank Saved Jobs",
         "Admin Dashboard",
         "Register User",
         "Change Password",
@@ -630,8 +723,12 @@ def main():
         page_generate_summary()
     elif page == "Upload Resume":
         page_upload_resume()
+    elif page == "Cohort Interview Prep":
+        page_cohort_questions()
     elif page == "Job Fit & Salary Alignment":
         page_job_fit_salary()
+    elif page == "Rank Saved Jobs":
+        page_rank_jobs()
     elif page == "Admin Dashboard":
         page_admin()
     elif page == "Register User":
@@ -0,0 +1,301 @@
+# stub_server.py
+# OpenAI-compatible chat-completions stub for offline development and load tests.
+#
+# Point the app at it with OPENAI_BASE_URL=http://localhost:8089/v1 (any
+# OPENAI_API_KEY value works) and the real client code path runs end to end:
+# streaming (SSE), usage accounting, retries, rate-limit fallbacks, quotas.
+#
+#   python stub_server.py                                  # synthetic replies
+#   python stub_server.py --latency lognormal:0,0.5 --error-429 0.05 --error-5xx 0.01
+#   python stub_server.py --mode record --cassettes cassettes   # proxy upstream, save replies
+#   python stub_server.py --mode replay --cassettes cassettes   # serve saved replies
+#
+# Replies are keyed by a hash of the request (model, messages and sampling
+# parameters; not stream flags). In replay mode a miss falls back to a
+# synthetic reply unless --strict is given (then 404). Synthetic replies honour
+# max_tokens and produce schema-valid JSON for json_schema response formats
+# used by the app (batched interview questions).
+#
+# Latency distributions: fixed:S, uniform:LO,HI, normal:MEAN,SD,
+# lognormal:MU,SIGMA (seconds). --token-delay adds per-chunk delay when
+# streaming. Injected errors: 429 (with Retry-After), 500/502/503, and
+# timeouts (the request hangs for --timeout-hang seconds, then the connection
+# is closed without a response).
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+KEY_FIELDS = ("model", "messages", "temperature", "top_p", "max_tokens", "n", "response_format", "tools", "seed")
+STUB_MODELS = ("gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo", "gpt-4-turbo", "gpt-4")
+_WORDS = ("Led", "delivered", "cross-functional", "initiatives", "improving", "reliability", "and", "reducing",
+          "costs", "through", "automation", "data-driven", "decisions", "stakeholder", "alignment", "measurable",
+          "impact", "scalable", "platforms", "mentoring", "engineers")
+
+
+def request_hash(body: Dict) -> str:
+    picked = {k: body.get(k) for k in KEY_FIELDS if body.get(k) is not None}
+    blob = json.dumps(picked, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def parse_latency(spec: str):
+    """Sampler for 'fixed:S', 'uniform:LO,HI', 'normal:MEAN,SD' or 'lognormal:MU,SIGMA' (seconds, >= 0)."""
+    kind, _, args = (spec or "fixed:0").partition(":")
+    vals = [float(x) for x in args.split(",") if x.strip()] or [0.0]
+    samplers = {
+        "fixed": lambda: vals[0],
+        "uniform": lambda: random.uniform(vals[0], vals[1]),
+        "normal": lambda: random.gauss(vals[0], vals[1]),
+        "lognormal": lambda: random.lognormvariate(vals[0], vals[1]),
+    }
+    if kind not in samplers:
+        raise ValueError(f"unknown latency distribution {kind!r}")
+    return lambda: max(0.0, samplers[kind]())
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def synthetic_content(body: Dict) -> str:
+    """Plausible reply text; schema-valid JSON for the app's json_schema response formats."""
+    messages = body.get("messages") or []
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+    max_tokens = int(body.get("max_tokens") or 300)
+    fmt = body.get("response_format") or {}
+    rnd = random.Random(request_hash(body))
+    if fmt.get("type") == "json_schema" and fmt.get("json_schema", {}).get("name") == "interview_questions":
+        count = int((re.search(r"exactly (\d+)", prompt) or [0, 5])[1])
+        ids = re.findall(r'<resume id="([^"]+)">', prompt) or ["resume"]
+        return json.dumps({"results": [
+            {"id": i, "questions": [f"Question {k + 1} for {i}: describe a time you {rnd.choice(_WORDS).lower()} "
+                                    f"{rnd.choice(_WORDS).lower()}." for k in range(count)]} for i in ids]})
+    if fmt.get("type") in ("json_object", "json_schema"):
+        return json.dumps({"result": "stub"})
+    n_words = max(5, min(max_tokens * 3 // 4, 40 + len(prompt) // 40))
+    return " ".join(rnd.choice(_WORDS) for _ in range(n_words)) + "."
+
+
+def completion_body(body: Dict, content: str) -> Dict:
+    prompt_tokens = _count_tokens(json.dumps(body.get("messages") or []))
+    completion_tokens = _count_tokens(content)
+    return {
+        "id": f"chatcmpl-stub-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model") or "gpt-4o-mini",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+class StubConfig:
+    def __init__(self, mode="synthetic", latency="fixed:0", token_delay=0.0, error_429=0.0, error_5xx=0.0,
+                 error_timeout=0.0, timeout_hang=30.0, cassettes="cassettes", strict=False,
+                 upstream="https://api.openai.com/v1", upstream_key=""):
+        self.mode = mode
+        self.latency = parse_latency(latency)
+        self.token_delay = token_delay
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.error_timeout = error_timeout
+        self.timeout_hang = timeout_hang
+        self.cassettes = cassettes
+        self.strict = strict
+        self.upstream = upstream.rstrip("/")
+        self.upstream_key = upstream_key
+        self.stats = {"requests": 0, "streamed": 0, "recorded": 0, "replayed": 0, "synthetic": 0,
+                      "errors_429": 0, "errors_5xx": 0, "timeouts": 0}
+        self.lock = threading.Lock()
+
+    def bump(self, name: str):
+        with self.lock:
+            self.stats[name] += 1
+
+    def cassette_path(self, key: str) -> str:
+        return os.path.join(self.cassettes, f"{key}.json")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    config: StubConfig = None  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):  # keep load tests quiet
+        pass
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, kind: str, headers: Optional[Dict] = None):
+        self._send_json(status, {"error": {"message": message, "type": kind, "code": None}}, headers)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": m, "object": "model", "owned_by": "stub"}
+                                                             for m in STUB_MODELS]})
+        elif self.path.rstrip("/").endswith("/stats"):
+            with self.config.lock:
+                self._send_json(200, dict(self.config.stats))
+        else:
+            self._error(404, f"No route for GET {self.path}", "invalid_request_error")
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._error(404, f"No route for POST {self.path}", "invalid_request_error")
+            return
+        cfg = self.config
+        cfg.bump("requests")
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        except ValueError:
+            self._error(400, "Request body is not valid JSON.", "invalid_request_error")
+            return
+
+        roll = random.random()
+        if roll < cfg.error_timeout:
+            cfg.bump("timeouts")
+            time.sleep(cfg.timeout_hang)
+            self.close_connection = True
+            return
+        roll -= cfg.error_timeout
+        if roll < cfg.error_429:
+            cfg.bump("errors_429")
+            self._error(429, "Rate limit reached (stub).", "rate_limit_error", {"Retry-After": "1"})
+            return
+        roll -= cfg.error_429
+        if roll < cfg.error_5xx:
+            cfg.bump("errors_5xx")
+            self._error(random.choice((500, 502, 503)), "Upstream error (stub).", "server_error")
+            return
+
+        time.sleep(cfg.latency())
+        reply = self._reply(body)
+        if reply is None:
+            return
+        if body.get("stream"):
+            cfg.bump("streamed")
+            self._stream(body, reply)
+        else:
+            self._send_json(200, reply)
+
+    def _reply(self, body: Dict) -> Optional[Dict]:
+        cfg = self.config
+        key = request_hash(body)
+        path = cfg.cassette_path(key)
+        if cfg.mode in ("replay", "record") and os.path.exists(path):
+            cfg.bump("replayed")
+            with open(path, encoding="utf-8") as fh:
+                return json.load(fh)
+        if cfg.mode == "record":
+            try:
+                reply = self._forward(body)
+            except Exception as e:
+                self._error(502, f"Upstream request failed: {e}", "server_error")
+                return None
+            os.makedirs(cfg.cassettes, exist_ok=True)
+            tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(reply, fh)
+            os.replace(tmp, path)
+            cfg.bump("recorded")
+            return reply
+        if cfg.mode == "replay" and cfg.strict:
+            self._error(404, f"No recorded response for request {key[:12]}.", "invalid_request_error")
+            return None
+        cfg.bump("synthetic")
+        return completion_body(body, synthetic_content(body))
+
+    def _forward(self, body: Dict) -> Dict:
+        cfg = self.config
+        upstream = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+        req = urllib.request.Request(f"{cfg.upstream}/chat/completions", data=json.dumps(upstream).encode("utf-8"),
+                                     headers={"Content-Type": "application/json",
+                                              "Authorization": f"Bearer {cfg.upstream_key}"})
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            return json.loads(resp.read())
+
+    def _stream(self, body: Dict, reply: Dict):
+        content = reply["choices"][0]["message"].get("content") or ""
+        base = {"id": reply.get("id"), "object": "chat.completion.chunk", "created": reply.get("created"),
+                "model": reply.get("model")}
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def emit(payload):
+            self.wfile.write(b"data: " + json.dumps(payload).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+
+        emit(dict(base, choices=[{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]))
+        for piece in re.findall(r"\S+\s*", content) or [content]:
+            if self.config.token_delay:
+                time.sleep(self.config.token_delay)
+            emit(dict(base, choices=[{"index": 0, "delta": {"content": piece}, "finish_reason": None}]))
+        emit(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            emit(dict(base, choices=[], usage=reply.get("usage")))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def make_server(config: StubConfig, host: str = "127.0.0.1", port: int = 8089) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    env = os.getenv
+    ap = argparse.ArgumentParser(description="OpenAI-compatible chat-completions stub.")
+    ap.add_argument("--host", default=env("STUB_HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=int(env("STUB_PORT", "8089")))
+    ap.add_argument("--mode", choices=("synthetic", "record", "replay"), default=env("STUB_MODE", "synthetic"))
+    ap.add_argument("--latency", default=env("STUB_LATENCY", "fixed:0.2"), help="e.g. lognormal:0,0.5")
+    ap.add_argument("--token-delay", type=float, default=float(env("STUB_TOKEN_DELAY", "0.01")))
+    ap.add_argument("--error-429", type=float, default=float(env("STUB_ERROR_429", "0")))
+    ap.add_argument("--error-5xx", type=float, default=float(env("STUB_ERROR_5XX", "0")))
+    ap.add_argument("--error-timeout", type=float, default=float(env("STUB_ERROR_TIMEOUT", "0")))
+    ap.add_argument("--timeout-hang", type=float, default=float(env("STUB_TIMEOUT_HANG", "30")))
+    ap.add_argument("--cassettes", default=env("STUB_CASSETTES", "cassettes"))
+    ap.add_argument("--strict", action="store_true", help="replay misses return 404 instead of synthetic replies")
+    ap.add_argument("--upstream", default=env("STUB_UPSTREAM", "https://api.openai.com/v1"))
+    args = ap.parse_args(argv)
+
+    config = StubConfig(args.mode, args.latency, args.token_delay, args.error_429, args.error_5xx,
+                        args.error_timeout, args.timeout_hang, args.cassettes, args.strict, args.upstream,
+                        env("STUB_UPSTREAM_KEY") or env("OPENAI_API_KEY", ""))
+    server = make_server(config, args.host, args.port)
+    print(f"OpenAI stub ({args.mode}) on http://{args.host}:{args.port}/v1 — set OPENAI_BASE_URL to this")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
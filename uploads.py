@@ -0,0 +1,82 @@
+# uploads.py
+# Upload pipeline: extract each uploaded file exactly once per session.
+#
+# Files are tracked by Streamlit's per-upload ``file_id`` and by a content hash,
+# so reruns, re-renders and re-uploads of the same bytes never re-extract.
+# ``ingest_upload`` seeds a text widget's session-state value *before* the
+# widget is drawn, which fills the box in the same script run as the upload
+# (no st.experimental_rerun, so one script execution per upload instead of two).
+#
+# Size limits are checked before the upload is hashed or parsed; a rejected
+# file is reported once and cached as empty text so reruns don't retry it.
+
+import hashlib
+from typing import Callable, Dict
+
+import streamlit as st
+
+from extractors import UploadRejected, check_upload_size
+
+_TEXTS = "_upload_texts"        # file_id / content hash -> extracted text
+_INGESTED = "_upload_ingested"  # widget key -> file_id last copied into it
+_STATS = "_upload_stats"
+
+
+def _stats() -> Dict[str, int]:
+    return st.session_state.setdefault(_STATS, {"script_runs": 0, "uploads": 0, "extractions": 0})
+
+
+def count_script_run():
+    """Call once at the top of the script so upload stats can report runs per upload."""
+    _stats()["script_runs"] += 1
+
+
+def upload_stats() -> Dict[str, int]:
+    return dict(_stats())
+
+
+def content_hash(uploaded_file) -> str:
+    return hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+
+
+def extract_once(uploaded_file, extract: Callable) -> str:
+    """Return extracted text for ``uploaded_file``, calling ``extract`` at most once per file per session."""
+    texts = st.session_state.setdefault(_TEXTS, {})
+    file_id = getattr(uploaded_file, "file_id", None)
+    if file_id and file_id in texts:
+        return texts[file_id]
+    try:
+        check_upload_size(uploaded_file)
+        digest = "sha1:" + content_hash(uploaded_file)
+        text = texts.get(digest)
+        if text is None:
+            uploaded_file.seek(0)
+            text = extract(uploaded_file) or ""
+            texts[digest] = text
+            _stats()["extractions"] += 1
+    except UploadRejected as e:
+        st.error(f"{uploaded_file.name}: {e}")
+        text = ""
+    if file_id:
+        texts[file_id] = text
+    return text
+
+
+def ingest_upload(uploaded_file, state_key: str, extract: Callable) -> bool:
+    """Copy a newly uploaded file's text into ``st.session_state[state_key]``.
+
+    Must run before the widget keyed ``state_key`` is created in this script run.
+    Only a *new* upload overwrites the box, so user edits (including clearing
+    it) survive later reruns. Returns True when the state was populated.
+    """
+    ingested = st.session_state.setdefault(_INGESTED, {})
+    if uploaded_file is None:
+        ingested.pop(state_key, None)
+        return False
+    file_id = getattr(uploaded_file, "file_id", None) or content_hash(uploaded_file)
+    if ingested.get(state_key) == file_id:
+        return False
+    st.session_state[state_key] = extract_once(uploaded_file, extract)
+    ingested[state_key] = file_id
+    _stats()["uploads"] += 1
+    return True
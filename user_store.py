@@ -0,0 +1,202 @@
+# user_store.py
+# Multi-process-safe user store on SQLite with per-record change tracking.
+#
+# Several Streamlit server processes can share one store file. Every write runs
+# in a ``BEGIN IMMEDIATE`` transaction (SQLite's file lock serializes writers
+# across processes) and stamps the touched row with a new global version.
+# Each process keeps an in-memory copy of the records; ``refresh`` first asks
+# SQLite whether *any* other connection committed (``PRAGMA data_version``, no
+# disk read) and, only if so, pulls just the rows whose version moved on.
+
+import os
+import json
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+USERS_STORE = os.getenv("USERS_STORE", "user_data.sqlite3")
+LEGACY_USERS_JSON = "user_data.json"
+DEFAULT_ADMIN = ("admin", "Admin", "adminpass")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    data     TEXT NOT NULL,
+    version  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_version ON users(version);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta(key, value) VALUES ('version', 0);
+"""
+
+
+class UserStore:
+    """Dict-of-dicts user records shared safely between threads and processes."""
+
+    def __init__(self, path: str = USERS_STORE, legacy_json: Optional[str] = LEGACY_USERS_JSON):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._records: Dict[str, dict] = {}
+        self._version = 0
+        self._data_version = None
+        if legacy_json:
+            self._import_legacy(legacy_json)
+        self.refresh()
+
+    # ---- change detection ----
+    @property
+    def version(self) -> int:
+        """Global store version; bumps on every committed write from any process."""
+        self.refresh()
+        return self._version
+
+    def refresh(self) -> int:
+        """Pull records changed by other connections; returns how many were reloaded."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return 0
+            rows = self._conn.execute(
+                "SELECT username, data, version FROM users WHERE version > ?", (self._version,)
+            ).fetchall()
+            for username, data, version in rows:
+                self._records[username] = json.loads(data)
+                self._version = max(self._version, version)
+            self._version = max(self._version, self._meta_version())
+            self._data_version = data_version
+            return len(rows)
+
+    def _meta_version(self) -> int:
+        return self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    # ---- reads (served from the in-process copy) ----
+    def exists(self, username: str) -> bool:
+        self.refresh()
+        return username in self._records
+
+    def get(self, username: str) -> Optional[dict]:
+        self.refresh()
+        rec = self._records.get(username)
+        return json.loads(json.dumps(rec)) if rec is not None else None
+
+    def all(self) -> Dict[str, dict]:
+        self.refresh()
+        with self._lock:
+            return json.loads(json.dumps(self._records))
+
+    # ---- writes (atomic read-modify-write across processes) ----
+    def update(self, username: str, fn: Callable[[Optional[dict]], Optional[dict]]):
+        """Apply ``fn(current record or None) -> new record`` atomically.
+
+        ``fn`` sees the latest committed record (never a stale cached copy).
+        Returning None leaves the store unchanged. Returns the stored record.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Holding the write lock: catch up on other processes' commits first,
+                # so the cache is exact and our version stamp is the next one.
+                self.refresh()
+                current = self._records.get(username)
+                new = fn(json.loads(json.dumps(current)) if current is not None else None)
+                if new is None:
+                    self._conn.execute("COMMIT")
+                    return current
+                version = self._version + 1
+                self._conn.execute("UPDATE meta SET value = ? WHERE key = 'version'", (version,))
+                self._conn.execute(
+                    "INSERT INTO users(username, data, version) VALUES (?, ?, ?) "
+                    "ON CONFLICT(username) DO UPDATE SET data = excluded.data, version = excluded.version",
+                    (username, json.dumps(new), version),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            # Our own commits don't move PRAGMA data_version, so apply them directly.
+            self._records[username] = new
+            self._version = version
+            return new
+
+    def register(self, username: str, record: dict) -> bool:
+        """Insert a new user; False if the username is already taken (in any process)."""
+        created = []
+
+        def _insert(current):
+            if current is not None:
+                return None
+            created.append(True)
+            return record
+
+        self.update(username, _insert)
+        return bool(created)
+
+    def ensure(self, username: str, defaults: dict) -> dict:
+        """Create ``username`` with ``defaults`` unless it exists; return the record."""
+        return self.update(username, lambda current: dict(defaults) if current is None else None)
+
+    def increment(self, username: str, field: str, n: int = 1) -> int:
+        """Atomically add ``n`` to a numeric counter and return the new value."""
+        def _inc(current):
+            current = current or {}
+            current[field] = int(current.get(field, 0) or 0) + n
+            return current
+
+        return self.update(username, _inc)[field]
+
+    def _import_legacy(self, path: str):
+        """Seed an empty store from the old user_data.json (one-time migration)."""
+        if not os.path.exists(path):
+            return
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+                return
+            try:
+                with open(path, "r") as f:
+                    legacy = json.load(f)
+            except Exception:
+                return
+        for username, record in legacy.items():
+            if isinstance(record, dict):
+                self.register(username, record)
+
+
+_STORE: Optional[UserStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> UserStore:
+    """Process-wide store, opened once (module state survives Streamlit reruns)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = UserStore()
+    return _STORE
+
+
+@lru_cache(maxsize=4096)
+def password_hash(password: str) -> str:
+    """bcrypt hash for streamlit-authenticator (same as ``stauth.Hasher``), computed once per password.
+
+    Hashing costs ~300 ms; without the cache every rerun re-hashed every user.
+    """
+    import bcrypt
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+
+
+def auth_credentials(users: Dict[str, dict]) -> dict:
+    """streamlit-authenticator credentials from user records (passwords kept plaintext in the store)."""
+    credentials = {"usernames": {}}
+    for uname, uinfo in users.items():
+        if isinstance(uinfo, dict) and "password" in uinfo:
+            credentials["usernames"][uname] = {"name": uinfo.get("name", uname),
+                                               "password": password_hash(uinfo["password"])}
+    admin, admin_name, admin_password = DEFAULT_ADMIN
+    if admin not in credentials["usernames"]:  # seed an admin if missing
+        credentials["usernames"][admin] = {"name": admin_name, "password": password_hash(admin_password)}
+    return credentials
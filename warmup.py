@@ -0,0 +1,276 @@
+# warmup.py
+# Startup warm-up and readiness probe.
+#
+# A fresh process makes its first users pay for everything that is done once:
+# heavy imports (pandas, matplotlib, PyPDF2, openai, ...), load_dotenv, opening
+# the SQLite stores, bcrypt-hashing every login credential, the regexes behind
+# keyword extraction and resume segmentation, the salary band table, and the
+# first TCP/TLS handshake to the LLM API. Warm-up runs those steps up front, in
+# the process that will serve traffic, and times each one.
+#
+# Streamlit has no startup hook and only imports the app script on the first
+# session, so this module launches it: warm up first, then start Streamlit in
+# the same process (imported modules, stores, caches and the pooled LLM
+# connection are reused by every rerun):
+#
+#   python warmup.py streamlit_app.py --server.port 8501     # instead of `streamlit run`
+#   python warmup.py --check                                  # run the steps, print the report
+#
+# A small HTTP listener on WARMUP_READY_PORT (default 8599) answers GET /ready
+# with 503 until warm-up has finished *and* Streamlit is serving, then 200. The
+# body is the report (per-step ms, ok/error) either way. Point the load
+# balancer's health check there. The API serves the same report at GET /ready
+# (api.py warms itself at import). A failed optional step (e.g. no LLM
+# reachable) is reported but doesn't hold readiness back.
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+WARMUP_READY_PORT = int(os.getenv("WARMUP_READY_PORT", "8599"))
+
+# Imported in this order; missing optional packages are reported, not fatal.
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib.pyplot", "PyPDF2", "docx", "fpdf", "PIL.Image", "pyarrow.parquet",
+                 "openai", "bcrypt", "streamlit_authenticator")
+
+SAMPLE_JD = ("Senior Data Scientist. Requirements: Python, SQL, AWS, Spark, Airflow, Docker; strong communication "
+             "and stakeholder management. Nice to have: PyTorch, Kubernetes, Tableau.")
+SAMPLE_RESUME = ("Summary\nData scientist with 6 years of Python and SQL.\n\nExperience\n- Built Spark pipelines on AWS\n"
+                 "- Led a team of 4; mentoring and planning\n\nSkills\nPython, SQL, Tableau, Docker\n\n"
+                 "Education\nB.S. Statistics")
+
+# (name, fn returning an optional detail string, required for readiness)
+Step = Tuple[str, Callable[[], Optional[str]], bool]
+
+_state = {"started_at": None, "finished_at": None, "done": False, "steps": []}
+_state_lock = threading.Lock()
+
+
+# ---------------- Steps ----------------
+def _import(name: str) -> Callable[[], Optional[str]]:
+    def step():
+        if name == "matplotlib.pyplot":
+            import matplotlib
+            matplotlib.use("Agg")
+        importlib.import_module(name)
+    return step
+
+
+def _dotenv():
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _stores():
+    from history import get_history
+    from job_feed import get_feed_store
+    from quota import get_limiter
+    from salary_analytics import get_salary_log
+    from user_store import get_store
+    for open_store in (get_feed_store, get_history, get_limiter, get_salary_log):
+        open_store()
+    return f"{len(get_store().all())} users"
+
+
+def _credentials():
+    from user_store import auth_credentials, get_store
+    return f"{len(auth_credentials(get_store().all())['usernames'])} credentials hashed"
+
+
+def _matchers():
+    from keywords import extract_keywords, keyword_fit
+    from resume_model import segment_resume
+    fit = keyword_fit(extract_keywords(SAMPLE_JD), segment_resume(SAMPLE_RESUME).keywords())
+    return f"sample fit {fit['fit_score']}%"
+
+
+def _salary():
+    from analysis import salary_alignment
+    from salary import get_band_table
+    table = get_band_table()
+    salary_alignment("Sr. Data Scientist", "high-cost", None, 150000)
+    return f"{len(table):,} bands"
+
+
+def _templates():
+    from prompt_templates import prompt_templates
+    importlib.import_module("router")
+    return f"{len(prompt_templates)} templates"
+
+
+def _thumbnails():
+    from static_assets import build_all
+    return f"{len(build_all())} thumbnails"
+
+
+def llm_connection(client=None) -> Callable[[], Optional[str]]:
+    """Step that opens the pooled connection (TCP + TLS) of ``client``, or of the module-level
+    ``openai`` client that streamlit_app.py uses, with one GET /models (no tokens)."""
+    def step():
+        target = client
+        if target is None:
+            if not os.getenv("OPENAI_API_KEY"):
+                return "skipped (no OPENAI_API_KEY)"
+            import openai
+            openai.api_key = os.getenv("OPENAI_API_KEY")
+            if os.getenv("OPENAI_BASE_URL"):
+                openai.base_url = os.getenv("OPENAI_BASE_URL").rstrip("/") + "/"  # as in streamlit_app.py
+            target = openai
+        try:
+            target.models.list()
+        except Exception as e:
+            # An HTTP error still means the connection is open and pooled.
+            if getattr(e, "status_code", None) is None:
+                raise
+            return f"connected (HTTP {e.status_code})"
+        return "connected"
+    return step
+
+
+def app_steps() -> List[Step]:
+    """Warm-up for the Streamlit apps."""
+    steps: List[Step] = [(f"import {m}", _import(m), False) for m in HEAVY_MODULES]
+    steps += [
+        ("load_dotenv", _dotenv, True),
+        ("stores", _stores, True),
+        ("credentials", _credentials, True),
+        ("keyword matchers", _matchers, True),
+        ("salary tables", _salary, True),
+        ("prompt templates", _templates, True),
+        ("thumbnails", _thumbnails, False),
+        ("llm connection", llm_connection(), False),
+    ]
+    return steps
+
+
+def api_steps(client=None) -> List[Step]:
+    """Warm-up for api.py (no UI pieces); ``client`` is its OpenAI client, if any."""
+    steps: List[Step] = [(f"import {m}", _import(m), False) for m in ("numpy", "PyPDF2", "docx", "openai")]
+    steps += [
+        ("keyword matchers", _matchers, True),
+        ("salary tables", _salary, True),
+        ("prompt templates", _templates, True),
+    ]
+    if client is not None:
+        steps.append(("llm connection", llm_connection(client), False))
+    return steps
+
+
+# ---------------- Runner ----------------
+def run(steps: List[Step]) -> Dict:
+    """Run ``steps`` in order, recording each one's time and outcome; returns ``status()``."""
+    with _state_lock:
+        _state.update(started_at=time.time(), finished_at=None, done=False, steps=[])
+    for name, fn, required in steps:
+        t = time.perf_counter()
+        rec = {"name": name, "required": required, "ok": True, "ms": 0.0, "detail": None}
+        try:
+            rec["detail"] = fn()
+        except Exception as e:
+            rec.update(ok=False, detail=f"{type(e).__name__}: {e}")
+        rec["ms"] = round((time.perf_counter() - t) * 1000, 1)
+        with _state_lock:
+            _state["steps"].append(rec)
+    with _state_lock:
+        _state.update(finished_at=time.time(), done=True)
+    return status()
+
+
+def start(steps: List[Step]) -> threading.Thread:
+    """``run`` on a background thread (for servers that must start accepting connections)."""
+    thread = threading.Thread(target=run, args=(steps,), name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def status() -> Dict:
+    """ready (finished and no required step failed), done, total_ms and the per-step records."""
+    with _state_lock:
+        steps = [dict(s) for s in _state["steps"]]
+        started, finished, done = _state["started_at"], _state["finished_at"], _state["done"]
+    end = finished or (time.time() if started else None)
+    return {
+        "ready": done and all(s["ok"] for s in steps if s["required"]),
+        "done": done,
+        "total_ms": round((end - started) * 1000, 1) if started else None,
+        "steps": steps,
+    }
+
+
+# ---------------- Readiness listener ----------------
+def _streamlit_up(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
+def serve_ready(port: int = WARMUP_READY_PORT, health_url: Optional[str] = None) -> ThreadingHTTPServer:
+    """Answer GET /ready (200 when warm and, if ``health_url`` is given, that URL answers 200; else 503)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/ready":
+                self.send_error(404)
+                return
+            report = status()
+            if health_url is not None:
+                report["serving"] = report["ready"] and _streamlit_up(health_url)
+                report["ready"] = report["serving"]
+            body = json.dumps(report).encode("utf-8")
+            self.send_response(200 if report["ready"] else 503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="warmup-ready", daemon=True).start()
+    return server
+
+
+def _streamlit_port(args: List[str]) -> int:
+    for i, arg in enumerate(args):
+        if arg.startswith("--server.port="):
+            return int(arg.split("=", 1)[1])
+        if arg == "--server.port" and i + 1 < len(args):
+            return int(args[i + 1])
+    return int(os.getenv("STREAMLIT_SERVER_PORT", "8501"))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Warm up, then run a Streamlit app; readiness on GET /ready.")
+    ap.add_argument("script", nargs="?", default="streamlit_app.py")
+    ap.add_argument("--ready-port", type=int, default=WARMUP_READY_PORT)
+    ap.add_argument("--check", action="store_true", help="only run the warm-up steps and print the report")
+    args, streamlit_args = ap.parse_known_args(argv)
+
+    if args.check:
+        print(json.dumps(run(app_steps()), indent=2))
+        return
+    serve_ready(args.ready_port, f"http://127.0.0.1:{_streamlit_port(streamlit_args)}/_stcore/health")
+    report = run(app_steps())
+    for s in report["steps"]:
+        print(f"  {s['name']:<32}{s['ms']:>9.1f} ms  {'ok' if s['ok'] else 'FAILED'}  {s['detail'] or ''}",
+              flush=True)
+    print(f"warm-up {'done' if report['ready'] else 'FAILED'} in {report['total_ms']:.0f} ms", flush=True)
+
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", args.script, *streamlit_args]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()